@@ -1,7 +1,7 @@
 from core.base_node import BaseNode, NodeOutput
 from core.report_generator import ReportGenerator
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 class AnalyticsDashboardEngine(BaseNode):
     """
@@ -13,6 +13,17 @@ class AnalyticsDashboardEngine(BaseNode):
         super().__init__("NODE_6", "Aggregator")
         self.reporter = None
 
+    def _export_parquet(self, lead_batch: Any, events: List[Dict[str, Any]],
+                        summary: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        lead_parts = self.reporter.write_leads_parquet(lead_batch)
+        event_parts = self.reporter.export_events_parquet(events)
+        self.reporter.export_summary_parquet(
+            summary, min_interval=self.config.get_int("PARQUET_SUMMARY_INTERVAL_SECONDS", 900)
+        )
+        for table in ("leads", "events", "summary"):
+            self.reporter.compact_parquet(table)
+        return lead_parts, event_parts
+
     async def run(self, inputs: Dict[str, Any]) -> NodeOutput:
         self.log("Aggregating system analytics...")
         
@@ -31,28 +42,60 @@ class AnalyticsDashboardEngine(BaseNode):
         assets = self.global_memory.get_state("published_assets") or []
         risk_score = self.global_memory.get_state("current_risk_score") or 0
         
+        # Counts and totals come from materialized aggregates, not a rescan
+        tier_counts = self.global_memory.aggregate("leads_by_tier")
+        total_leads = self.global_memory.list_length("lead_quality")
+        
         summary = {
-            "total_leads": len(leads),
+            "total_leads": total_leads,
             "tier_counts": {
-                "A": len([l for l in leads if l.get("score") == "A"]),
-                "B": len([l for l in leads if l.get("score") == "B"]),
-                "C": len([l for l in leads if l.get("score") == "C"])
+                "A": tier_counts.get("A", 0),
+                "B": tier_counts.get("B", 0),
+                "C": tier_counts.get("C", 0)
             },
             "published_assets_count": len(assets),
             "current_risk_health": "Healthy" if risk_score < 50 else "High Risk",
-            "total_capex_potential": sum([l.get("capex", 0) for l in leads]),
+            "total_capex_potential": self.global_memory.aggregate("lead_capex_total"),
             "total_co2_offset": round(self.global_memory.get_state("total_co2_offset") or 0.0, 2),
             "timestamp": inputs.get("timestamp", "now")
         }
+
+        # Node latency/throughput snapshot (p50/p95/p99) plus Prometheus export
+        metrics_path = ""
+        if self.metrics is not None:
+            summary["node_metrics"] = self.metrics.snapshot()
+            metrics_path = self.metrics.write_prometheus(os.path.join(self.reporter.output_dir, "node_metrics.prom"))
         
+        # Latest snapshot for the live dashboard server (node metrics, report time)
+        self.global_memory.update_state("system_summary", summary)
+
         # 2. Generate structured reports
         json_path = self.reporter.generate_json(summary, "system_summary")
-        csv_path = self.reporter.generate_csv(leads, "leads_detailed")
+        # Appends only leads added since the last run; a quiet tick writes nothing
+        csv_path = self.reporter.append_csv(
+            leads, "leads_detailed",
+            max_bytes=self.config.get_int("REPORT_ROTATE_BYTES", 50 * 1024 * 1024)
+        )
         
-        self.log(f"Analytics Summary: {len(leads)} leads, {len(assets)} assets.")
+        # 3. Append new history to the date-partitioned Parquet tables
+        parquet_dir = ""
+        if self.config.get("PARQUET_EXPORT", "true").lower() == "true":
+            try:
+                # Memory is read here on the loop; files are written on the blocking pool
+                lead_batch = self.reporter.new_leads_frame(self.global_memory.table("lead_quality"))
+                since = self.reporter.parquet_watermark("events").get("timestamp")
+                events = list(self.global_memory.iter_events(start=since))
+                lead_parts, event_parts = await self.run_blocking(self._export_parquet, lead_batch, events, summary)
+                parquet_dir = os.path.join(self.reporter.output_dir, ReportGenerator.PARQUET_DIR)
+                self.log(f"Parquet history: {len(lead_parts)} lead and {len(event_parts)} event partitions appended.")
+            except Exception as e:
+                self.log(f"Parquet export failed: {e}")
+
+        self.log(f"Analytics Summary: {total_leads} leads, {len(assets)} assets.")
         self.log(f"Reports saved to: {json_path} and {csv_path}")
         
         return NodeOutput(
-            data={"summary": summary, "files": {"json": json_path, "csv": csv_path}},
-            metadata={"status": "reports_generated", "lead_count": len(leads)}
+            data={"summary": summary, "files": {"json": json_path, "csv": csv_path, "metrics": metrics_path,
+                                                "parquet": parquet_dir}},
+            metadata={"status": "reports_generated", "lead_count": total_leads}
         )
@@ -1,6 +1,9 @@
+import asyncio
+import os
 from core.base_node import BaseNode, NodeOutput
 from core.content_templates import ContentTemplates
-from typing import Any, Dict
+from core.generation_cache import GenerationCache
+from typing import Any, Dict, Optional
 from openai import OpenAI
 
 class AuthorityContentEngine(BaseNode):
@@ -10,39 +13,145 @@ class AuthorityContentEngine(BaseNode):
     Integrated with ContentTemplates for platform-specific formatting.
     """
 
+    MODEL = "gpt-4o" # Scalable model for authority content
+    MAX_TOKENS = 500
+
     def __init__(self):
         super().__init__("NODE_3", "Generator")
         self.client = None
+        self.cache: Optional[GenerationCache] = None
+        self._revalidating: Dict[str, asyncio.Task] = {}
+
+    def _generation_cache(self) -> GenerationCache:
+        if self.cache is None:
+            data_dir = self.config.get("ENGINE_DATA_DIR", "data")
+            self.cache = GenerationCache(
+                self.config.get("GENERATION_CACHE_DIR", os.path.join(data_dir, "generation_cache")),
+                ttl_seconds=self.config.get_int("GENERATION_CACHE_TTL_SECONDS", 86400),
+                stale_seconds=self.config.get_int("GENERATION_CACHE_STALE_SECONDS", 604800),
+                max_bytes=self.config.get_int("GENERATION_CACHE_MAX_MB", 50) * 1024 * 1024
+            )
+        return self.cache
+
+    @classmethod
+    def _build_request(cls, topic: str, platform: str) -> Dict[str, Any]:
+        return {
+            "model": cls.MODEL,
+            "messages": [
+                {"role": "system", "content": f"You are an expert solar consultant for the Indian industrial sector. {ContentTemplates.VOICE_GUIDELINES}"},
+                {"role": "user", "content": f"Write a professional {platform} post about: {topic}. Include ROI metrics and industrial benefits."}
+            ],
+            "max_tokens": cls.MAX_TOKENS
+        }
+
+    async def _generate(self, request: Dict[str, Any]) -> str:
+        response = await self.run_blocking(
+            self.client.chat.completions.create,
+            timeout=self.config.get_int("OPENAI_TIMEOUT_SECONDS", 60),
+            service="openai",
+            **request
+        )
+        return response.choices[0].message.content
+
+    async def _revalidate(self, cache_key: str, request: Dict[str, Any]):
+        try:
+            self._generation_cache().put(cache_key, await self._generate(request))
+            self.log("Stale draft revalidated in the background.")
+        except Exception as e:
+            self.log(f"OpenAI Error during revalidation: {e}. Keeping stale draft.")
+        finally:
+            self._revalidating.pop(cache_key, None)
+
+    def _count_cache(self, result: str):
+        if self.metrics is not None:
+            self.metrics.inc("generation_cache_total", {"node": self.node_id, "result": result},
+                             help_text="Generation cache lookups by result.")
+
+    def _ensure_client(self) -> bool:
+        if not self.client:
+            api_key = self.config.get("OPENAI_API_KEY")
+            if not api_key or "sk-" not in api_key:
+                self.log("Warning: Invalid or missing OpenAI API Key. Falling back to mock logic.")
+                return False
+            self.client = OpenAI(api_key=api_key, timeout=self.config.get_int("OPENAI_TIMEOUT_SECONDS", 60))
+        return True
 
     async def run(self, inputs: Dict[str, Any]) -> NodeOutput:
         topic = inputs.get("topic", "Solar ROI for Industrial Clients")
+        if "platforms" in inputs:
+            return await self.run_fanout(topic, inputs["platforms"])
+
         platform = inputs.get("platform", "linkedin")
-        
         self.log(f"Generating live {platform} content for topic: {topic}")
         
-        if not self.client:
-            api_key = self.config.get("OPENAI_API_KEY")
-            if not api_key or "sk-" not in api_key:
-                self.log("Warning: Invalid or missing OpenAI API Key. Falling back to mock logic.")
+        if not self._ensure_client():
+            return await self._run_mock(topic, platform)
+        return await self._generate_platform(topic, platform)
+
+    async def run_fanout(self, topic: str, platforms: Any) -> NodeOutput:
+        """
+        Generates one topic for several platforms (or "all") concurrently, capped
+        by CONTENT_FANOUT_CONCURRENCY and a per-platform timeout. A platform that
+        fails or times out falls back to a mock draft without failing the pack.
+        """
+        if platforms == "all":
+            platforms = list(ContentTemplates.TEMPLATES)
+        elif isinstance(platforms, str):
+            platforms = [platforms]
+        platforms = list(dict.fromkeys(platforms))
+        unknown = [p for p in platforms if p not in ContentTemplates.TEMPLATES]
+        if unknown or not platforms:
+            message = f"Unknown platforms: {unknown}" if unknown else "No platforms requested"
+            return NodeOutput(data=None, metadata={
+                "status": "error", "message": f"{message}. Expected 'all' or any of {list(ContentTemplates.TEMPLATES)}"
+            })
+        self.log(f"Generating content pack for topic: {topic} ({', '.join(platforms)})")
+
+        live = self._ensure_client()
+        timeout = self.config.get_int("CONTENT_FANOUT_TIMEOUT_SECONDS", self.config.get_int("OPENAI_TIMEOUT_SECONDS", 60))
+        semaphore = asyncio.Semaphore(max(1, self.config.get_int("CONTENT_FANOUT_CONCURRENCY", 5)))
+
+        async def generate(platform: str) -> NodeOutput:
+            if not live:
                 return await self._run_mock(topic, platform)
-            self.client = OpenAI(api_key=api_key)
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self._generate_platform(topic, platform), timeout)
+                except asyncio.TimeoutError:
+                    self.log(f"{platform} generation timed out after {timeout}s. Falling back to mock logic.")
+                    return await self._run_mock(topic, platform)
 
-        try:
-            # 1. Real OpenAI API Call
-            response = self.client.chat.completions.create(
-                model="gpt-4o", # Scalable model for authority content
-                messages=[
-                    {"role": "system", "content": f"You are an expert solar consultant for the Indian industrial sector. {ContentTemplates.VOICE_GUIDELINES}"},
-                    {"role": "user", "content": f"Write a professional {platform} post about: {topic}. Include ROI metrics and industrial benefits."}
-                ],
-                max_tokens=500
-            )
-            raw_draft = response.choices[0].message.content
-        except Exception as e:
-            self.log(f"OpenAI Error: {e}. Falling back to mock logic.")
-            return await self._run_mock(topic, platform)
+        outputs = await asyncio.gather(*[generate(platform) for platform in platforms])
+
+        modes = {platform: output.metadata.get("mode") for platform, output in zip(platforms, outputs)}
+        self.log(f"Content pack complete: {modes}")
+        return NodeOutput(
+            data={"topic": topic, "platforms": {platform: output.data for platform, output in zip(platforms, outputs)}},
+            metadata={"status": "content_pack_generated", "platforms": platforms, "modes": modes}
+        )
+
+    async def _generate_platform(self, topic: str, platform: str) -> NodeOutput:
+        # 1. Content-addressed cache lookup; platform is hashed too since formatting depends on it
+        request = self._build_request(topic, platform)
+        cache = self._generation_cache()
+        cache_key = cache.key(platform=platform, **request)
+        raw_draft, cache_state = cache.get(cache_key)
+        self._count_cache(cache_state)
 
-        # 2. Use ContentTemplates to format (adds branding/hashtags if needed)
+        if cache_state == "stale" and cache_key not in self._revalidating:
+            # Serve the stale draft now and refresh it for the next cycle
+            self._revalidating[cache_key] = asyncio.create_task(self._revalidate(cache_key, request))
+
+        if raw_draft is None:
+            try:
+                # 2. Real OpenAI API Call (off the event loop)
+                raw_draft = await self._generate(request)
+            except Exception as e:
+                self.log(f"OpenAI Error: {e}. Falling back to mock logic.")
+                return await self._run_mock(topic, platform)
+            cache.put(cache_key, raw_draft)
+
+        # 3. Use ContentTemplates to format (adds branding/hashtags if needed)
         formatted_content = ContentTemplates.format_content(platform, topic, raw_draft)
         
         result = {
@@ -52,18 +161,25 @@ class AuthorityContentEngine(BaseNode):
             "brand_voice": ContentTemplates.VOICE_GUIDELINES
         }
         
-        self.log(f"Live content generation complete for {platform}.")
+        self.log(f"Live content generation complete for {platform} (cache: {cache_state}).")
         
         return NodeOutput(
             data=result,
-            metadata={"status": "draft_generated", "mode": "live", "platform": platform}
+            metadata={"status": "draft_generated", "mode": "live", "platform": platform, "cache": cache_state}
         )
 
+    async def shutdown(self):
+        tasks = list(self._revalidating.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._revalidating.clear()
+
     async def _run_mock(self, topic: str, platform: str) -> NodeOutput:
         # Fallback simulation
         raw_draft = f"Self-generated draft about {topic} for {platform}. (Mock Mode)"
         formatted_content = ContentTemplates.format_content(platform, topic, raw_draft)
         return NodeOutput(
             data={"draft": formatted_content, "platform": platform, "topic": topic},
-            metadata={"status": "draft_generated", "mode": "mock"}
+            metadata={"status": "draft_generated", "mode": "mock", "platform": platform}
         )
@@ -1,5 +1,5 @@
 from core.base_node import BaseNode, NodeOutput
-from core.report_generator import ReportGenerator
+from core.carbon_store import CarbonReportStore
 import os
 from typing import Any, Dict
 
@@ -11,9 +11,40 @@ class CarbonReportingEngine(BaseNode):
 
     def __init__(self):
         super().__init__("NODE_9", "Reporting Engine")
-        self.reporter = None
+        self.store = None
+        self.export_dir = None
+
+    def _ensure_store(self) -> CarbonReportStore:
+        if self.store is None:
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            data_dir = self.config.get("ENGINE_DATA_DIR", "data")
+            self.store = CarbonReportStore(
+                self.config.get("CARBON_STORE_DIR", os.path.join(data_dir, "carbon_reports")),
+                shard_max_bytes=self.config.get_int("CARBON_SHARD_MAX_BYTES", 64 * 1024 * 1024),
+                batch_size=self.config.get_int("CARBON_STORE_BATCH_SIZE", 64)
+            )
+            self.export_dir = os.path.join(project_root, "reports", "carbon")
+        return self.store
+
+    async def export_report(self, report_id: str) -> NodeOutput:
+        """
+        Renders one stored report to reports/carbon/ when a customer asks for it.
+        """
+        path = self._ensure_store().export(report_id, self.export_dir)
+        if path is None:
+            return NodeOutput(data=None, metadata={"status": "error", "message": f"Unknown report {report_id}"})
+        self.log(f"Carbon Report exported: {path}")
+        return NodeOutput(data={"report_id": report_id, "path": path}, metadata={"status": "report_exported", "path": path})
+
+    async def shutdown(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
 
     async def run(self, inputs: Dict[str, Any]) -> NodeOutput:
+        if inputs.get("action") == "export":
+            return await self.export_report(inputs.get("report_id", ""))
+
         lead_data = inputs.get("lead", {})
         roi_results = inputs.get("roi_results", {})
         
@@ -42,17 +73,13 @@ class CarbonReportingEngine(BaseNode):
             "timestamp": "now"
         }
 
-        if not self.reporter:
-            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            carbon_dir = os.path.join(project_root, "reports", "carbon")
-            self.reporter = ReportGenerator(carbon_dir)
-
-        filename = f"carbon_report_{lead_data.get('name', 'anonymous').replace(' ', '_').lower()}"
-        report_path = self.reporter.generate_json(report, filename)
+        # Appended to the shared store under a unique id; leads with the same name no longer collide
+        lead_id = lead_data.get("id")
+        report_id = self._ensure_store().put(report, str(lead_id) if lead_id is not None else None)
 
-        self.log(f"Carbon Report generated: {report_path}")
+        self.log(f"Carbon Report stored: {report_id}")
 
         return NodeOutput(
             data=report,
-            metadata={"status": "report_generated", "path": report_path}
+            metadata={"status": "report_generated", "report_id": report_id}
         )
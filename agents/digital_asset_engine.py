@@ -1,8 +1,11 @@
 import os
 import json
+import hashlib
 import datetime
+from typing import Any, Dict
 from core.base_node import BaseNode, NodeOutput
 from core.site_builder import SiteBuilder
+from core.post_index import PostIndex
 
 class DigitalAssetEngine(BaseNode):
     """
@@ -14,12 +17,24 @@ class DigitalAssetEngine(BaseNode):
     def __init__(self):
         super().__init__("NODE_1", "Builder / Publisher")
         self.builder = None
+        self.post_index = None
 
     async def run(self, inputs: Dict[str, Any]) -> NodeOutput:
         if not self.builder:
             # Initialize builder with project root
             project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            self.builder = SiteBuilder(project_root)
+            data_dir = self.config.get("ENGINE_DATA_DIR", "data")
+            self.post_index = PostIndex(
+                self.config.get("POST_INDEX_PATH", os.path.join(data_dir, "post_index.jsonl")),
+                page_size=self.config.get_int("BLOG_PAGE_SIZE", 50),
+                sitemap_chunk=self.config.get_int("SITEMAP_CHUNK_SIZE", 5000)
+            )
+            self.builder = SiteBuilder(
+                project_root,
+                workers=self.config.get_int("SITE_BUILD_WORKERS", 4),
+                post_index=self.post_index,
+                site_url=self.config.get("SITE_URL", "https://manokamanasolar.com")
+            )
 
         action = inputs.get("action", "publish_blog")
         
@@ -30,6 +45,10 @@ class DigitalAssetEngine(BaseNode):
         
         return NodeOutput(data=None, metadata={"error": "Unknown action"})
 
+    async def shutdown(self):
+        if self.builder is not None:
+            self.builder.close()
+
     async def publish_blog(self, draft: Dict[str, Any]) -> NodeOutput:
         title = draft.get("title", "Untitled Post")
         content = draft.get("draft", "No content provided.")
@@ -59,7 +78,13 @@ schema: {json.dumps(schema)}
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(file_content)
 
-        # 3. Log to Global Memory
+        # 3. Record in the persistent post index (one appended line); the next build patches sitemap/feed/pages
+        self.post_index.upsert(
+            slug, title, datetime.datetime.now().strftime('%Y-%m-%d'), f"/blog/{slug}.html",
+            hashlib.sha256(file_content.encode("utf-8")).hexdigest()
+        )
+
+        # 4. Log to Global Memory
         asset_url = f"/blog/{slug}"
         published_asset = {
             "title": title,
@@ -78,5 +103,5 @@ schema: {json.dumps(schema)}
         self.log("Triggering site rebuild and deployment...")
         webhook_url = self.config.get("DEPLOYMENT_WEBHOOK_URL", "http://localhost:8000/deploy")
         self.log(f"Notifying deployment webhook: {webhook_url}")
-        result = self.builder.rebuild_site()
+        result = await self.run_blocking(self.builder.rebuild_site)
         return NodeOutput(data=result, metadata={"deployment": "success", "webhook": webhook_url})
@@ -1,5 +1,9 @@
+import json
+import os
 from core.base_node import BaseNode, NodeOutput
-from typing import Any, Dict
+from core.content_audit import ContentAuditor
+from core.rule_engine import RuleSet
+from typing import Any, Dict, Optional
 
 class GovernanceRiskEngine(BaseNode):
     """
@@ -9,24 +13,59 @@ class GovernanceRiskEngine(BaseNode):
 
     def __init__(self):
         super().__init__("NODE_5", "Monitor / Gatekeeper")
+        self.rules: Optional[RuleSet] = None
+        self._rules_mtime = None
+        # Kept across audits so its process pool is started once
+        self.auditor: Optional[ContentAuditor] = None
+
+    def _rules_path(self) -> str:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return self.config.get("GOVERNANCE_RULES_PATH", os.path.join(project_root, "config", "governance_rules.json"))
+
+    def _rule_set(self) -> Optional[RuleSet]:
+        """
+        Compiles config/governance_rules.json once, recompiling if the file changes.
+        Returns None when the file is missing or invalid, so callers fail closed.
+        """
+        path = self._rules_path()
+        try:
+            mtime = os.path.getmtime(path)
+            if self.rules is None or mtime != self._rules_mtime:
+                self.rules = RuleSet.load(path)
+                self._rules_mtime = mtime
+                self.log(f"Loaded {len(self.rules.rules)} governance rules (version {self.rules.version})")
+        except (OSError, ValueError, KeyError) as e:
+            self.log(f"Governance rules unavailable ({path}): {e}")
+            return None
+        return self.rules
+
+    def block_threshold(self) -> int:
+        """
+        Risk score at which content is flagged and the orchestrator's risk gate closes.
+        """
+        return self.config.get_int("RISK_THRESHOLD_BLOCK", self.rules.block_threshold if self.rules else 70)
 
     async def run(self, inputs: Dict[str, Any]) -> NodeOutput:
+        if inputs.get("mode") == "audit":
+            return await self.run_audit()
+
         content = inputs.get("content", "")
         content_type = inputs.get("type", "unknown")
         
         self.log(f"Analyzing {content_type} risk...")
         
-        risk_score = 0
-        flags = []
-
-        # Simple simulation of risk detection logic
-        if "guaranteed ROI" in content.lower():
-            risk_score += 40
-            flags.append("Financial Claim Risk: Excessive ROI guarantee")
-        
-        if "free government subsidy" in content.lower():
-            risk_score += 30
-            flags.append("Policy Risk: Unverified subsidy mention")
+        # Compiled rule set: every phrase and regex in one scan of the content
+        rules = self._rule_set()
+        if rules is None:
+            # Without rules nothing can be cleared; hold the content for manual review
+            return NodeOutput(
+                data={"risk_score": None, "flags": ["Governance rules unavailable: manual review required"],
+                      "categories": []},
+                metadata={"status": "review", "rules_version": None}
+            )
+        verdict = rules.evaluate(content)
+        risk_score = verdict["risk_score"]
+        flags = verdict["flags"]
 
         if len(content) < 50 and content_type == "blog":
             risk_score += 20
@@ -43,8 +82,57 @@ class GovernanceRiskEngine(BaseNode):
         self.global_memory.update_state("current_risk_score", risk_score)
         self.log(f"Risk Score: {risk_score} | Flags: {flags}")
 
-        block_threshold = self.config.get_int("RISK_THRESHOLD_BLOCK", 70)
+        review_threshold = self.config.get_int("RISK_THRESHOLD_REVIEW", rules.review_threshold)
+        status = rules.status(risk_score, review_threshold, self.block_threshold())
+        return NodeOutput(
+            data={"risk_score": risk_score, "flags": flags, "categories": verdict["categories"]},
+            metadata={"status": status, "rules_version": rules.version}
+        )
+
+    async def shutdown(self):
+        if self.auditor is not None:
+            self.auditor.close()
+            self.auditor = None
+
+    async def run_audit(self) -> NodeOutput:
+        """
+        Re-audits every published blog post and social draft against the current
+        rules and writes reports/governance_audit.json. Only assets whose content
+        or rule-set version changed since the last audit are rescanned.
+        """
+        rules = self._rule_set()
+        if rules is None:
+            return NodeOutput(data=None, metadata={"status": "error", "message": "Governance rules unavailable"})
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        if self.auditor is None:
+            data_dir = self.config.get("ENGINE_DATA_DIR", "data")
+            self.auditor = ContentAuditor(
+                os.path.join(project_root, "content"),
+                cache_path=os.path.join(data_dir, "governance_audit_cache.json"),
+                workers=self.config.get_int("GOVERNANCE_AUDIT_WORKERS", os.cpu_count() or 4)
+            )
+
+        self.log(f"Auditing content corpus against rules version {rules.version}...")
+        report = await self.auditor.audit(
+            rules, self._rules_path(),
+            review_threshold=self.config.get_int("RISK_THRESHOLD_REVIEW", rules.review_threshold),
+            block_threshold=self.block_threshold()
+        )
+
+        # 1. Write the per-asset risk report
+        reports_dir = os.path.join(project_root, "reports")
+        os.makedirs(reports_dir, exist_ok=True)
+        report_path = os.path.join(reports_dir, "governance_audit.json")
+        tmp_path = f"{report_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        os.replace(tmp_path, report_path)
+
+        summary = report["summary"]
+        self.global_memory.log_event(self.node_id, "content_audit", {"rules_version": rules.version, **summary})
+        self.log(f"Audit complete: {summary}")
+
         return NodeOutput(
-            data={"risk_score": risk_score, "flags": flags},
-            metadata={"status": "cleared" if risk_score < block_threshold else "flagged"}
+            data=report,
+            metadata={"status": "audit_complete", "rules_version": rules.version, **summary}
         )
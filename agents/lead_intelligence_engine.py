@@ -1,8 +1,11 @@
+import datetime
+import os
+import numpy as np
+import pandas as pd
 from core.base_node import BaseNode, NodeOutput
-from core.roi_calculator import ROICalculator
-from typing import Any, Dict
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+from core.roi_calculator import ROICalculator, INDUSTRY_MULTIPLIERS
+from core.alert_dispatcher import SlackAlertDispatcher
+from typing import Any, Dict, List, Optional
 
 class LeadIntelligenceEngine(BaseNode):
     """
@@ -11,11 +14,19 @@ class LeadIntelligenceEngine(BaseNode):
     and sends real-time Slack alerts for high-priority leads.
     """
 
+    # Scoring Logic (A: Industrial, B: Commercial, C: Small Commercial/Residential)
+    MULTIPLIERS = INDUSTRY_MULTIPLIERS
+    ROUTING = {"A": "Sales Dashboard", "B": "Sales Dashboard", "C": "Nurture Sequence"}
+
     def __init__(self):
         super().__init__("NODE_4", "Event-driven Processor")
-        self.slack_client = None
+        self.alerts: Optional[SlackAlertDispatcher] = None
+        self.calculator = ROICalculator()
 
     async def run(self, inputs: Dict[str, Any]) -> NodeOutput:
+        if "leads" in inputs:
+            return await self.run_batch(inputs["leads"])
+
         lead_data = inputs.get("lead", {})
         self.log(f"Processing lead: {lead_data.get('name', 'Anonymous')}")
         
@@ -23,19 +34,10 @@ class LeadIntelligenceEngine(BaseNode):
         roof_size = lead_data.get("roof_size", 0)
         monthly_bill = lead_data.get("electricity_bill", 0)
         
-        calculator = ROICalculator()
-        roi_results = calculator.calculate(roof_size, monthly_bill)
+        roi_results = self.calculator.calculate(roof_size, monthly_bill)
         
-        # Scoring Logic (A: Industrial, B: Commercial, C: Small Commercial/Residential)
         industry_type = lead_data.get("operation_type", "other")
-        multipliers = {
-            "manufacturing": 1.2,
-            "cold-storage": 1.5,
-            "warehousing": 1.1,
-            "other": 1.0
-        }
-        
-        effective_monthly_bill = monthly_bill * multipliers.get(industry_type, 1.0)
+        effective_monthly_bill = monthly_bill * self.MULTIPLIERS.get(industry_type, 1.0)
         
         score = "C"
         if effective_monthly_bill > 50000 and roi_results["payback_years"] < 4.5:
@@ -45,22 +47,23 @@ class LeadIntelligenceEngine(BaseNode):
             
         roi_results["lead_score"] = score
         roi_results["industry"] = industry_type
-        roi_results["routing"] = "Sales Dashboard" if score in ["A", "B"] else "Nurture Sequence"
+        roi_results["routing"] = self.ROUTING[score]
         
         # Send Slack Alert for Tier A Leads
         if score == "A":
-            await self._send_slack_alert(lead_data, roi_results)
+            self._send_slack_alert(lead_data, roi_results)
 
         # Update global CO2 stats
         current_co2 = self.global_memory.get_state("total_co2_offset") or 0.0
         self.global_memory.update_state("total_co2_offset", current_co2 + roi_results["annual_co2_offset_tons"])
 
         self.global_memory.append_to_list("lead_quality", {
-            "timestamp": "now", 
+            "timestamp": lead_data.get("timestamp") or datetime.datetime.now(datetime.timezone.utc).isoformat(),
             "score": score, 
             "capex": roi_results["capex_estimate"],
             "industry": industry_type,
-            "co2_offset": roi_results["annual_co2_offset_tons"]
+            "co2_offset": roi_results["annual_co2_offset_tons"],
+            "routing": roi_results["routing"]
         })
         
         self.log(f"Lead Scored: {score} | Payback: {roi_results['payback_years']} years | Capacity: {roi_results['capacity_kw']}kW")
@@ -70,24 +73,99 @@ class LeadIntelligenceEngine(BaseNode):
             metadata={"status": "lead_processed", "score": score, "routing": roi_results["routing"]}
         )
 
-    async def _send_slack_alert(self, lead: Dict[str, Any], results: Dict[str, Any]):
+    async def run_batch(self, leads: List[Dict[str, Any]]) -> NodeOutput:
+        """
+        Scores, routes and records a whole batch of leads with one vectorized
+        ROI pass and a single bulk write to memory (e.g. trade-show imports).
+        """
+        self.log(f"Processing lead batch of {len(leads)}")
+        if not leads:
+            return NodeOutput(data={"results": []}, metadata={"status": "batch_processed", "count": 0, "tier_counts": {}})
+
+        frame = pd.DataFrame({
+            "roof_size": [lead.get("roof_size", 0) for lead in leads],
+            "electricity_bill": [lead.get("electricity_bill", 0) for lead in leads],
+            "industry": [lead.get("operation_type", "other") for lead in leads]
+        })
+        frame = self.calculator.calculate_batch(frame)
+
+        effective_bill = frame["electricity_bill"] * frame["industry"].map(self.MULTIPLIERS).fillna(1.0)
+        tier_a = (effective_bill > 50000) & (frame["payback_years"] < 4.5)
+        frame["lead_score"] = np.where(tier_a, "A", np.where(effective_bill > 15000, "B", "C"))
+        frame["routing"] = frame["lead_score"].map(self.ROUTING)
+
+        result_columns = ["capacity_kw", "capex_estimate", "monthly_savings", "payback_years",
+                          "roi_percentage", "annual_co2_offset_tons", "lead_score", "industry", "routing"]
+        results = frame[result_columns].to_dict("records")
+
+        # Queue Slack Alerts for Tier A Leads (delivered in the background)
+        tier_a_index = np.flatnonzero(tier_a.to_numpy())
+        token = self.config.get("SLACK_TOKEN")
+        if not token or "xox" not in token:
+            self.log(f"Slack Token missing. Mocking {len(tier_a_index)} alerts to webhook...")
+        else:
+            for i in tier_a_index:
+                self._send_slack_alert(leads[i], results[i])
+
+        # Update global CO2 stats once for the batch
+        current_co2 = self.global_memory.get_state("total_co2_offset") or 0.0
+        self.global_memory.update_state("total_co2_offset", current_co2 + float(frame["annual_co2_offset_tons"].sum()))
+
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        self.global_memory.extend_list("lead_quality", [
+            {
+                "timestamp": lead.get("timestamp") or now,
+                "score": result["lead_score"],
+                "capex": result["capex_estimate"],
+                "industry": result["industry"],
+                "co2_offset": result["annual_co2_offset_tons"],
+                "routing": result["routing"]
+            }
+            for lead, result in zip(leads, results)
+        ])
+
+        tier_counts = {tier: int(count) for tier, count in frame["lead_score"].value_counts().items()}
+        self.log(f"Batch Scored: {len(leads)} leads | Tiers: {tier_counts}")
+
+        return NodeOutput(
+            data={"results": results},
+            metadata={"status": "batch_processed", "count": len(leads), "tier_counts": tier_counts}
+        )
+
+    def _alert_dispatcher(self, token: str) -> SlackAlertDispatcher:
+        if self.alerts is None:
+            data_dir = self.config.get("ENGINE_DATA_DIR", "data")
+            self.alerts = SlackAlertDispatcher(
+                token,
+                channel=self.config.get("SLACK_CHANNEL", "#leads"),
+                base_url=self.config.get("SLACK_API_BASE_URL", "https://slack.com/api"),
+                rate_per_minute=self.config.get_int("SLACK_RATE_PER_MINUTE", 20),
+                digest_size=self.config.get_int("SLACK_DIGEST_SIZE", 25),
+                retry_path=self.config.get("SLACK_RETRY_QUEUE", os.path.join(data_dir, "slack_retry_queue.json")),
+                timeout=self.config.get_int("SLACK_TIMEOUT_SECONDS", 10),
+                metrics=self.metrics
+            )
+        return self.alerts
+
+    def _send_slack_alert(self, lead: Dict[str, Any], results: Dict[str, Any]):
+        """
+        Queues a Tier A alert on the dispatcher; scoring never waits on Slack.
+        """
         token = self.config.get("SLACK_TOKEN")
         if not token or "xox" not in token:
             self.log("Slack Token missing. Mocking alert to webhook...")
             return
 
-        if not self.slack_client:
-            self.slack_client = WebClient(token=token)
+        message = (
+            f"🚨 *New Tier A Solar Lead Found!* 🚨\n"
+            f"*Name*: {lead.get('name', 'N/A')}\n"
+            f"*Capacity*: {results['capacity_kw']} kW\n"
+            f"*Payback*: {results['payback_years']} years\n"
+            f"*Estimated CAPEX*: INR {results['capex_estimate']:,}"
+        )
+        self._alert_dispatcher(token).enqueue(message)
 
-        try:
-            message = (
-                f"🚨 *New Tier A Solar Lead Found!* 🚨\n"
-                f"*Name*: {lead.get('name', 'N/A')}\n"
-                f"*Capacity*: {results['capacity_kw']} kW\n"
-                f"*Payback*: {results['payback_years']} years\n"
-                f"*Estimated CAPEX*: INR {results['capex_estimate']:,}"
-            )
-            self.slack_client.chat_postMessage(channel="#leads", text=message)
-            self.log("Slack alert sent successfully.")
-        except SlackApiError as e:
-            self.log(f"Slack Error: {e.response['error']}")
+    async def shutdown(self):
+        if self.alerts is not None:
+            await self.alerts.close(timeout=self.config.get_int("SLACK_DRAIN_SECONDS", 5))
+            self.alerts = None
@@ -1,6 +1,10 @@
 from core.base_node import BaseNode, NodeOutput
 from core.seo_utils import SEOUtils
-from typing import Any, Dict
+from core.keyword_clustering import KeywordClusterer
+from core.gsc_sync import GSCSync, KeywordStore
+from core.keyword_trends import KeywordTrends
+from typing import Any, Dict, List, Optional
+import datetime
 import os
 import json
 from google.oauth2 import service_account
@@ -15,6 +19,91 @@ class SEOIntelligenceEngine(BaseNode):
     def __init__(self):
         super().__init__("NODE_2", "Analyst")
         self.credentials = None
+        self.clusterer = KeywordClusterer()
+        self.store: Optional[KeywordStore] = None
+        self._clustered_keywords = set()
+
+    # Used when Search Console is not configured or the store is still empty
+    MOCK_KEYWORDS = [
+        {"keyword": "industrial solar panel ROI India", "intent": "high", "volume": 1200},
+        {"keyword": "solar subsidy for warehouses 2026", "intent": "high", "volume": 800},
+        {"keyword": "what is solar energy", "intent": "low", "volume": 5000},
+        {"keyword": "how to install solar panels at home", "intent": "medium", "volume": 3200},
+        {"keyword": "best solar installation for factories in Gujarat", "intent": "high", "volume": 600}
+    ]
+
+    def _keyword_store(self) -> KeywordStore:
+        if self.store is None:
+            data_dir = self.config.get("ENGINE_DATA_DIR", "data")
+            self.store = KeywordStore(self.config.get("KEYWORD_STORE_PATH", os.path.join(data_dir, "keyword_store.db")))
+        return self.store
+
+    async def _access_token(self) -> Optional[str]:
+        if not self.credentials:
+            return None
+        # Only needed for live Search Console pulls
+        import google_auth_httplib2
+        import httplib2
+        await self.run_blocking(
+            self.credentials.refresh,
+            google_auth_httplib2.Request(httplib2.Http()),
+            timeout=self.config.get_int("GSC_TIMEOUT_SECONDS", 30),
+            service="gsc"
+        )
+        return self.credentials.token
+
+    async def _load_keywords(self) -> List[Dict[str, Any]]:
+        site_url = self.config.get("GSC_SITE_URL")
+        base_url = self.config.get("GSC_API_BASE_URL", GSCSync.DEFAULT_BASE_URL)
+        # A custom base URL (e.g. a local stand-in server) works without credentials
+        if not site_url or (not self.credentials and base_url == GSCSync.DEFAULT_BASE_URL):
+            self.log("Search Console sync not configured. Using mock keyword data.")
+            return self.MOCK_KEYWORDS
+
+        store = self._keyword_store()
+        try:
+            token = await self._access_token()
+            sync = GSCSync(
+                store, site_url, base_url=base_url,
+                token_provider=lambda: token,
+                concurrency=self.config.get_int("GSC_SYNC_CONCURRENCY", 4),
+                lookback_days=self.config.get_int("GSC_LOOKBACK_DAYS", 90),
+                timeout=self.config.get_int("GSC_TIMEOUT_SECONDS", 30),
+                max_attempts=self.config.get_int("GSC_MAX_ATTEMPTS", 4),
+                metrics=self.metrics
+            )
+            result = await sync.sync()
+            self.log(f"Search Console sync: {result['days']} new days, {result['rows']} rows (watermark {result['watermark']}).")
+        except Exception as e:
+            self.log(f"Search Console sync error: {e}. Analyzing stored data.")
+
+        since = (datetime.date.today() - datetime.timedelta(days=self.config.get_int("GSC_ANALYSIS_DAYS", 28))).isoformat()
+        keywords = store.query_totals(site_url, since)
+        if not keywords:
+            self.log("Keyword store is empty. Using mock keyword data.")
+            return self.MOCK_KEYWORDS
+        for kw in keywords:
+            kw["intent"] = SEOUtils.classify_intent(kw["keyword"])
+        return keywords
+
+    def _keyword_signals(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Growth, spike and momentum per keyword from the stored daily history.
+        """
+        site_url = self.config.get("GSC_SITE_URL")
+        if self.store is None or not site_url:
+            return {}
+        trends = KeywordTrends.from_store(self.store, site_url, days=self.config.get_int("TREND_HISTORY_DAYS", 365))
+        return trends.signals(
+            window=self.config.get_int("TREND_WINDOW_DAYS", 7),
+            baseline_window=self.config.get_int("TREND_BASELINE_DAYS", 28),
+            spike_threshold=float(self.config.get("TREND_SPIKE_Z", "3.0"))
+        )
+
+    async def shutdown(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
 
     async def run(self, inputs: Dict[str, Any]) -> NodeOutput:
         self.log("Running live SEO intelligence analysis...")
@@ -24,8 +113,11 @@ class SEOIntelligenceEngine(BaseNode):
             gsc_json_path = self.config.get("GSC_SERVICE_ACCOUNT_JSON", "config/gsc-service.json")
             if os.path.exists(gsc_json_path):
                 try:
-                    self.credentials = service_account.Credentials.from_service_account_file(
-                        gsc_json_path, 
+                    self.credentials = await self.run_blocking(
+                        service_account.Credentials.from_service_account_file,
+                        gsc_json_path,
+                        timeout=self.config.get_int("GSC_TIMEOUT_SECONDS", 30),
+                        service="gsc",
                         scopes=['https://www.googleapis.com/auth/webmasters.readonly']
                     )
                     self.log(f"Authenticated with Google as: {self.credentials.service_account_email}")
@@ -34,41 +126,57 @@ class SEOIntelligenceEngine(BaseNode):
             else:
                 self.log("Google Service Account file not found. Using mock auth.")
 
-        # 2. Simulate data pull (in a real production app, this would call the GSC API here)
-        raw_keywords = [
-            {"keyword": "industrial solar panel ROI India", "intent": "high", "volume": 1200},
-            {"keyword": "solar subsidy for warehouses 2026", "intent": "high", "volume": 800},
-            {"keyword": "what is solar energy", "intent": "low", "volume": 5000},
-            {"keyword": "how to install solar panels at home", "intent": "medium", "volume": 3200},
-            {"keyword": "best solar installation for factories in Gujarat", "intent": "high", "volume": 600}
-        ]
+        # 2. Pull new Search Console days into the local keyword store and analyze from it
+        raw_keywords = await self._load_keywords()
         
         # 3. Use core SEOUtils for clustering and prioritization
         utils = SEOUtils()
         clusters = utils.cluster_keywords(raw_keywords)
+
+        # Topical clusters; keywords seen on earlier runs are already assigned
+        new_keywords = [kw for kw in raw_keywords if kw["keyword"] not in self._clustered_keywords]
+        topic_clusters = utils.cluster_topics(new_keywords, self.clusterer, limit=50) if new_keywords else self.clusterer.summary(50)
+        self._clustered_keywords.update(kw["keyword"] for kw in new_keywords)
         
         # 4. Apply topic priority weights from memory (if available)
         topic_weights = self.global_memory.get_state("topic_weights") or {"industrial": 0.5, "warehouse": 0.3}
         
-        # 4. Generate recommendations based on high intent clusters
+        # 5. Demand trends over the stored daily history (empty when running on mock data)
+        signals = self._keyword_signals()
+        momentum_weight = float(self.config.get("TREND_MOMENTUM_WEIGHT", "0.5"))
+        no_trend = {"momentum": 0.0, "spike": False}
+
+        # 6. Generate recommendations based on high intent clusters
         recommendations = []
-        for kw in clusters["high_intent"]:
-            weight = utils.calculate_topic_weight(kw["keyword"], topic_weights)
+        combine = self.config.get("TOPIC_WEIGHT_COMBINE", "max")
+        weights = utils.calculate_topic_weights([kw["keyword"] for kw in clusters["high_intent"]], topic_weights, combine)
+        for kw, weight in zip(clusters["high_intent"], weights):
+            trend = signals.get(kw["keyword"], no_trend)
+            # Rising demand lifts the score, fading demand lowers it (bounded to +/-100% of the weight)
+            momentum = max(-1.0, min(1.0, trend["momentum"]))
             recommendations.append({
                 "topic": kw["keyword"],
-                "priority_score": weight * (kw["volume"] / 1000),
-                "intent": "commercial_purchase"
+                "priority_score": weight * (kw["volume"] / 1000) * (1 + momentum_weight * momentum),
+                "intent": "commercial_purchase",
+                "momentum": trend["momentum"],
+                "trend_spike": trend["spike"]
             })
 
         # Sort recommendations by priority score
         recommendations.sort(key=lambda x: x["priority_score"], reverse=True)
 
         self.global_memory.update_state("current_seo_clusters", clusters)
+        self.global_memory.update_state("keyword_clusters", topic_clusters)
+        rising = sorted(
+            ({"keyword": k, **v} for k, v in signals.items() if v["momentum"] > 0),
+            key=lambda x: x["momentum"], reverse=True
+        )[:20]
+        self.global_memory.update_state("keyword_trends", rising)
         self.global_memory.update_state("seo_recommendations", recommendations)
         
         self.log(f"Analysis complete. Generated {len(recommendations)} high-priority recommendations.")
         
         return NodeOutput(
-            data={"recommendations": recommendations, "clusters": clusters},
+            data={"recommendations": recommendations, "clusters": clusters, "topic_clusters": topic_clusters},
             metadata={"status": "analysis_complete", "top_priority": recommendations[0]["topic"] if recommendations else "N/A"}
         )
@@ -7,8 +7,11 @@ class SocialDistributionSwarm(BaseNode):
     """
     NODE_10: SOCIAL_DISTRIBUTION_SWARM
     Generates multi-platform social media drafts to amplify engine insights and lead wins.
+    Lead wins are drafted once: each run only covers Tier A leads added since the last.
     """
 
+    CURSOR_KEY = "social_swarm_lead_cursor"
+
     def __init__(self):
         super().__init__("NODE_10", "Marketing Swarm")
 
@@ -16,15 +19,22 @@ class SocialDistributionSwarm(BaseNode):
         self.log("Social Swarm initialized. Reviewing recent wins...")
         
         # 1. Gather context from memory
-        leads = self.global_memory.get_state("lead_quality") or []
         assets = self.global_memory.get_state("published_assets") or []
         total_co2 = self.global_memory.get_state("total_co2_offset") or 0.0
         
         drafts = []
 
         # 2. Strategy A: Amplify Tier A Lead Wins (Anonymous)
-        tier_a_leads = [l for l in leads if l.get("score") == "A"]
-        for lead in tier_a_leads:
+        # Only leads added since the last run: the cursor is the lead count then
+        leads = self.global_memory.table("lead_quality")
+        cursor = self.global_memory.get_state(self.CURSOR_KEY) or 0
+        if cursor > len(leads):
+            # The lead list was replaced; its rows are all new to the swarm
+            cursor = 0
+        # The index holds row positions; rows are read from the columnar lead table
+        new_wins = self.global_memory.aggregate_since("tier_a_leads", cursor)
+        for position in new_wins:
+            lead = leads.row(position)
             industry = lead.get("industry", "Manufacturing").replace("-", " ").title()
             drafts.append({
                 "platform": "LinkedIn",
@@ -64,7 +74,7 @@ class SocialDistributionSwarm(BaseNode):
 
         # 5. Save drafts to file system
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        social_dir = os.path.join(project_root, "content", "social")
+        social_dir = self.config.get("SOCIAL_DRAFTS_DIR", os.path.join(project_root, "content", "social"))
         if not os.path.exists(social_dir):
             os.makedirs(social_dir)
 
@@ -72,7 +82,8 @@ class SocialDistributionSwarm(BaseNode):
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(drafts, f, indent=4)
 
-        self.log(f"Social Swarm generated {len(drafts)} drafts. Saved to content/social/")
+        self.global_memory.update_state(self.CURSOR_KEY, len(leads))
+        self.log(f"Social Swarm generated {len(drafts)} drafts ({len(new_wins)} new Tier A wins). Saved to content/social/")
 
         return NodeOutput(
             data={"drafts": drafts},
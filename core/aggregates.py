@@ -0,0 +1,194 @@
+import abc
+import bisect
+from typing import Any, Dict, List, Optional, Tuple
+from core.lead_table import LeadTable
+
+class Aggregate(abc.ABC):
+    """
+    Materialized view over a GlobalMemory list, updated in O(1) per appended
+    item. Subclasses implement `add`, `value`, and a JSON-serializable state.
+    Aggregates with `persist = False` are not written to the backend; they are
+    refolded from the list on first use after a restart instead.
+    """
+
+    persist = True
+
+    def __init__(self, key: str):
+        self.key = key
+        self.reset()
+
+    @abc.abstractmethod
+    def reset(self):
+        pass
+
+    @abc.abstractmethod
+    def add(self, item: Dict[str, Any]):
+        pass
+
+    @abc.abstractmethod
+    def value(self) -> Any:
+        pass
+
+    def get_state(self) -> Any:
+        return self.value()
+
+    @abc.abstractmethod
+    def set_state(self, state: Any):
+        pass
+
+    def fold_table(self, table: Any):
+        """
+        Rebuilds the aggregate from a columnar LeadTable with vectorized reductions.
+        """
+        self.reset()
+        for row in table.rows():
+            self.add(row)
+
+class CountBy(Aggregate):
+    """
+    Item counts grouped by the value of `field`.
+    """
+
+    def __init__(self, key: str, field: str):
+        self.field = field
+        super().__init__(key)
+
+    def reset(self):
+        self.counts: Dict[str, int] = {}
+
+    def add(self, item: Dict[str, Any]):
+        value = item.get(self.field)
+        # Same label LeadTable interns None as, so folded and incremental counts agree
+        group = LeadTable.MISSING if value is None else str(value)
+        self.counts[group] = self.counts.get(group, 0) + 1
+
+    def value(self) -> Dict[str, int]:
+        return dict(self.counts)
+
+    def set_state(self, state: Any):
+        self.counts = dict(state)
+
+    def fold_table(self, table: Any):
+        self.counts = table.counts_by(self.field)
+
+class SumOf(Aggregate):
+    """
+    Running total of a numeric `field`.
+    """
+
+    def __init__(self, key: str, field: str):
+        self.field = field
+        super().__init__(key)
+
+    def reset(self):
+        self.total = 0.0
+
+    def add(self, item: Dict[str, Any]):
+        self.total += item.get(self.field, 0) or 0
+
+    def value(self) -> float:
+        return self.total
+
+    def set_state(self, state: Any):
+        self.total = float(state)
+
+    def fold_table(self, table: Any):
+        self.total = table.sum(self.field)
+
+class BandCount(Aggregate):
+    """
+    Counts of a numeric `field` bucketed into labelled bands. `bands` is a list
+    of (exclusive lower bound, label) pairs checked highest first; values at or
+    below every bound fall into `default`.
+    """
+
+    def __init__(self, key: str, field: str, bands: List[Tuple[float, str]], default: str):
+        self.field = field
+        self.bands = sorted(bands, reverse=True)
+        self.default = default
+        super().__init__(key)
+
+    def reset(self):
+        self.counts: Dict[str, int] = {label: 0 for _, label in self.bands}
+        self.counts[self.default] = 0
+
+    def band_of(self, value: float) -> str:
+        for lower, label in self.bands:
+            if value > lower:
+                return label
+        return self.default
+
+    def add(self, item: Dict[str, Any]):
+        band = self.band_of(item.get(self.field, 0) or 0)
+        self.counts[band] += 1
+
+    def value(self) -> Dict[str, int]:
+        return dict(self.counts)
+
+    def set_state(self, state: Any):
+        self.reset()
+        self.counts.update(state)
+
+    def fold_table(self, table: Any):
+        self.reset()
+        self.counts.update(table.band_counts(self.field, self.bands, self.default))
+
+class IndexWhere(Aggregate):
+    """
+    Row positions of the items whose `field` equals `match`, e.g. every Tier A
+    lead. Positions are cheap to rebuild from a LeadTable, so they are never
+    persisted. Readers that only want new rows use `since(row)`, which copies
+    just the positions at or past `row` instead of the whole index.
+    """
+
+    persist = False
+
+    def __init__(self, key: str, field: str, match: Any):
+        self.field = field
+        self.match = match
+        super().__init__(key)
+
+    def reset(self):
+        self.positions: List[int] = []
+        self.seen = 0
+
+    def add(self, item: Dict[str, Any]):
+        if item.get(self.field) == self.match:
+            self.positions.append(self.seen)
+        self.seen += 1
+
+    def value(self) -> List[int]:
+        return list(self.positions)
+
+    def since(self, row: int) -> List[int]:
+        # Positions are appended in row order, so they are sorted
+        return self.positions[bisect.bisect_left(self.positions, row):]
+
+    def set_state(self, state: Any):
+        self.positions = list(state["positions"])
+        self.seen = state["seen"]
+
+    def get_state(self) -> Any:
+        return {"positions": self.positions, "seen": self.seen}
+
+    def fold_table(self, table: Any):
+        self.positions = table.where(self.field, str(self.match)).tolist()
+        self.seen = len(table)
+
+def default_lead_aggregates() -> Dict[str, Aggregate]:
+    """
+    Aggregates the analytics, phase, optimization and social nodes query.
+    """
+    return {
+        "leads_by_tier": CountBy("lead_quality", "score"),
+        "leads_by_industry": CountBy("lead_quality", "industry"),
+        # Same capex heuristic NODE_7 uses to infer the lead topic
+        "leads_by_capex_band": BandCount(
+            "lead_quality", "capex",
+            [(2000000, "industrial"), (800000, "warehouse")],
+            default="commercial"
+        ),
+        "lead_capex_total": SumOf("lead_quality", "capex"),
+        "lead_co2_total": SumOf("lead_quality", "co2_offset"),
+        "tier_a_leads": IndexWhere("lead_quality", "score", "A"),
+    }
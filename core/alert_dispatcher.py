@@ -0,0 +1,222 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+import aiohttp
+
+class SlackAlertDispatcher:
+    """
+    Queues Slack alerts and delivers them from a background task over one
+    pooled aiohttp session, so callers never wait on Slack.
+
+    Sends are rate limited by a token bucket (`rate_per_minute`). When a burst
+    backs up beyond the available budget, the queued alerts are merged into
+    digest messages of up to `digest_size` alerts. Failed sends go into a retry
+    queue persisted at `retry_path` and are retried with exponential backoff.
+    """
+
+    def __init__(self, token: str, channel: str = "#leads", base_url: str = "https://slack.com/api",
+                 rate_per_minute: int = 20, digest_size: int = 25, retry_path: Optional[str] = None,
+                 max_attempts: int = 6, backoff_base: float = 2.0, backoff_max: float = 600.0,
+                 timeout: float = 10.0, metrics: Any = None):
+        self.token = token
+        self.channel = channel
+        self.base_url = base_url.rstrip("/")
+        self.rate_per_minute = max(1, rate_per_minute)
+        self.digest_size = max(2, digest_size)
+        self.retry_path = retry_path
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.metrics = metrics
+
+        self.stats = {"queued": 0, "sent": 0, "digests": 0, "retried": 0, "dropped": 0}
+        self._pending: Deque[str] = deque()
+        self._retries: List[Dict[str, Any]] = []
+        # Message being sent right now; put back in the queue if close() cancels the send
+        self._in_flight: Optional[Dict[str, Any]] = None
+        # Alerts never attempted before the last shutdown rejoin the backlog (and can be digested)
+        for entry in self._load_retries():
+            if entry.get("attempts"):
+                self._retries.append(entry)
+            else:
+                self._pending.append(entry["text"])
+        self._tokens = float(self.rate_per_minute)
+        self._refilled_at = time.monotonic()
+        self._wakeup = asyncio.Event()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
+        if self._pending or self._retries:
+            self._start()
+
+    def _start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def enqueue(self, text: str):
+        """
+        Queues an alert and returns immediately.
+        """
+        self._pending.append(text)
+        self.stats["queued"] += 1
+        self._start()
+        self._wakeup.set()
+
+    # Retry queue persistence
+
+    def _load_retries(self) -> List[Dict[str, Any]]:
+        if not self.retry_path or not os.path.exists(self.retry_path):
+            return []
+        try:
+            with open(self.retry_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _save_retries(self):
+        if not self.retry_path:
+            return
+        os.makedirs(os.path.dirname(self.retry_path) or ".", exist_ok=True)
+        tmp_path = f"{self.retry_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._retries, f)
+        os.replace(tmp_path, self.retry_path)
+
+    def _schedule_retry(self, text: str, attempts: int):
+        if attempts >= self.max_attempts:
+            self.stats["dropped"] += 1
+            print(f"[AlertDispatcher] Dropping alert after {attempts} failed attempts.")
+            return
+        delay = min(self.backoff_max, self.backoff_base ** attempts)
+        # Wall-clock time so the schedule survives a restart
+        self._retries.append({"text": text, "attempts": attempts, "next_attempt": time.time() + delay})
+        self.stats["retried"] += 1
+
+    # Rate limiting
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(float(self.rate_per_minute),
+                           self._tokens + (now - self._refilled_at) * self.rate_per_minute / 60.0)
+        self._refilled_at = now
+
+    def _seconds_until_token(self) -> float:
+        return max(0.0, (1.0 - self._tokens) * 60.0 / self.rate_per_minute)
+
+    def _next_message(self) -> Optional[Dict[str, Any]]:
+        """
+        Picks what to send with the next token: a due retry first, then either a
+        single alert or, when the backlog exceeds the budget, a digest.
+        """
+        now = time.time()
+        for i, entry in enumerate(self._retries):
+            if entry["next_attempt"] <= now:
+                self._retries.pop(i)
+                return entry
+        if not self._pending:
+            return None
+        if len(self._pending) <= self._tokens:
+            return {"text": self._pending.popleft(), "attempts": 0}
+        batch = [self._pending.popleft() for _ in range(min(self.digest_size, len(self._pending)))]
+        self.stats["digests"] += 1
+        header = f"📦 *Lead alert digest: {len(batch)} alerts* (rate limit {self.rate_per_minute}/min)\n"
+        return {"text": header + "\n———\n".join(batch), "attempts": 0}
+
+    # Delivery
+
+    async def _post(self, text: str) -> bool:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers={"Authorization": f"Bearer {self.token}"},
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        start = time.perf_counter()
+        status = "failure"
+        try:
+            async with self._session.post(f"{self.base_url}/chat.postMessage",
+                                          json={"channel": self.channel, "text": text}) as response:
+                if response.status == 429:
+                    # Respect Slack's backoff hint by draining the bucket
+                    retry_after = float(response.headers.get("Retry-After", 60))
+                    self._tokens = -retry_after * self.rate_per_minute / 60.0
+                    print(f"[AlertDispatcher] Rate limited by Slack, backing off {retry_after}s")
+                    return False
+                body = await response.json(content_type=None)
+                if response.status == 200 and body.get("ok"):
+                    status = "success"
+                    return True
+                print(f"[AlertDispatcher] Slack Error: {body.get('error', response.status)}")
+                return False
+        except asyncio.TimeoutError:
+            status = "timeout"
+            print(f"[AlertDispatcher] Slack Error: timed out after {self.timeout}s")
+            return False
+        except (aiohttp.ClientError, ValueError) as e:
+            print(f"[AlertDispatcher] Slack Error: {e}")
+            return False
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_external_call("slack", status, time.perf_counter() - start)
+
+    async def _run(self):
+        while True:
+            self._refill()
+            if self._tokens < 1.0:
+                await asyncio.sleep(self._seconds_until_token())
+                continue
+
+            message = self._next_message()
+            if message is None:
+                self._wakeup.clear()
+                due = [entry["next_attempt"] for entry in self._retries]
+                timeout = max(0.0, min(due) - time.time()) if due else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._tokens -= 1.0
+            self._in_flight = message
+            delivered = await self._post(message["text"])
+            self._in_flight = None
+            if delivered:
+                self.stats["sent"] += 1
+                if message["attempts"]:
+                    self._save_retries()
+            else:
+                self._schedule_retry(message["text"], message["attempts"] + 1)
+                self._save_retries()
+
+    async def drain(self, timeout: float = 5.0):
+        """
+        Waits up to `timeout` seconds for queued and in-flight alerts to be delivered.
+        """
+        deadline = time.monotonic() + timeout
+        while (self._pending or self._in_flight) and self._task is not None and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+    async def close(self, timeout: float = 5.0):
+        """
+        Delivers what it can within `timeout`, then persists anything left over
+        to the retry queue and closes the HTTP session.
+        """
+        await self.drain(timeout)
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._in_flight is not None:
+            # Cancelled mid-send: delivery is unconfirmed, so keep it (at-least-once)
+            self._retries.append({**self._in_flight, "next_attempt": time.time()})
+            self._in_flight = None
+        while self._pending:
+            self._retries.append({"text": self._pending.popleft(), "attempts": 0, "next_attempt": time.time()})
+        self._save_retries()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        print(f"[AlertDispatcher] Closed. Stats: {self.stats}, {len(self._retries)} alerts awaiting retry")
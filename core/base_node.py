@@ -1,5 +1,9 @@
 import abc
-from typing import Any, Dict, List, Optional
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass, field
 
 @dataclass
@@ -13,11 +17,15 @@ class BaseNode(abc.ABC):
     Abstract base class for all nodes in the Manokamana Solar Agentic Engine.
     """
 
+    # Bounded thread pool shared by every node for blocking SDK calls
+    _blocking_pool: Optional[ThreadPoolExecutor] = None
+
     def __init__(self, node_id: str, node_type: str):
         self.node_id = node_id
         self.node_type = node_type
         self.global_memory = None  # Will be set by Orchestrator
         self.config = None         # Will be set by Orchestrator
+        self.metrics = None        # Will be set by Orchestrator
 
     @abc.abstractmethod
     async def run(self, inputs: Dict[str, Any]) -> NodeOutput:
@@ -26,6 +34,12 @@ class BaseNode(abc.ABC):
         """
         pass
 
+    async def shutdown(self):
+        """
+        Releases background resources (sessions, queues). Called by the Orchestrator on exit.
+        """
+        pass
+
     def log(self, message: str):
         print(f"[{self.node_id}] {message}")
 
@@ -34,3 +48,36 @@ class BaseNode(abc.ABC):
 
     def set_config(self, config: Any):
         self.config = config
+
+    def set_metrics(self, metrics: Any):
+        self.metrics = metrics
+
+    def blocking_pool(self) -> ThreadPoolExecutor:
+        if BaseNode._blocking_pool is None:
+            size = self.config.get_int("BLOCKING_POOL_SIZE", 8) if self.config else 8
+            BaseNode._blocking_pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="node-blocking")
+        return BaseNode._blocking_pool
+
+    async def run_blocking(self, func: Callable[..., Any], *args, timeout: Optional[float] = None,
+                           service: Optional[str] = None, **kwargs) -> Any:
+        """
+        Runs a synchronous (network-bound) call on the shared thread pool so the
+        event loop keeps serving other nodes. Raises TimeoutError after `timeout`
+        seconds; a timed-out or cancelled call is abandoned and its result dropped,
+        since a running thread cannot be interrupted. When `service` is given the
+        call is timed into the external call metrics.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.blocking_pool(), functools.partial(func, *args, **kwargs))
+        start = time.perf_counter()
+        status = "failure"
+        try:
+            result = await asyncio.wait_for(future, timeout)
+            status = "success"
+            return result
+        except asyncio.TimeoutError:
+            status = "timeout"
+            raise TimeoutError(f"{getattr(func, '__qualname__', func)} timed out after {timeout}s")
+        finally:
+            if service and self.metrics is not None:
+                self.metrics.record_external_call(service, status, time.perf_counter() - start)
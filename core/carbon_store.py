@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import re
+import uuid
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+class CarbonReportStore:
+    """
+    Carbon reports packed into append-only JSONL shards, with an id -> (shard,
+    offset, length) index so any report is one seek away. Writes are buffered
+    and flushed in batches instead of one small file (and fsync) per lead;
+    `export` renders a standalone report file only when one is requested.
+    """
+
+    SHARD_PATTERN = "carbon-{:05d}.jsonl"
+    INDEX_FILE = "index.jsonl"
+    # Ids made by new_id already fit; anything else is slugged for export file names
+    SAFE_ID = re.compile(r"[a-z0-9_-]{1,128}")
+
+    def __init__(self, store_dir: str, shard_max_bytes: int = 64 * 1024 * 1024, batch_size: int = 64):
+        self.store_dir = store_dir
+        self.shard_max_bytes = shard_max_bytes
+        self.batch_size = max(1, batch_size)
+        os.makedirs(store_dir, exist_ok=True)
+        self.index: Dict[str, Tuple[int, int, int]] = {}
+        self._pending: List[Tuple[str, bytes]] = []
+        self._shard = 0
+        self._shard_file: Optional[IO[bytes]] = None
+        self._index_file: Optional[IO[str]] = None
+        self._load_index()
+
+    def _shard_path(self, shard: int) -> str:
+        return os.path.join(self.store_dir, self.SHARD_PATTERN.format(shard))
+
+    def _load_index(self):
+        index_path = os.path.join(self.store_dir, self.INDEX_FILE)
+        if os.path.exists(index_path):
+            sizes: Dict[int, int] = {}
+            with open(index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn last line from a crash mid-flush
+                        continue
+                    shard = entry["shard"]
+                    if shard not in sizes:
+                        path = self._shard_path(shard)
+                        sizes[shard] = os.path.getsize(path) if os.path.exists(path) else 0
+                    # Only trust entries whose bytes actually reached the shard
+                    if entry["offset"] + entry["length"] <= sizes[shard]:
+                        self.index[entry["id"]] = (shard, entry["offset"], entry["length"])
+                        self._shard = max(self._shard, shard)
+        # Continue the newest shard on disk even if its reports were never indexed
+        while os.path.exists(self._shard_path(self._shard + 1)):
+            self._shard += 1
+
+    @staticmethod
+    def new_id(name: Optional[str]) -> str:
+        """
+        Unique report id; the name part only makes ids readable.
+        """
+        slug = re.sub(r"[^a-z0-9]+", "_", (name or "anonymous").lower()).strip("_") or "anonymous"
+        return f"{slug}-{uuid.uuid4().hex[:12]}"
+
+    def put(self, report: Dict[str, Any], report_id: Optional[str] = None) -> str:
+        """
+        Buffers a report and returns its id; the batch is written once it is full.
+        """
+        report_id = report_id or self.new_id(report.get("entity_name"))
+        record = json.dumps({"id": report_id, **report}, separators=(",", ":")) + "\n"
+        self._pending.append((report_id, record.encode("utf-8")))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return report_id
+
+    def _open_shard(self) -> IO[bytes]:
+        """
+        Current shard opened for appending, rolling over to a new one once it is full.
+        """
+        while True:
+            if self._shard_file is None:
+                self._shard_file = open(self._shard_path(self._shard), "ab")
+            if self._shard_file.tell() < self.shard_max_bytes:
+                return self._shard_file
+            self._shard_file.close()
+            self._shard_file = None
+            self._shard += 1
+
+    def flush(self):
+        """
+        Appends buffered reports to the current shard, then their index entries.
+        Shard bytes are synced before the index so the index never points past them.
+        """
+        if not self._pending:
+            return
+        entries = []
+        shard_file = self._open_shard()
+        for report_id, record in self._pending:
+            if shard_file.tell() >= self.shard_max_bytes:
+                shard_file.flush()
+                os.fsync(shard_file.fileno())
+                shard_file = self._open_shard()
+            offset = shard_file.tell()
+            shard_file.write(record)
+            entries.append((report_id, self._shard, offset, len(record)))
+        shard_file.flush()
+        os.fsync(shard_file.fileno())
+
+        if self._index_file is None:
+            self._index_file = open(os.path.join(self.store_dir, self.INDEX_FILE), "a", encoding="utf-8")
+        self._index_file.write("".join(
+            json.dumps({"id": report_id, "shard": shard, "offset": offset, "length": length}) + "\n"
+            for report_id, shard, offset, length in entries
+        ))
+        self._index_file.flush()
+        for report_id, shard, offset, length in entries:
+            self.index[report_id] = (shard, offset, length)
+        self._pending = []
+
+    def get(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """
+        O(1) lookup: one seek and read in the report's shard.
+        """
+        if any(pending_id == report_id for pending_id, _ in self._pending):
+            self.flush()
+        location = self.index.get(report_id)
+        if location is None:
+            return None
+        shard, offset, length = location
+        with open(self._shard_path(shard), "rb") as f:
+            f.seek(offset)
+            record = json.loads(f.read(length))
+        record.pop("id", None)
+        return record
+
+    def __contains__(self, report_id: str) -> bool:
+        return report_id in self.index or any(pending_id == report_id for pending_id, _ in self._pending)
+
+    def __len__(self) -> int:
+        return len(self.index) + sum(1 for report_id, _ in self._pending if report_id not in self.index)
+
+    @classmethod
+    def export_name(cls, report_id: str) -> str:
+        """
+        File name for an exported report. Ids from outside (which may hold path
+        separators or "..") become a slug plus a hash of the id, so they can
+        never leave the export directory or collide with each other.
+        """
+        if cls.SAFE_ID.fullmatch(report_id):
+            return f"carbon_report_{report_id}.json"
+        slug = re.sub(r"[^a-z0-9]+", "_", report_id.lower()).strip("_")[:64] or "report"
+        digest = hashlib.sha256(report_id.encode("utf-8")).hexdigest()[:12]
+        return f"carbon_report_{slug}-{digest}.json"
+
+    def export(self, report_id: str, export_dir: str) -> Optional[str]:
+        """
+        Renders one report as a standalone, human-readable JSON file on demand.
+        """
+        report = self.get(report_id)
+        if report is None:
+            return None
+        os.makedirs(export_dir, exist_ok=True)
+        path = os.path.join(export_dir, self.export_name(report_id))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        os.replace(tmp_path, path)
+        return path
+
+    def close(self):
+        self.flush()
+        for handle in (self._shard_file, self._index_file):
+            if handle is not None:
+                handle.close()
+        self._shard_file = self._index_file = None
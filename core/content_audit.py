@@ -0,0 +1,182 @@
+import asyncio
+import datetime
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from core.rule_engine import RuleSet
+
+# Per-process compiled rule sets, keyed by (path, version), so each pool worker compiles once
+_WORKER_RULES: Dict[Tuple[str, str], RuleSet] = {}
+
+def audit_batch(rules_path: str, version: str, items: List[Tuple[str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Process pool entry point: scores (asset_id, text) pairs against the rule set.
+    """
+    key = (rules_path, version)
+    if key not in _WORKER_RULES:
+        _WORKER_RULES.clear()
+        _WORKER_RULES[key] = RuleSet.load(rules_path)
+    rules = _WORKER_RULES[key]
+    results = []
+    for asset_id, text in items:
+        verdict = rules.evaluate(text)
+        verdict.pop("matches")
+        results.append((asset_id, verdict))
+    return results
+
+class ContentAuditor:
+    """
+    Re-audits the published content tree (blog markdown and social drafts)
+    against the governance rule set. Verdicts are cached by (content hash,
+    rule-set version), so only new or edited assets, or every asset after a
+    rule change, are scanned. Scans are spread over a process pool that is
+    started once and kept until close(). Files that cannot be read or decoded
+    are reported as "unreadable" instead of aborting the audit.
+    """
+
+    # The engine process has live threads and an open sqlite connection; forking
+    # it can copy held locks, so workers start from a clean interpreter
+    POOL_CONTEXT = multiprocessing.get_context(
+        "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+
+    def __init__(self, content_dir: str, cache_path: str, workers: int = 4, batch_size: int = 64,
+                 inline_below: int = 32):
+        self.content_dir = content_dir
+        self.cache_path = cache_path
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        # Small jobs are cheaper to scan in-process than to start a pool for
+        self.inline_below = inline_below
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def iter_assets(self) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Yields (asset_id, text) for every blog post and social draft; text is
+        None for a file that cannot be read, decoded or parsed.
+        """
+        for path in sorted(glob.glob(os.path.join(self.content_dir, "blogs", "**", "*.md"), recursive=True)):
+            rel_path = os.path.relpath(path, self.content_dir)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"[ContentAuditor] Cannot read {rel_path}: {e}")
+                text = None
+            yield rel_path, text
+
+        for path in sorted(glob.glob(os.path.join(self.content_dir, "social", "*.json"))):
+            rel_path = os.path.relpath(path, self.content_dir)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    drafts = json.load(f)
+            except (OSError, ValueError) as e:
+                # ValueError covers both UnicodeDecodeError and invalid JSON
+                print(f"[ContentAuditor] Cannot read {rel_path}: {e}")
+                yield rel_path, None
+                continue
+            for i, draft in enumerate(drafts if isinstance(drafts, list) else []):
+                if isinstance(draft, dict):
+                    yield f"{rel_path}#{i}", str(draft.get("content", ""))
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache: Dict[str, Dict[str, Any]]):
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    async def _scan(self, rules: RuleSet, rules_path: str,
+                    pending: List[Tuple[str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+        if len(pending) < self.inline_below:
+            return audit_batch(rules_path, rules.version, pending)
+
+        loop = asyncio.get_running_loop()
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=self.POOL_CONTEXT)
+        pool = self._pool
+        try:
+            chunks = await asyncio.gather(*[
+                loop.run_in_executor(pool, audit_batch, rules_path, rules.version, batch) for batch in batches
+            ])
+        except BrokenProcessPool:
+            # A dead worker breaks the pool for good; the next audit starts a new one
+            if self._pool is pool:
+                self._pool = None
+            raise
+        return [result for chunk in chunks for result in chunk]
+
+    def close(self):
+        """
+        Stops the scan pool, if one was started.
+        """
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    async def audit(self, rules: RuleSet, rules_path: str, review_threshold: Optional[int] = None,
+                    block_threshold: Optional[int] = None) -> Dict[str, Any]:
+        cache = self._load_cache()
+        fresh_cache: Dict[str, Dict[str, Any]] = {}
+        assets: Dict[str, str] = {}
+        unreadable: List[str] = []
+        pending: List[Tuple[str, str]] = []
+        for asset_id, text in self.iter_assets():
+            if text is None:
+                unreadable.append(asset_id)
+                continue
+            cache_key = f"{self.content_hash(text)}:{rules.version}"
+            assets[asset_id] = cache_key
+            if cache_key in cache:
+                fresh_cache[cache_key] = cache[cache_key]
+            elif cache_key not in fresh_cache:
+                pending.append((asset_id, text))
+                # Placeholder so duplicate content is scanned once
+                fresh_cache[cache_key] = {}
+
+        by_asset = dict(await self._scan(rules, rules_path, pending))
+        for asset_id, text in pending:
+            fresh_cache[assets[asset_id]] = by_asset[asset_id]
+        # Entries for deleted assets or old rule versions are dropped here
+        self._save_cache(fresh_cache)
+
+        rows = []
+        summary = {"assets": len(assets) + len(unreadable), "scanned": len(pending),
+                   "cached": len(assets) - len(pending), "cleared": 0, "review": 0, "flagged": 0,
+                   "unreadable": len(unreadable)}
+        for asset_id, cache_key in assets.items():
+            verdict = fresh_cache[cache_key]
+            status = rules.status(verdict["risk_score"], review_threshold, block_threshold)
+            summary[status] += 1
+            rows.append({"asset": asset_id, "status": status, **verdict})
+        for asset_id in unreadable:
+            rows.append({"asset": asset_id, "status": "unreadable", "risk_score": None,
+                         "flags": ["File could not be read or decoded: manual review required"], "categories": []})
+        # Unreadable assets first: nothing about them has been checked
+        rows.sort(key=lambda row: (row["risk_score"] is not None, -(row["risk_score"] or 0), row["asset"]))
+
+        return {
+            "generated_at": datetime.datetime.now().isoformat(),
+            "rules_version": rules.version,
+            "summary": summary,
+            "assets": rows
+        }
@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Set
+from aiohttp import web
+from core.lead_table import LeadSortIndex, LeadTable
+
+class DashboardServer:
+    """
+    Local aiohttp server for the live dashboard. Replaces polling the full
+    report files with endpoints whose cost does not grow with the lead count:
+
+    - GET /api/summary: precomputed counters from the memory aggregates, with
+      ETag / If-None-Match so unchanged polls cost a 304.
+    - GET /api/leads?page=&size=&sort=&order=: one page of leads via a sort
+      index over the columnar lead table.
+    - GET /api/stream: Server-Sent Events with new leads and only the counters
+      that changed, pushed as NODE_4 / NODE_6 write to memory.
+
+    Everything else is served from `public_dir`.
+    """
+
+    SUMMARY_KEYS = ("lead_quality", "total_co2_offset", "published_assets", "current_risk_score",
+                    "budget_phase", "system_summary")
+    MAX_PAGE_SIZE = 200
+
+    def __init__(self, memory: Any, public_dir: str, summary_debounce: float = 0.5,
+                 keepalive_seconds: float = 15.0, client_queue_size: int = 1000):
+        self.memory = memory
+        self.public_dir = public_dir
+        self.summary_debounce = summary_debounce
+        self.keepalive_seconds = keepalive_seconds
+        self.client_queue_size = client_queue_size
+        self._clients: Set[asyncio.Queue] = set()
+        self._sort_indexes: Dict[str, LeadSortIndex] = {}
+        self._summary: Optional[Dict[str, Any]] = None
+        self._summary_body = b""
+        self._summary_etag = ""
+        self._summary_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    # Summary
+
+    def _build_summary(self) -> Dict[str, Any]:
+        # Node metrics and the report timestamp come from NODE_6's last snapshot
+        summary = dict(self.memory.get_state("system_summary") or {})
+        tier_counts = self.memory.aggregate("leads_by_tier")
+        risk_score = self.memory.get_state("current_risk_score") or 0
+        summary.update({
+            "total_leads": self.memory.list_length("lead_quality"),
+            "tier_counts": {tier: tier_counts.get(tier, 0) for tier in ("A", "B", "C")},
+            "published_assets_count": self.memory.list_length("published_assets"),
+            "current_risk_health": "Healthy" if risk_score < 50 else "High Risk",
+            "total_capex_potential": self.memory.aggregate("lead_capex_total"),
+            "total_co2_offset": round(self.memory.get_state("total_co2_offset") or 0.0, 2),
+            "budget_phase": self.memory.get_state("budget_phase")
+        })
+        return summary
+
+    def _refresh_summary(self) -> Dict[str, Any]:
+        """
+        Recomputes the summary; returns only the fields that changed.
+        """
+        summary = self._build_summary()
+        previous = self._summary or {}
+        changed = {k: v for k, v in summary.items() if previous.get(k) != v}
+        if changed or self._summary is None:
+            self._summary = summary
+            self._summary_body = json.dumps(summary, default=str).encode("utf-8")
+            self._summary_etag = f'"{hashlib.sha1(self._summary_body).hexdigest()}"'
+        return changed
+
+    async def _publish_summary(self):
+        # Coalesces a burst of writes (e.g. a lead batch) into one update
+        await asyncio.sleep(self.summary_debounce)
+        self._summary_task = None
+        changed = self._refresh_summary()
+        if changed:
+            self._broadcast("summary", changed)
+
+    # Memory changes
+
+    def _on_memory_change(self, key: str, values: Optional[List[Any]]):
+        if key not in self.SUMMARY_KEYS or self._loop is None:
+            return
+        # Nodes write memory from the event loop (blocking work in run_blocking
+        # never touches it), so this runs on the server's loop and row ids can
+        # be taken straight from the current length
+        start = self.memory.list_length(key) - len(values) if key == "lead_quality" and values else 0
+        self._handle_change(key, values, start)
+
+    def _handle_change(self, key: str, values: Optional[List[Any]], start: int):
+        if key == "lead_quality" and values and self._clients:
+            for offset, lead in enumerate(values):
+                self._broadcast("lead", {"id": start + offset, **lead})
+        if self._summary_task is None:
+            self._summary_task = asyncio.create_task(self._publish_summary())
+
+    def _broadcast(self, event: str, data: Dict[str, Any]):
+        message = f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode("utf-8")
+        for queue in list(self._clients):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # A stalled client must not hold memory for every future event; it reconnects
+                self._clients.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    # Handlers
+
+    async def _handle_summary(self, request: web.Request) -> web.Response:
+        if self._summary is None:
+            self._refresh_summary()
+        headers = {"ETag": self._summary_etag, "Cache-Control": "no-cache"}
+        if self._summary_etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=self._summary_body, content_type="application/json", headers=headers)
+
+    async def _handle_leads(self, request: web.Request) -> web.Response:
+        try:
+            page = max(1, int(request.query.get("page", 1)))
+            size = min(self.MAX_PAGE_SIZE, max(1, int(request.query.get("size", 50))))
+        except ValueError:
+            return web.json_response({"error": "page and size must be integers"}, status=400)
+        sort = request.query.get("sort", "timestamp")
+        order = request.query.get("order", "desc")
+        if sort not in LeadTable.FIELDS or order not in ("asc", "desc"):
+            return web.json_response({"error": f"sort must be one of {list(LeadTable.FIELDS)}, order asc|desc"},
+                                     status=400)
+
+        table = self.memory.table("lead_quality")
+        index = self._sort_indexes.get(sort)
+        if index is None or index.table is not table:
+            index = self._sort_indexes[sort] = LeadSortIndex(table, sort)
+        total = len(table)
+        etag = f'"{id(table)}-{total}-{sort}-{order}-{page}-{size}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=304, headers={"ETag": etag})
+
+        positions = index.page((page - 1) * size, size, descending=order == "desc")
+        leads = [{"id": int(i), **table.row(int(i))} for i in positions]
+        return web.json_response(
+            {"total": total, "page": page, "size": size, "sort": sort, "order": order, "leads": leads},
+            headers={"ETag": etag, "Cache-Control": "no-cache"}
+        )
+
+    async def _handle_stream(self, request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        })
+        await response.prepare(request)
+        if self._summary is None:
+            self._refresh_summary()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.client_queue_size)
+        self._clients.add(queue)
+        try:
+            await response.write(b"event: summary\ndata: " + self._summary_body + b"\n\n")
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    message = b": keepalive\n\n"
+                if message is None:
+                    break
+                await response.write(message)
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clients.discard(queue)
+        return response
+
+    async def _handle_root(self, request: web.Request) -> web.StreamResponse:
+        raise web.HTTPFound("/dashboard.html")
+
+    # Lifecycle
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080):
+        self._loop = asyncio.get_running_loop()
+        self.memory.subscribe(self._on_memory_change)
+        app = web.Application()
+        app.router.add_get("/api/summary", self._handle_summary)
+        app.router.add_get("/api/leads", self._handle_leads)
+        app.router.add_get("/api/stream", self._handle_stream)
+        app.router.add_get("/", self._handle_root)
+        if os.path.isdir(self.public_dir):
+            app.router.add_static("/", self.public_dir)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        print(f"[Dashboard] Serving live dashboard on http://{host}:{port}/")
+
+    async def stop(self):
+        self.memory.unsubscribe(self._on_memory_change)
+        if self._summary_task is not None:
+            self._summary_task.cancel()
+            self._summary_task = None
+        for queue in list(self._clients):
+            # Ends each open stream so the runner can shut down
+            try:
+                queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+        self._clients.clear()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        print("[Dashboard] Stopped.")
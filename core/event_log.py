@@ -0,0 +1,143 @@
+import datetime
+import json
+import os
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Union
+
+TimeBound = Optional[Union[str, datetime.datetime]]
+
+class EventLog:
+    """
+    Fixed-capacity in-memory event ring backed by append-only JSONL segments.
+
+    Entries evicted from the ring are batched and appended to the current
+    segment under `archive_dir`; segments rotate once they reach
+    `segment_bytes`. Without an archive directory evicted entries are dropped.
+    """
+
+    SEGMENT_PREFIX = "events-"
+    SEGMENT_SUFFIX = ".jsonl"
+
+    def __init__(self, capacity: int = 10000, archive_dir: Optional[str] = None,
+                 segment_bytes: int = 8 * 1024 * 1024, batch_size: int = 500):
+        self.capacity = max(1, capacity)
+        self.archive_dir = archive_dir
+        self.segment_bytes = segment_bytes
+        self.batch_size = max(1, batch_size)
+        self._ring: Deque[Dict[str, Any]] = deque()
+        self._pending: List[Dict[str, Any]] = []
+        # Number of oldest ring entries that are already on disk (after a flush)
+        self._ring_persisted = 0
+
+        if archive_dir and not os.path.exists(archive_dir):
+            os.makedirs(archive_dir)
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._ring))
+
+    def append(self, entry: Dict[str, Any]):
+        if len(self._ring) >= self.capacity:
+            evicted = self._ring.popleft()
+            if self._ring_persisted:
+                self._ring_persisted -= 1
+            elif self.archive_dir:
+                self._pending.append(evicted)
+                if len(self._pending) >= self.batch_size:
+                    self._write_pending()
+        self._ring.append(entry)
+
+    def flush(self):
+        """
+        Writes pending evictions and the current ring to disk so the full history
+        survives a restart. Ring entries stay in memory and are not written twice.
+        """
+        if not self.archive_dir:
+            return
+        unpersisted = list(self._ring)[self._ring_persisted:]
+        self._pending.extend(unpersisted)
+        self._ring_persisted = len(self._ring)
+        self._write_pending()
+
+    def _segment_paths(self) -> List[str]:
+        if not self.archive_dir or not os.path.exists(self.archive_dir):
+            return []
+        names = sorted(
+            n for n in os.listdir(self.archive_dir)
+            if n.startswith(self.SEGMENT_PREFIX) and n.endswith(self.SEGMENT_SUFFIX)
+        )
+        return [os.path.join(self.archive_dir, n) for n in names]
+
+    def _current_segment(self) -> str:
+        segments = self._segment_paths()
+        if segments and os.path.getsize(segments[-1]) < self.segment_bytes:
+            return segments[-1]
+        index = 1
+        if segments:
+            index = int(os.path.basename(segments[-1])[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]) + 1
+        return os.path.join(self.archive_dir, f"{self.SEGMENT_PREFIX}{index:06d}{self.SEGMENT_SUFFIX}")
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        payload = "".join(json.dumps(entry, default=str) + "\n" for entry in self._pending)
+        with open(self._current_segment(), "a", encoding="utf-8") as f:
+            f.write(payload)
+        self._pending = []
+
+    @staticmethod
+    def _first_timestamp(path: str) -> Optional[str]:
+        with open(path, "r", encoding="utf-8") as f:
+            line = f.readline()
+        try:
+            return json.loads(line).get("timestamp") if line else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _bound(value: TimeBound) -> Optional[str]:
+        if isinstance(value, datetime.datetime):
+            return value.isoformat()
+        return value
+
+    def iter_events(self, start: TimeBound = None, end: TimeBound = None,
+                    node_id: Optional[str] = None, event_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields events oldest-first across disk segments and memory, filtered by
+        timestamp range [start, end] and optionally node_id / event_type.
+        """
+        start, end = self._bound(start), self._bound(end)
+
+        def matches(entry: Dict[str, Any]) -> bool:
+            ts = entry.get("timestamp", "")
+            if start and ts < start:
+                return False
+            if end and ts > end:
+                return False
+            if node_id and entry.get("node_id") != node_id:
+                return False
+            if event_type and entry.get("event_type") != event_type:
+                return False
+            return True
+
+        segments = self._segment_paths()
+        first_stamps = [self._first_timestamp(p) for p in segments] if (start or end) else [None] * len(segments)
+        for i, path in enumerate(segments):
+            # Segments are time-ordered: skip those wholly before `start`, stop after `end`
+            if end and first_stamps[i] and first_stamps[i] > end:
+                return
+            if start and i + 1 < len(segments) and first_stamps[i + 1] and first_stamps[i + 1] < start:
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if matches(entry):
+                        yield entry
+
+        for entry in list(self._pending) + list(self._ring)[self._ring_persisted:]:
+            if matches(entry):
+                yield entry
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class GenerationCache:
+    """
+    Content-addressed on-disk cache for LLM generations.
+
+    Entries are keyed by a SHA-256 of the request parameters and stored one JSON
+    file per entry, with an in-memory LRU index in front so repeat hits avoid
+    disk. Fresh entries (younger than `ttl_seconds`) are served as-is; entries
+    within a further `stale_seconds` are served stale while the caller
+    revalidates. The least recently used entries are evicted once the cache
+    exceeds `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: float = 86400, stale_seconds: float = 604800,
+                 max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        # key -> {"created", "size", "value"}; ordered least recently used first
+        self._index: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._scan()
+
+    @staticmethod
+    def key(**parts: Any) -> str:
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _scan(self):
+        """
+        Rebuilds the LRU index from disk, using file mtimes as last access.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            entries.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = {"created": None, "size": size, "value": None}
+            self._total_bytes += size
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        if entry["value"] is None:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+                created = float(stored["created"])
+                value = stored["value"]
+            except (OSError, ValueError, KeyError, TypeError):
+                # Unreadable, truncated or malformed entries are misses
+                self._drop(key)
+                return None
+            entry["created"] = created
+            entry["value"] = value
+        return entry
+
+    def _drop(self, key: str):
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry["size"]
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Returns (value, state) where state is "fresh", "stale" or "miss".
+        """
+        entry = self._load(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None, "miss"
+
+        age = time.time() - entry["created"]
+        if age > self.ttl_seconds + self.stale_seconds:
+            self._drop(key)
+            self.stats["misses"] += 1
+            return None, "miss"
+
+        self._index.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        if age > self.ttl_seconds:
+            self.stats["stale_hits"] += 1
+            return entry["value"], "stale"
+        self.stats["hits"] += 1
+        return entry["value"], "fresh"
+
+    def put(self, key: str, value: Any):
+        stored = {"created": time.time(), "value": value}
+        payload = json.dumps(stored, default=str)
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, self._path(key))
+
+        if key in self._index:
+            self._total_bytes -= self._index[key]["size"]
+        size = len(payload.encode("utf-8"))
+        self._index[key] = {"created": stored["created"], "size": size, "value": value}
+        self._index.move_to_end(key)
+        self._total_bytes += size
+        self.stats["writes"] += 1
+        self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            oldest = next(iter(self._index))
+            self._drop(oldest)
+            self.stats["evictions"] += 1
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._total_bytes
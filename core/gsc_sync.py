@@ -0,0 +1,213 @@
+import asyncio
+import datetime
+import os
+import sqlite3
+import urllib.parse
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import aiohttp
+
+class KeywordStore:
+    """
+    Local SQLite store of daily Search Console rows (date, query, page) plus a
+    per-site sync watermark, so analysis never has to re-download history.
+    """
+
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS gsc_rows ("
+        " site TEXT NOT NULL, date TEXT NOT NULL, query TEXT NOT NULL, page TEXT NOT NULL,"
+        " clicks INTEGER NOT NULL, impressions INTEGER NOT NULL, ctr REAL, position REAL,"
+        " PRIMARY KEY (site, date, query, page)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS gsc_rows_date ON gsc_rows (site, date)",
+        "CREATE TABLE IF NOT EXISTS sync_state (site TEXT PRIMARY KEY, watermark TEXT NOT NULL)",
+    ]
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    def watermark(self, site: str) -> Optional[str]:
+        row = self.conn.execute("SELECT watermark FROM sync_state WHERE site = ?", (site,)).fetchone()
+        return row[0] if row else None
+
+    def write_day(self, site: str, date: str, rows: List[Dict[str, Any]], advance_watermark: bool):
+        """
+        Replaces one day's rows in a single transaction and optionally moves the
+        watermark to that day, so a crash never leaves a half-written day marked done.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM gsc_rows WHERE site = ? AND date = ?", (site, date))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO gsc_rows (site, date, query, page, clicks, impressions, ctr, position) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (site, date, r["keys"][1], r["keys"][2], int(r.get("clicks", 0)), int(r.get("impressions", 0)),
+                     r.get("ctr"), r.get("position"))
+                    for r in rows
+                )
+            )
+            if advance_watermark:
+                self.conn.execute(
+                    "INSERT INTO sync_state (site, watermark) VALUES (?, ?) "
+                    "ON CONFLICT(site) DO UPDATE SET watermark = excluded.watermark",
+                    (site, date)
+                )
+
+    def query_totals(self, site: str, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Per-query totals since `since` (inclusive), largest impressions first.
+        """
+        cursor = self.conn.execute(
+            "SELECT query, SUM(impressions), SUM(clicks), "
+            " SUM(position * impressions) / MAX(SUM(impressions), 1) "
+            "FROM gsc_rows WHERE site = ? AND date >= ? GROUP BY query ORDER BY SUM(impressions) DESC",
+            (site, since or "")
+        )
+        return [
+            {"keyword": query, "volume": impressions, "clicks": clicks, "position": round(position or 0.0, 2)}
+            for query, impressions, clicks, position in cursor
+        ]
+
+    def daily_series(self, site: str, since: str) -> Iterator[Tuple[str, str, int]]:
+        """
+        (query, date, impressions) per day since `since` (inclusive), summed over pages.
+        """
+        return self.conn.execute(
+            "SELECT query, date, SUM(impressions) FROM gsc_rows WHERE site = ? AND date >= ? GROUP BY query, date",
+            (site, since)
+        )
+
+    def close(self):
+        self.conn.close()
+
+class GSCSync:
+    """
+    Incremental Search Console sync. Fetches every day after the store's
+    watermark (or the last `lookback_days` on first run) with paginated
+    searchAnalytics.query calls, several days in flight at once under a
+    concurrency cap. Rate limits (429), 5xx responses and connection errors
+    are retried with exponential backoff, honouring Retry-After. `base_url`
+    can point at a local stand-in server.
+    """
+
+    DEFAULT_BASE_URL = "https://searchconsole.googleapis.com/webmasters/v3"
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, store: KeywordStore, site_url: str, base_url: str = DEFAULT_BASE_URL,
+                 token_provider: Optional[Callable[[], Optional[str]]] = None, concurrency: int = 4,
+                 row_limit: int = 25000, lookback_days: int = 90, data_lag_days: int = 2,
+                 timeout: float = 30.0, max_attempts: int = 4, backoff_base: float = 1.0,
+                 backoff_max: float = 60.0, metrics: Any = None):
+        self.store = store
+        self.site_url = site_url
+        self.base_url = base_url.rstrip("/")
+        self.token_provider = token_provider
+        self.concurrency = max(1, concurrency)
+        self.row_limit = row_limit
+        self.lookback_days = lookback_days
+        self.data_lag_days = data_lag_days
+        self.timeout = timeout
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.metrics = metrics
+
+    def pending_dates(self, today: Optional[datetime.date] = None) -> List[str]:
+        today = today or datetime.date.today()
+        # Search Console data for the last couple of days is still incomplete
+        end = today - datetime.timedelta(days=self.data_lag_days)
+        watermark = self.store.watermark(self.site_url)
+        if watermark:
+            start = datetime.date.fromisoformat(watermark) + datetime.timedelta(days=1)
+        else:
+            start = end - datetime.timedelta(days=self.lookback_days - 1)
+        return [(start + datetime.timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+    async def _fetch_day(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                         date: str) -> List[Dict[str, Any]]:
+        url = f"{self.base_url}/sites/{urllib.parse.quote(self.site_url, safe='')}/searchAnalytics/query"
+        rows: List[Dict[str, Any]] = []
+        start_row = 0
+        async with semaphore:
+            while True:
+                body = {
+                    "startDate": date, "endDate": date,
+                    "dimensions": ["date", "query", "page"],
+                    "rowLimit": self.row_limit, "startRow": start_row
+                }
+                page = await self._fetch_page(session, url, body)
+                rows.extend(page)
+                if len(page) < self.row_limit:
+                    return rows
+                start_row += self.row_limit
+
+    async def _fetch_page(self, session: aiohttp.ClientSession, url: str,
+                          body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        attempt = 1
+        while True:
+            started = asyncio.get_running_loop().time()
+            status = "failure"
+            retry_after = None
+            try:
+                async with session.post(url, json=body) as response:
+                    if response.status in self.RETRY_STATUSES and attempt < self.max_attempts:
+                        retry_after = response.headers.get("Retry-After")
+                    else:
+                        response.raise_for_status()
+                        page = (await response.json()).get("rows", [])
+                        status = "success"
+                        return page
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.max_attempts:
+                    raise
+            finally:
+                if self.metrics is not None:
+                    self.metrics.record_external_call("gsc", status, asyncio.get_running_loop().time() - started)
+
+            delay = self.backoff_base * 2 ** (attempt - 1)
+            if retry_after is not None:
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    pass
+            attempt += 1
+            await asyncio.sleep(min(self.backoff_max, delay))
+
+    async def sync(self, today: Optional[datetime.date] = None) -> Dict[str, Any]:
+        """
+        Downloads and stores every pending day. The watermark only advances over
+        an unbroken run of successful days, so a failed day is retried next time.
+        """
+        dates = self.pending_dates(today)
+        if not dates:
+            return {"days": 0, "rows": 0, "watermark": self.store.watermark(self.site_url)}
+
+        headers = {}
+        token = self.token_provider() if self.token_provider else None
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with aiohttp.ClientSession(headers=headers, timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            results = await asyncio.gather(
+                *[self._fetch_day(session, semaphore, date) for date in dates], return_exceptions=True
+            )
+
+        total_rows, synced, contiguous = 0, 0, True
+        for date, result in zip(dates, results):
+            if isinstance(result, Exception):
+                print(f"[GSCSync] Failed to fetch {date}: {result}")
+                contiguous = False
+                continue
+            self.store.write_day(self.site_url, date, result, advance_watermark=contiguous)
+            total_rows += len(result)
+            synced += 1
+        watermark = self.store.watermark(self.site_url)
+        print(f"[GSCSync] Synced {synced}/{len(dates)} days ({total_rows} rows). Watermark: {watermark}")
+        return {"days": synced, "rows": total_rows, "watermark": watermark}
@@ -0,0 +1,390 @@
+import asyncio
+import csv
+import itertools
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from aiohttp import web
+from core.roi_calculator import INDUSTRY_MULTIPLIERS
+
+class LeadIngestionService:
+    """
+    Streams leads from JSONL/CSV files, a polled drop directory and a local HTTP
+    endpoint into a bounded priority queue drained by a pool of NODE_4 workers.
+
+    Producers block while the queue is full, so a bulk import never runs ahead
+    of scoring. Leads whose pre-score looks like Tier A are dequeued first.
+    Accepted leads are never dropped: stop() drains the queue for up to
+    `drain_timeout` seconds and writes whatever is left (queued, in flight or
+    parked by the risk gate) back to the inbox for the next start.
+    """
+
+    FILE_SUFFIXES = (".jsonl", ".csv")
+    NUMERIC_FIELDS = ("roof_size", "electricity_bill")
+    READ_BATCH = 500
+
+    def __init__(self, orchestrator: Any, workers: int = 4, queue_size: int = 1000,
+                 inbox_dir: Optional[str] = None, poll_interval: float = 2.0, drain_timeout: float = 10.0):
+        self.orchestrator = orchestrator
+        self.workers = max(1, workers)
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=max(1, queue_size))
+        self.inbox_dir = inbox_dir
+        self.poll_interval = poll_interval
+        self.drain_timeout = drain_timeout
+        self.stats = {"queued": 0, "processed": 0, "failed": 0, "rejected": 0, "blocked": 0}
+        # (lead, source file) pairs held back by the risk gate
+        self._parked: List[Tuple[Dict[str, Any], Optional[str]]] = []
+        # sequence -> (lead, source file) currently being scored by a worker
+        self._in_flight: Dict[int, Tuple[Dict[str, Any], Optional[str]]] = {}
+        # path -> {"outstanding", "sealed", "rejected", "move_to"} for files still being worked off
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._sequence = itertools.count()
+        self._workers: List[asyncio.Task] = []
+        self._feeders: List[asyncio.Task] = []
+        self._watcher: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._runner: Optional[web.AppRunner] = None
+
+    @staticmethod
+    def prescore(lead: Dict[str, Any]) -> Tuple[int, float]:
+        """
+        Cheap stand-in for NODE_4's tiering: the same effective-bill thresholds
+        without the ROI projection. Returns (tier rank, -effective bill) so that
+        likely Tier A leads and larger bills sort first.
+        """
+        try:
+            bill = float(lead.get("electricity_bill", 0) or 0)
+        except (TypeError, ValueError):
+            bill = 0.0
+        effective_bill = bill * INDUSTRY_MULTIPLIERS.get(lead.get("operation_type", "other"), 1.0)
+        if effective_bill > 50000:
+            rank = 0
+        elif effective_bill > 15000:
+            rank = 1
+        else:
+            rank = 2
+        return rank, -effective_bill
+
+    async def submit(self, lead: Dict[str, Any], source: Optional[str] = None):
+        """
+        Queues a lead for scoring, waiting for space if the queue is full.
+        `source` is the file being ingested, which stays in the inbox until all
+        of its leads are handled.
+        """
+        if source is not None:
+            self._sources[source]["outstanding"] += 1
+        await self._enqueue(lead, source)
+
+    async def _enqueue(self, lead: Dict[str, Any], source: Optional[str]):
+        rank, bill = self.prescore(lead)
+        # The sequence number keeps FIFO order within a priority and avoids comparing dicts
+        await self.queue.put((rank, bill, next(self._sequence), lead, source))
+        self.stats["queued"] += 1
+
+    def _handled(self, source: Optional[str]):
+        if source is None or source not in self._sources:
+            return
+        self._sources[source]["outstanding"] -= 1
+        self._finish_source(source)
+
+    def _finish_source(self, source: str):
+        """
+        Moves a fully ingested file to processed/ (with its error report) once
+        every lead it queued has been scored or has failed.
+        """
+        entry = self._sources[source]
+        if not entry["sealed"] or entry["outstanding"] > 0:
+            return
+        del self._sources[source]
+        if entry["move_to"] is None:
+            return
+        name = os.path.basename(source)
+        try:
+            if entry["rejected"]:
+                with open(os.path.join(entry["move_to"], f"{name}.errors.jsonl"), "w", encoding="utf-8") as f:
+                    f.writelines(json.dumps(row) + "\n" for row in entry["rejected"])
+            os.replace(source, os.path.join(entry["move_to"], name))
+        except OSError as e:
+            print(f"[Ingestion] Could not move {name} to processed/: {e}")
+
+    @classmethod
+    def _coerce(cls, lead: Dict[str, Any]) -> Dict[str, Any]:
+        for field in cls.NUMERIC_FIELDS:
+            value = lead.get(field)
+            if isinstance(value, str):
+                try:
+                    lead[field] = float(value) if value.strip() else 0
+                except ValueError:
+                    pass
+        return lead
+
+    @staticmethod
+    def _read_rows(path: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Yields (line number, lead, error) per row; rows that are not a JSON
+        object come back with an error instead of a lead.
+        """
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            if path.endswith(".csv"):
+                reader = csv.DictReader(f)
+                for row in reader:
+                    if None in row:
+                        yield reader.line_num, None, "more values than header columns"
+                    else:
+                        yield reader.line_num, dict(row), None
+                return
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    lead = json.loads(line)
+                except ValueError as e:
+                    yield line_no, None, f"invalid JSON: {e}"
+                    continue
+                if isinstance(lead, dict):
+                    yield line_no, lead, None
+                else:
+                    yield line_no, None, f"expected a JSON object, got {type(lead).__name__}"
+
+    async def _read_batches(self, path: str) -> AsyncIterator[List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]]:
+        """
+        `_read_rows` in batches read on NODE_4's blocking pool, off the event loop.
+        """
+        rows = self._read_rows(path)
+        node = self.orchestrator.nodes["NODE_4"]
+        try:
+            while True:
+                batch = await node.run_blocking(lambda: list(itertools.islice(rows, self.READ_BATCH)))
+                if not batch:
+                    return
+                yield batch
+        finally:
+            try:
+                rows.close()
+            except ValueError:
+                # Cancelled while a pool thread is still reading; it is closed when collected
+                pass
+
+    async def ingest_file(self, path: str, move_to: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Streams a JSONL or CSV file of leads into the queue.
+
+        The file is read through once before anything is queued, so a file that
+        cannot be read (I/O, encoding or CSV errors) queues nothing and can be
+        dropped again safely. Bad rows are skipped and returned in `rejected`.
+        With `move_to`, the file is moved there once all its leads are handled.
+        """
+        rejected = []
+        async for batch in self._read_batches(path):
+            rejected.extend({"line": line_no, "error": error} for line_no, _, error in batch if error is not None)
+        self._sources[path] = {"outstanding": 0, "sealed": False, "rejected": rejected, "move_to": move_to}
+        count = 0
+        try:
+            async for batch in self._read_batches(path):
+                for _, lead, _ in batch:
+                    if lead is not None:
+                        await self.submit(self._coerce(lead), source=path)
+                        count += 1
+        finally:
+            self._sources[path]["sealed"] = True
+            self._finish_source(path)
+        self.stats["rejected"] += len(rejected)
+        print(f"[Ingestion] Queued {count} leads from {os.path.basename(path)}"
+              + (f" ({len(rejected)} rows rejected)" if rejected else ""))
+        return {"queued": count, "rejected": rejected}
+
+    async def watch_directory(self):
+        """
+        Polls the inbox for new .jsonl/.csv files. Writers should drop files
+        atomically (write elsewhere, then rename). A file moves to `processed/`
+        once all its leads are handled, with a `<name>.errors.jsonl` report
+        listing rejected rows; unreadable ones move to `failed/` without any of
+        their leads queued.
+        """
+        processed_dir = os.path.join(self.inbox_dir, "processed")
+        failed_dir = os.path.join(self.inbox_dir, "failed")
+        for directory in (self.inbox_dir, processed_dir, failed_dir):
+            os.makedirs(directory, exist_ok=True)
+        print(f"[Ingestion] Watching {self.inbox_dir} for lead files")
+
+        while not self._stopping:
+            names = sorted(
+                n for n in os.listdir(self.inbox_dir)
+                if n.endswith(self.FILE_SUFFIXES) and os.path.isfile(os.path.join(self.inbox_dir, n))
+            )
+            for name in names:
+                path = os.path.join(self.inbox_dir, name)
+                if self._stopping:
+                    return
+                if path in self._sources:
+                    # Still being worked off
+                    continue
+                try:
+                    await self.ingest_file(path, move_to=processed_dir)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # One bad file must not stop the watcher
+                    print(f"[Ingestion] Failed to ingest {name}: {e}")
+                    if path in self._sources:
+                        # Some leads were queued; the file finishes when they are handled
+                        continue
+                    try:
+                        os.replace(path, os.path.join(failed_dir, name))
+                    except OSError as move_error:
+                        print(f"[Ingestion] Could not move {name} to failed/: {move_error}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def release_parked(self):
+        """
+        Re-queues leads parked by the risk gate once NODE_4 is allowed to run again.
+        """
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if self._parked and self.orchestrator.risk_gate("NODE_4") is None:
+                parked, self._parked = self._parked, []
+                print(f"[Ingestion] Risk gate open again; re-queuing {len(parked)} parked leads")
+                for lead, source in parked:
+                    await self._enqueue(lead, source)
+
+    def _save_pending(self):
+        """
+        Writes every accepted but unscored lead (parked, queued or interrupted
+        in flight) back to the inbox, so the next start ingests them. Files
+        whose remaining leads were all saved move to processed/; a file that was
+        still being read stays in the inbox and is read again in full.
+        """
+        pending = list(self._parked) + list(self._in_flight.values())
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait()[3:])
+            self.queue.task_done()
+        self._parked, self._in_flight = [], {}
+        unsealed = {path for path, entry in self._sources.items() if not entry["sealed"]}
+        leads = [lead for lead, source in pending if source not in unsealed]
+        if leads and not self.inbox_dir:
+            print(f"[Ingestion] No inbox directory; {len(leads)} unscored leads were dropped")
+        elif leads:
+            os.makedirs(self.inbox_dir, exist_ok=True)
+            path = os.path.join(self.inbox_dir, f"pending-{int(time.time() * 1000)}.jsonl")
+            # The .tmp name is ignored by the watcher until the rename
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(lead, default=str) + "\n" for lead in leads)
+            os.replace(f"{path}.tmp", path)
+            print(f"[Ingestion] Saved {len(leads)} unscored leads to {path}")
+        for path in list(self._sources):
+            if path not in unsealed:
+                self._sources[path]["outstanding"] = 0
+                self._finish_source(path)
+        self._sources = {}
+
+    async def _handle_leads(self, request: web.Request) -> web.Response:
+        if self._stopping:
+            return web.json_response({"error": "Shutting down."}, status=503)
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.json_response({"error": "Body must be JSON."}, status=400)
+        leads = payload if isinstance(payload, list) else [payload]
+        if not all(isinstance(lead, dict) for lead in leads):
+            return web.json_response({"error": "Expected a lead object or a list of them."}, status=400)
+        for lead in leads:
+            await self.submit(self._coerce(lead))
+        return web.json_response({"queued": len(leads), "queue_depth": self.queue.qsize()}, status=202)
+
+    async def _handle_status(self, request: web.Request) -> web.Response:
+        return web.json_response({**self.stats, "queue_depth": self.queue.qsize(), "parked": len(self._parked),
+                                  "workers": self.workers})
+
+    async def start_http(self, host: str = "127.0.0.1", port: int = 8081):
+        """
+        Serves POST /leads (one lead or a list) and GET /leads/status.
+        """
+        app = web.Application()
+        app.router.add_post("/leads", self._handle_leads)
+        app.router.add_get("/leads/status", self._handle_status)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        print(f"[Ingestion] Accepting leads on http://{host}:{port}/leads")
+
+    async def _score(self, lead: Dict[str, Any], source: Optional[str]):
+        output = await self.orchestrator.run_node("NODE_4", {"lead": lead})
+        if output.metadata.get("status") == "blocked":
+            # Held back by the risk gate, not scored: keep it for later
+            self._parked.append((lead, source))
+            self.stats["blocked"] += 1
+            return
+        # Carbon report for Tier A leads, as in the simulation pipeline
+        if output.metadata.get("score") == "A" and "NODE_9" in self.orchestrator.nodes:
+            await self.orchestrator.run_node("NODE_9", {
+                "lead": {"name": lead.get("name", "Anonymous")},
+                "roi_results": output.data
+            })
+        self.stats["processed"] += 1
+        self._handled(source)
+
+    async def _worker(self):
+        while True:
+            _, _, sequence, lead, source = await self.queue.get()
+            self._in_flight[sequence] = (lead, source)
+            try:
+                await self._score(lead, source)
+            except asyncio.CancelledError:
+                # Interrupted by stop(): the lead stays in _in_flight and is saved
+                raise
+            except Exception as e:
+                self.stats["failed"] += 1
+                print(f"[Ingestion] Lead {lead.get('name', 'Anonymous')} failed: {e}")
+                self._handled(source)
+            finally:
+                self.queue.task_done()
+            del self._in_flight[sequence]
+
+    async def start(self, host: Optional[str] = None, port: int = 0):
+        """
+        Starts the worker pool, plus the inbox watcher and HTTP endpoint when configured.
+        """
+        self._stopping = False
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._feeders = [asyncio.create_task(self.release_parked())]
+        if self.inbox_dir:
+            self._watcher = asyncio.create_task(self.watch_directory())
+        if port:
+            await self.start_http(host or "127.0.0.1", port)
+        print(f"[Ingestion] Started {self.workers} NODE_4 workers (queue size {self.queue.maxsize})")
+
+    async def join(self):
+        """
+        Waits until every queued lead has been processed.
+        """
+        await self.queue.join()
+
+    async def stop(self):
+        """
+        Stops taking leads, lets the workers drain the queue for up to
+        `drain_timeout` seconds, then saves whatever is left to the inbox.
+        """
+        self._stopping = True
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        for task in self._feeders:
+            task.cancel()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.drain_timeout
+        if self._watcher:
+            # The watcher finishes the file it is reading (workers keep making room) unless that outlasts the timeout
+            await asyncio.wait([self._watcher], timeout=self.drain_timeout)
+            self._watcher.cancel()
+        try:
+            await asyncio.wait_for(self.queue.join(), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            print(f"[Ingestion] {self.queue.qsize()} leads still queued after {self.drain_timeout}s")
+        tasks = self._feeders + self._workers + ([self._watcher] if self._watcher else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._feeders, self._workers, self._watcher = [], [], None
+        self._save_pending()
+        print("[Ingestion] Stopped.")
@@ -0,0 +1,242 @@
+import re
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+# \w alone splits Indic words at their vowel signs (combining marks), so combining
+# diacritics and the Indic blocks are added whole, less the danda punctuation
+TOKEN_PATTERN = re.compile(r"[\w\u0300-\u036f\u0900-\u0963\u0966-\u0dff]+")
+STOPWORDS = frozenset((
+    "a", "an", "the", "of", "for", "in", "on", "to", "and", "or", "is", "are", "what", "how",
+    "with", "at", "by", "from", "my", "your", "do", "does", "i", "can", "vs", "which", "why"
+))
+
+# Multiply-shift hashing: (a * h + b) mod 2**64, top 32 bits; uint64 overflow does the mod
+HASH_SHIFT = np.uint64(32)
+BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+class KeywordClusterer:
+    """
+    Groups search queries by topical similarity with MinHash + LSH.
+
+    Each query becomes a set of content tokens hashed with crc32. A NumPy
+    MinHash signature of `num_perm` values approximates the Jaccard similarity
+    between token sets. Signatures are split into `bands`; queries sharing a
+    band bucket become candidates, and each query joins the highest-volume
+    candidate whose estimated similarity reaches `threshold`. The band index
+    is kept, so new queries can be assigned to existing clusters without
+    re-clustering. Queries with no content tokens (only punctuation or
+    stopwords) have nothing to compare and each get their own cluster.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.5, seed: int = 7):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64)
+        self._token_hashes: Dict[str, int] = {}
+
+        self.clusters: List[Dict[str, Any]] = []
+        self._signatures: List[np.ndarray] = []          # representative signature per cluster
+        self._band_index: List[Dict[int, int]] = [{} for _ in range(bands)]
+        self._token_counts: List[Counter] = []
+
+    # Signatures
+
+    @staticmethod
+    def tokenize(query: str) -> List[str]:
+        return [t for t in TOKEN_PATTERN.findall(query.lower()) if t not in STOPWORDS]
+
+    def _hash_token(self, token: str) -> int:
+        value = self._token_hashes.get(token)
+        if value is None:
+            value = zlib.crc32(token.encode("utf-8"))
+            self._token_hashes[token] = value
+        return value
+
+    def signatures(self, token_lists: List[List[str]]) -> np.ndarray:
+        """
+        MinHash signatures (n x num_perm). Token sets are flattened into one
+        array, permuted per hash function and min-reduced per query.
+        """
+        n = len(token_lists)
+        lengths = np.fromiter((len(set(t)) for t in token_lists), dtype=np.int64, count=n)
+        hashes = np.fromiter(
+            (self._hash_token(tok) for tokens in token_lists for tok in set(tokens)),
+            dtype=np.uint64, count=int(lengths.sum())
+        )
+        signatures = np.full((n, self.num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+        nonempty = lengths > 0
+        if not hashes.size:
+            return signatures
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+        minima = np.empty((self.num_perm, len(starts)), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for j in range(self.num_perm):
+                permuted = (self._a[j] * hashes + self._b[j]) >> HASH_SHIFT
+                minima[j] = np.minimum.reduceat(permuted, starts)
+        signatures[nonempty] = minima.T
+        return signatures
+
+    def _band_keys(self, signatures: np.ndarray, band: int) -> np.ndarray:
+        """
+        One uint64 per row for the band's slice of the signature (a polynomial
+        hash; integer keys sort and hash far faster than byte strings).
+        """
+        block = signatures[:, band * self.rows:(band + 1) * self.rows]
+        keys = np.zeros(len(signatures), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for column in range(self.rows):
+                keys = keys * BAND_MULTIPLIER + block[:, column]
+        return keys
+
+    # Batch clustering
+
+    def fit(self, keywords: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Clusters `keywords` ({"keyword", "volume", ...}) from scratch. Returns
+        cluster summaries sorted by total volume.
+        """
+        n = len(keywords)
+        volumes = np.fromiter((kw.get("volume", 0) or 0 for kw in keywords), dtype=np.float64, count=n)
+        # Highest volume first, so every bucket is anchored on its most searched query
+        order = np.argsort(-volumes, kind="stable")
+        keywords = [keywords[i] for i in order]
+        volumes = volumes[order]
+        token_lists = [self.tokenize(kw.get("keyword", "")) for kw in keywords]
+        signatures = self.signatures(token_lists)
+        # Empty token sets share the all-max signature; keep them out of every bucket
+        empty = np.fromiter((not tokens for tokens in token_lists), dtype=bool, count=n)
+
+        # Each query follows the bucket anchor it agrees with most, if above the threshold
+        rows = np.arange(n)
+        best_anchor = rows.copy()
+        best_score = np.zeros(n)
+        for band in range(self.bands):
+            _, first, inverse = np.unique(self._band_keys(signatures, band), return_index=True, return_inverse=True)
+            anchor = first[inverse.ravel()]
+            # Pairs already accepted in an earlier band need no second comparison
+            candidate = np.flatnonzero((anchor != rows) & (anchor != best_anchor) & ~empty)
+            if not candidate.size:
+                continue
+            agreement = (signatures[candidate] == signatures[anchor[candidate]]).mean(axis=1)
+            better = (agreement >= self.threshold) & (agreement > best_score[candidate])
+            best_anchor[candidate[better]] = anchor[candidate[better]]
+            best_score[candidate[better]] = agreement[better]
+        # One hop only: an anchor that itself follows someone hands over its leader,
+        # but similarity is never chained further (no transitive closure)
+        leaders = best_anchor[best_anchor]
+        _, labels = np.unique(leaders, return_inverse=True)
+        labels = labels.ravel()
+
+        self.clusters, self._signatures, self._token_counts = [], [], []
+        self._band_index = [{} for _ in range(self.bands)]
+        # Stable sort keeps volume order inside each cluster, so members[0] is the representative
+        cluster_order = np.argsort(labels, kind="stable")
+        boundaries = np.flatnonzero(np.diff(labels[cluster_order])) + 1
+        for members in np.split(cluster_order, boundaries) if n else []:
+            cluster_id = len(self.clusters)
+            self._add_cluster(cluster_id, [keywords[i] for i in members], [token_lists[i] for i in members],
+                              signatures[members[0]], float(volumes[members].sum()))
+        self._index_signatures(signatures[~empty], labels[~empty])
+
+        self.labels_ = np.empty(n, dtype=np.int64)
+        self.labels_[order] = labels
+        return self.summary()
+
+    # Incremental assignment
+
+    def _add_cluster(self, cluster_id: int, members: List[Dict[str, Any]], token_lists: List[List[str]],
+                     signature: np.ndarray, volume: float):
+        counts = Counter(tok for tokens in token_lists for tok in set(tokens))
+        self._token_counts.append(counts)
+        self._signatures.append(signature)
+        self.clusters.append({
+            "cluster_id": cluster_id,
+            "representative": members[0].get("keyword", ""),
+            "representative_volume": members[0].get("volume", 0) or 0,
+            "size": len(members),
+            "volume": volume,
+            "sample": [m.get("keyword", "") for m in members[:5]]
+        })
+
+    def _index_signatures(self, signatures: np.ndarray, labels: np.ndarray):
+        for band in range(self.bands):
+            keys = self._band_keys(signatures, band)
+            _, first = np.unique(keys, return_index=True)
+            # Rows are volume-ordered, so each bucket points at its highest-volume cluster
+            self._band_index[band].update(zip(keys[first].tolist(), labels[first].tolist()))
+
+    def assign(self, keywords: List[Dict[str, Any]]) -> List[int]:
+        """
+        Assigns new keywords to the closest existing cluster via the band index,
+        or opens a new cluster. Existing clusters are never recomputed.
+        """
+        token_lists = [self.tokenize(kw.get("keyword", "")) for kw in keywords]
+        signatures = self.signatures(token_lists)
+        assigned = []
+        for kw, tokens, signature in zip(keywords, token_lists, signatures):
+            volume = kw.get("volume", 0) or 0
+            if not tokens:
+                assigned.append(len(self.clusters))
+                self._add_cluster(len(self.clusters), [kw], [tokens], signature, float(volume))
+                continue
+            keys = [self._band_keys(signature[None, :], band)[0] for band in range(self.bands)]
+            candidates = {self._band_index[band].get(int(key)) for band, key in enumerate(keys)}
+            candidates.discard(None)
+
+            best, best_score = None, self.threshold
+            for cluster_id in candidates:
+                score = float((self._signatures[cluster_id] == signature).mean())
+                if score >= best_score:
+                    best, best_score = cluster_id, score
+
+            if best is None:
+                best = len(self.clusters)
+                self._add_cluster(best, [kw], [tokens], signature, float(volume))
+            else:
+                cluster = self.clusters[best]
+                cluster["size"] += 1
+                cluster["volume"] += volume
+                self._token_counts[best].update(set(tokens))
+                if len(cluster["sample"]) < 5:
+                    cluster["sample"].append(kw.get("keyword", ""))
+                if volume > cluster["representative_volume"]:
+                    cluster["representative"] = kw.get("keyword", "")
+                    cluster["representative_volume"] = volume
+            for band, key in enumerate(keys):
+                self._band_index[band].setdefault(int(key), best)
+            assigned.append(best)
+        return assigned
+
+    # Output
+
+    def label(self, cluster_id: int, top: int = 3) -> str:
+        """
+        The cluster's most common tokens, in the order they appear in its representative query.
+        """
+        common = [tok for tok, _ in self._token_counts[cluster_id].most_common(top)]
+        representative = self.tokenize(self.clusters[cluster_id]["representative"])
+        ordered = [tok for tok in dict.fromkeys(representative) if tok in common]
+        ordered += [tok for tok in common if tok not in ordered]
+        return " ".join(ordered) or self.clusters[cluster_id]["representative"]
+
+    def summary(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        ranked = sorted(self.clusters, key=lambda c: c["volume"], reverse=True)[:limit]
+        return [
+            {
+                "cluster_id": c["cluster_id"],
+                "label": self.label(c["cluster_id"]),
+                "representative": c["representative"],
+                "size": c["size"],
+                "volume": c["volume"],
+                "sample": list(c["sample"])
+            }
+            for c in ranked
+        ]
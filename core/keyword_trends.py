@@ -0,0 +1,135 @@
+import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+class KeywordTrends:
+    """
+    Daily impressions per keyword as one dense (keywords x days) float32
+    matrix. Growth, spike and momentum signals are computed for every keyword
+    at once with cumulative sums and column slices, never per-keyword loops.
+
+    - growth: mean of the last `window` days vs the `window` days before it.
+    - spike_z: z-score of the last `window` days' mean against the preceding
+      `baseline_window` days.
+    - momentum: log ratio of the recent mean to the baseline mean after
+      dividing out each keyword's day-of-week profile, so a Monday peak is
+      not read as a trend.
+    """
+
+    SEASON = 7
+
+    def __init__(self, keywords: List[str], start: datetime.date, volumes: np.ndarray):
+        if volumes.ndim != 2 or volumes.shape[0] != len(keywords):
+            raise ValueError("volumes must have one row per keyword.")
+        self.keywords = keywords
+        self.start = start
+        self.volumes = volumes
+
+    @property
+    def days(self) -> int:
+        return self.volumes.shape[1]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, float]], start: datetime.date,
+                  days: int) -> "KeywordTrends":
+        """
+        Builds the matrix from (keyword, ISO date, impressions) rows; days outside
+        the window are ignored and missing days stay at zero.
+        """
+        rows = list(rows)
+        if not rows:
+            return cls([], start, np.zeros((0, days), dtype=np.float32))
+        keywords, dates, values = zip(*rows)
+
+        names, row_index = np.unique(np.asarray(keywords, dtype=object), return_inverse=True)
+        day_index = (np.asarray(dates, dtype="datetime64[D]") - np.datetime64(start, "D")).astype(np.int64)
+        inside = (day_index >= 0) & (day_index < days)
+        volumes = np.zeros((len(names), days), dtype=np.float32)
+        np.add.at(volumes, (row_index.ravel()[inside], day_index[inside]), np.asarray(values, dtype=np.float32)[inside])
+        return cls(names.tolist(), start, volumes)
+
+    @classmethod
+    def from_store(cls, store: Any, site: str, days: int = 365, today: Optional[datetime.date] = None,
+                   data_lag_days: int = 2) -> "KeywordTrends":
+        """
+        Loads `days` days of per-query impressions from a KeywordStore, ending at
+        the store's sync watermark (the last complete day). Without a watermark
+        the window ends `data_lag_days` before today, like GSCSync.pending_dates,
+        so days that were never synced do not read as a drop to zero.
+        """
+        watermark = store.watermark(site)
+        if watermark:
+            end = datetime.date.fromisoformat(watermark)
+        else:
+            end = (today or datetime.date.today()) - datetime.timedelta(days=data_lag_days)
+        start = end - datetime.timedelta(days=days - 1)
+        return cls.from_rows(store.daily_series(site, start.isoformat()), start, days)
+
+    def rolling_mean(self, window: int) -> np.ndarray:
+        """
+        Trailing `window`-day means; column j covers days j .. j + window - 1.
+        """
+        totals = np.zeros((len(self.keywords), self.days + 1), dtype=np.float64)
+        np.cumsum(self.volumes, axis=1, out=totals[:, 1:])
+        return (totals[:, window:] - totals[:, :-window]) / window
+
+    def _seasonal_profile(self) -> np.ndarray:
+        """
+        Per-keyword weight of each day of the week (mean 1.0), from full weeks only.
+        """
+        full = (self.days // self.SEASON) * self.SEASON
+        series = self.volumes[:, self.days - full:]
+        if not full:
+            return np.ones((len(self.keywords), self.SEASON))
+        # Columns of the reshaped block are fixed offsets within the week
+        by_weekday = series.reshape(len(self.keywords), -1, self.SEASON).mean(axis=1, dtype=np.float64)
+        overall = by_weekday.mean(axis=1, keepdims=True)
+        profile = np.divide(by_weekday, overall, out=np.ones_like(by_weekday), where=overall > 0)
+        # Weekdays that never had impressions would otherwise blow up the division
+        return np.maximum(profile, 0.1)
+
+    def analyze(self, window: int = 7, baseline_window: int = 28) -> Dict[str, np.ndarray]:
+        """
+        Returns growth, spike_z and momentum arrays aligned with `self.keywords`.
+        """
+        n = len(self.keywords)
+        if self.days < window + baseline_window or not n:
+            zeros = np.zeros(n)
+            return {"growth": zeros, "spike_z": zeros, "momentum": zeros}
+
+        means = self.rolling_mean(window)
+        recent, previous = means[:, -1], means[:, -1 - window]
+        growth = (recent - previous) / (previous + 1.0)
+
+        baseline = self.volumes[:, -window - baseline_window:-window].astype(np.float64)
+        mu = baseline.mean(axis=1)
+        sigma = baseline.std(axis=1)
+        # Standard error of a `window`-day mean; the +1 keeps near-silent keywords from spiking on noise
+        spike_z = (recent - mu) / (sigma / np.sqrt(window) + 1.0)
+
+        # Only the compared span is deseasonalized; the profile itself uses the whole history
+        span = window + baseline_window
+        columns = (np.arange(self.days - span, self.days) - self.days % self.SEASON) % self.SEASON
+        adjusted = self.volumes[:, -span:] / self._seasonal_profile()[:, columns]
+        adjusted_recent = adjusted[:, -window:].mean(axis=1)
+        adjusted_baseline = adjusted[:, :-window].mean(axis=1)
+        momentum = np.log1p(adjusted_recent) - np.log1p(adjusted_baseline)
+
+        return {"growth": growth, "spike_z": spike_z, "momentum": momentum}
+
+    def signals(self, window: int = 7, baseline_window: int = 28,
+                spike_threshold: float = 3.0) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-keyword signals keyed by keyword.
+        """
+        result = self.analyze(window, baseline_window)
+        growth, spike_z, momentum = (result[k].tolist() for k in ("growth", "spike_z", "momentum"))
+        return {
+            keyword: {
+                "growth": round(growth[i], 4),
+                "spike_z": round(spike_z[i], 2),
+                "spike": spike_z[i] >= spike_threshold,
+                "momentum": round(momentum[i], 4)
+            }
+            for i, keyword in enumerate(self.keywords)
+        }
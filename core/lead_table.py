@@ -0,0 +1,252 @@
+import datetime
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+import numpy as np
+
+class LeadTable:
+    """
+    Columnar store for scored leads. Numeric fields live in typed NumPy buffers
+    that grow geometrically; tier, industry and routing are interned to small
+    integer codes, with None stored as the explicit MISSING label. 28 bytes per
+    lead (3 float64 + 2 uint8 + uint16, up to twice that in unused capacity)
+    instead of a ~600 byte dict. Fields outside FIELDS are kept per row in a sparse
+    overflow map rather than dropped.
+
+    Timestamps are stored as UTC epoch seconds and `row()` returns them as
+    UTC ISO strings with an explicit +00:00 offset.
+    """
+
+    FIELDS = ("timestamp", "score", "capex", "industry", "co2_offset", "routing")
+    FLOAT_FIELDS = ("timestamp", "capex", "co2_offset")
+    CATEGORY_FIELDS = {"score": np.uint8, "industry": np.uint16, "routing": np.uint8}
+    MISSING = "unknown"
+    _field_set = frozenset(FIELDS)
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._capacity = max(16, capacity)
+        self._columns: Dict[str, np.ndarray] = {}
+        for name in self.FLOAT_FIELDS:
+            self._columns[name] = np.empty(self._capacity, dtype=np.float64)
+        for name, dtype in self.CATEGORY_FIELDS.items():
+            self._columns[name] = np.empty(self._capacity, dtype=dtype)
+        self._codes: Dict[str, Dict[str, int]] = {name: {} for name in self.CATEGORY_FIELDS}
+        self._labels: Dict[str, List[str]] = {name: [] for name in self.CATEGORY_FIELDS}
+        # row -> fields outside FIELDS; only rows that carry any are stored
+        self._extras: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self, needed: int):
+        if needed <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        self._capacity = capacity
+
+    def _intern(self, field: str, value: Any) -> int:
+        label = self.MISSING if value is None else str(value)
+        codes = self._codes[field]
+        code = codes.get(label)
+        if code is None:
+            code = len(self._labels[field])
+            if code > np.iinfo(self.CATEGORY_FIELDS[field]).max:
+                raise ValueError(f"Too many distinct values for {field}.")
+            codes[label] = code
+            self._labels[field].append(label)
+        return code
+
+    @staticmethod
+    def _parse_timestamp(value: Any) -> float:
+        """
+        UTC epoch seconds for a number (already an epoch), datetime or ISO string.
+        """
+        if isinstance(value, (int, float)):
+            return float(value)
+        if not isinstance(value, datetime.datetime):
+            try:
+                value = datetime.datetime.fromisoformat(str(value))
+            except ValueError:
+                # Legacy rows carry the placeholder "now"
+                return math.nan
+        if value.tzinfo is None:
+            # Rows written before timestamps carried an offset hold local wall-clock time
+            value = value.astimezone()
+        return value.astimezone(datetime.timezone.utc).timestamp()
+
+    def append(self, row: Dict[str, Any]):
+        self.extend([row])
+
+    def extend(self, rows: Iterable[Dict[str, Any]]):
+        rows = list(rows)
+        if not rows:
+            return
+        start = self._size
+        self._grow(start + len(rows))
+        end = start + len(rows)
+        cols = self._columns
+        cols["timestamp"][start:end] = [self._parse_timestamp(r.get("timestamp")) for r in rows]
+        cols["capex"][start:end] = [r.get("capex", 0) or 0 for r in rows]
+        cols["co2_offset"][start:end] = [r.get("co2_offset", 0) or 0 for r in rows]
+        cols["score"][start:end] = [self._intern("score", r.get("score")) for r in rows]
+        cols["industry"][start:end] = [self._intern("industry", r.get("industry", "other")) for r in rows]
+        cols["routing"][start:end] = [self._intern("routing", r.get("routing")) for r in rows]
+        for offset, r in enumerate(rows):
+            extra = r.keys() - self._field_set
+            if extra:
+                self._extras[start + offset] = {k: r[k] for k in extra}
+        self._size = end
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Zero-copy, read-only view of a column (category fields return codes).
+        """
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def labels(self, field: str) -> List[str]:
+        return list(self._labels[field])
+
+    def code_of(self, field: str, label: str) -> int:
+        return self._codes[field].get(label, -1)
+
+    def decoded(self, field: str) -> np.ndarray:
+        """
+        Category column as an array of labels (allocates).
+        """
+        return np.asarray(self._labels[field], dtype=object)[self.column(field)] if self._size else np.array([], dtype=object)
+
+    def counts_by(self, field: str) -> Dict[str, int]:
+        counts = np.bincount(self.column(field), minlength=len(self._labels[field]))
+        return {label: int(counts[i]) for i, label in enumerate(self._labels[field]) if counts[i]}
+
+    def sum(self, field: str) -> float:
+        return float(self.column(field).sum())
+
+    def band_counts(self, field: str, bands: Sequence[Tuple[float, str]], default: str) -> Dict[str, int]:
+        """
+        Vectorized equivalent of BandCount: (exclusive lower bound, label) bands.
+        """
+        ordered = sorted(bands)
+        edges = np.array([lower for lower, _ in ordered], dtype=np.float64)
+        names = [default] + [label for _, label in ordered]
+        # side="left" puts a value equal to a bound in the band below it
+        index = np.searchsorted(edges, self.column(field), side="left")
+        counts = np.bincount(index, minlength=len(names))
+        return {label: int(counts[i]) for i, label in enumerate(names)}
+
+    def where(self, field: str, label: str) -> np.ndarray:
+        """
+        Row positions whose category `field` equals `label`.
+        """
+        code = self.code_of(field, label)
+        if code < 0:
+            return np.array([], dtype=np.int64)
+        return np.flatnonzero(self.column(field) == code)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("LeadTable index out of range")
+        cols = self._columns
+        ts = cols["timestamp"][index]
+        row = {
+            "timestamp": "now" if math.isnan(ts) else datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat(),
+            "score": self._labels["score"][cols["score"][index]],
+            "capex": float(cols["capex"][index]),
+            "industry": self._labels["industry"][cols["industry"][index]],
+            "co2_offset": float(cols["co2_offset"][index]),
+            "routing": self._labels["routing"][cols["routing"][index]]
+        }
+        extra = self._extras.get(index)
+        if extra:
+            row.update(extra)
+        return row
+
+    def rows(self) -> "LeadRows":
+        return LeadRows(self)
+
+class LeadRows(Sequence):
+    """
+    Thin list-like view that materializes row dicts on access, so code written
+    against the old list of dicts keeps working.
+    """
+
+    def __init__(self, table: LeadTable):
+        self.table = table
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self.table.row(i) for i in range(*index.indices(len(self.table)))]
+        return self.table.row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self.table)):
+            yield self.table.row(i)
+
+class LeadSortIndex:
+    """
+    Row order of a LeadTable sorted by one field, kept current as rows are
+    appended: only the new rows are sorted and merged in, so paging through
+    the table never re-sorts it. Category fields sort by label.
+    """
+
+    def __init__(self, table: LeadTable, field: str):
+        if field not in LeadTable.FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+        self.table = table
+        self.field = field
+        self._order = np.array([], dtype=np.int64)
+        self._keys = np.array([], dtype=np.float64)
+        self._label_count = 0
+
+    def _key_values(self, start: int) -> np.ndarray:
+        values = self.table.column(self.field)[start:]
+        if self.field not in LeadTable.CATEGORY_FIELDS:
+            # NaN timestamps (legacy "now" rows) sort first
+            return np.nan_to_num(values.astype(np.float64), nan=-np.inf)
+        labels = self.table.labels(self.field)
+        rank = np.empty(len(labels), dtype=np.float64)
+        rank[np.argsort(np.asarray(labels, dtype=object), kind="stable")] = np.arange(len(labels))
+        return rank[values]
+
+    def refresh(self):
+        size = len(self.table)
+        known = len(self._order)
+        if size == known:
+            return
+        labels = len(self.table.labels(self.field)) if self.field in LeadTable.CATEGORY_FIELDS else 0
+        if size < known or labels != self._label_count:
+            # Table replaced, or a new label changed every rank: start over
+            known = 0
+            self._order = np.array([], dtype=np.int64)
+            self._keys = np.array([], dtype=np.float64)
+            self._label_count = labels
+        keys = self._key_values(known)
+        new_order = np.argsort(keys, kind="stable")
+        new_keys = keys[new_order]
+        # side="right" keeps equal keys in insertion order
+        positions = np.searchsorted(self._keys, new_keys, side="right")
+        self._order = np.insert(self._order, positions, new_order + known)
+        self._keys = np.insert(self._keys, positions, new_keys)
+
+    def page(self, offset: int, limit: int, descending: bool = False) -> np.ndarray:
+        """
+        Row positions for one page of the sorted table.
+        """
+        self.refresh()
+        if descending:
+            end = len(self._order) - offset
+            return self._order[max(0, end - limit):max(0, end)][::-1]
+        return self._order[offset:offset + limit]
@@ -1,32 +1,223 @@
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional
 import datetime
+from core.event_log import EventLog
+from core.storage import StorageBackend
+from core.aggregates import Aggregate, IndexWhere, default_lead_aggregates
+from core.lead_table import LeadRows, LeadTable
 
 class GlobalMemory:
     """
     Manages global state and logs for the entire agentic system.
     """
 
-    def __init__(self):
-        self.memory: Dict[str, Any] = {
-            "keyword_performance": [],
-            "lead_quality": [],
-            "conversion_feedback": [],
-            "content_performance": [],
-            "risk_scores": [],
-            "budget_phase": "STATE_1",
-            "published_assets": []
-        }
-        self.event_log: List[Dict[str, Any]] = []
+    DEFAULTS: Dict[str, Any] = {
+        "keyword_performance": [],
+        "lead_quality": [],
+        "conversion_feedback": [],
+        "content_performance": [],
+        "risk_scores": [],
+        "budget_phase": "STATE_1",
+        "published_assets": []
+    }
 
-    def update_state(self, key: str, value: Any):
+    # Per-run values that must not outlive the process: a stale risk score would
+    # close the orchestrator's risk gate on the next start until NODE_5 reruns
+    TRANSIENT = {"current_risk_score"}
+
+    AGGREGATE_PREFIX = "__aggregate__:"
+    # List keys held in columnar tables instead of Python lists of dicts
+    TABLES = {"lead_quality": LeadTable}
+
+    def __init__(self, event_log_capacity: int = 10000, event_archive_dir: Optional[str] = None,
+                 backend: Optional[StorageBackend] = None):
+        self.backend = backend or StorageBackend()
+        # Persisted keys are restored lazily: only their kind is read at startup
+        self._stored_kinds = {k: v for k, v in self.backend.keys().items() if k not in self.TRANSIENT}
+        self.memory: Dict[str, Any] = {}
+        for key, value in self.DEFAULTS.items():
+            if key in self._stored_kinds:
+                continue
+            if key in self.TABLES:
+                self.memory[key] = self.TABLES[key]()
+            else:
+                self.memory[key] = list(value) if isinstance(value, list) else value
+        # Bounded ring; older entries spill to JSONL segments on disk
+        self.event_log = EventLog(event_log_capacity, event_archive_dir)
+
+        # Materialized aggregates over list keys, kept current on every append
+        self.aggregates: Dict[str, Aggregate] = {}
+        self._aggregate_ready: Dict[str, bool] = {}
+        self._aggregate_folded: Dict[str, int] = {}
+        self._aggregate_dirty: Dict[str, bool] = {}
+        for name, aggregate in default_lead_aggregates().items():
+            self.register_aggregate(name, aggregate)
+        # Change callbacks (key, appended values or None when the key was replaced)
+        self._listeners: List[Callable[[str, Optional[List[Any]]], None]] = []
+
+    def _ensure_loaded(self, key: str):
         if key in self.memory:
-            self.memory[key] = value
+            return
+        kind = self._stored_kinds.get(key)
+        if kind == "list" and key in self.TABLES:
+            table = self.TABLES[key]()
+            table.extend(self.backend.load_list(key))
+            self.memory[key] = table
+        elif kind == "list":
+            self.memory[key] = self.backend.load_list(key)
+        elif kind == "value":
+            self.memory[key] = self.backend.load_value(key)
+
+    def _is_list(self, key: str) -> bool:
+        if key in self.memory:
+            return isinstance(self.memory[key], (list, LeadTable))
+        return self._stored_kinds.get(key) == "list"
+
+    def update_state(self, key: str, value: Any):
+        if isinstance(value, LeadRows):
+            value = list(value)
+        if key in self.TABLES and isinstance(value, list):
+            table = self.TABLES[key]()
+            table.extend(value)
+            self.memory[key] = table
         else:
             self.memory[key] = value
+        if isinstance(value, list):
+            self.backend.set_list(key, value)
+            self._stored_kinds[key] = "list"
+        elif key not in self.TRANSIENT:
+            self.backend.set_value(key, value)
+            self._stored_kinds[key] = "value"
+        # A replaced list invalidates its aggregates; they refold on next query
+        for name, aggregate in self.aggregates.items():
+            if aggregate.key == key:
+                self._aggregate_ready[name] = False
+        self._notify(key, None)
 
     def append_to_list(self, key: str, value: Any):
-        if key in self.memory and isinstance(self.memory[key], list):
-            self.memory[key].append(value)
+        # Write-through without loading the persisted list
+        if self._is_list(key):
+            for name, aggregate in self.aggregates.items():
+                if aggregate.key == key:
+                    self._ensure_aggregate(name)
+                    aggregate.add(value)
+                    self._aggregate_folded[name] += 1
+                    self._aggregate_dirty[name] = True
+            if key in self.memory:
+                self.memory[key].append(value)
+            self.backend.append(key, value)
+            self._stored_kinds[key] = "list"
+            self._notify(key, [value])
+
+    def extend_list(self, key: str, values: List[Any]):
+        """
+        Bulk append_to_list: one table/backend write for the whole batch.
+        """
+        if not values or not self._is_list(key):
+            return
+        for name, aggregate in self.aggregates.items():
+            if aggregate.key == key:
+                self._ensure_aggregate(name)
+                for value in values:
+                    aggregate.add(value)
+                self._aggregate_folded[name] += len(values)
+                self._aggregate_dirty[name] = True
+        if key in self.memory:
+            self.memory[key].extend(values)
+        self.backend.extend(key, values)
+        self._stored_kinds[key] = "list"
+        self._notify(key, values)
+
+    def subscribe(self, callback: Callable[[str, Optional[List[Any]]], None]):
+        """
+        Calls `callback(key, values)` after every write: the appended values for
+        list appends, None when a key is replaced. Callbacks must be cheap.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str, Optional[List[Any]]], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, key: str, values: Optional[List[Any]]):
+        for callback in list(self._listeners):
+            try:
+                callback(key, values)
+            except Exception as e:
+                print(f"[GlobalMemory] Listener error on {key}: {e}")
+
+    def list_length(self, key: str) -> int:
+        """
+        Length of a list key without loading a persisted list into memory.
+        """
+        if key in self.memory:
+            value = self.memory[key]
+            return len(value) if isinstance(value, (list, LeadTable)) else 0
+        if self._stored_kinds.get(key) == "list":
+            return self.backend.list_length(key)
+        return 0
+
+    def register_aggregate(self, name: str, aggregate: Aggregate):
+        """
+        Registers a materialized aggregate over a list key. It is restored from
+        its persisted state (or refolded from the list) on first use.
+        """
+        self.aggregates[name] = aggregate
+        self._aggregate_ready[name] = False
+        self._aggregate_folded[name] = 0
+        self._aggregate_dirty[name] = False
+
+    def _ensure_aggregate(self, name: str):
+        if self._aggregate_ready[name]:
+            return
+        aggregate = self.aggregates[name]
+        aggregate.reset()
+        length = self.list_length(aggregate.key)
+
+        stored_key = self.AGGREGATE_PREFIX + name
+        stored = None
+        if aggregate.persist and self._stored_kinds.get(stored_key) == "value":
+            stored = self.backend.load_value(stored_key)
+        if stored and stored.get("folded") == length:
+            aggregate.set_state(stored["state"])
+        else:
+            if aggregate.key in self.TABLES:
+                aggregate.fold_table(self.table(aggregate.key))
+            else:
+                for item in self.get_list(aggregate.key):
+                    aggregate.add(item)
+            self._aggregate_dirty[name] = True
+        self._aggregate_folded[name] = length
+        self._aggregate_ready[name] = True
+
+    def aggregate(self, name: str) -> Any:
+        """
+        Current value of a registered aggregate (counts, sums or row positions).
+        """
+        if name not in self.aggregates:
+            raise KeyError(f"Aggregate {name} not registered.")
+        self._ensure_aggregate(name)
+        return self.aggregates[name].value()
+
+    def aggregate_since(self, name: str, row: int) -> List[int]:
+        """
+        Row positions at or past `row` from a registered IndexWhere aggregate,
+        so a reader with a cursor never copies the whole index.
+        """
+        if name not in self.aggregates or not isinstance(self.aggregates[name], IndexWhere):
+            raise KeyError(f"Index aggregate {name} not registered.")
+        self._ensure_aggregate(name)
+        return self.aggregates[name].since(row)
+
+    def _persist_aggregates(self):
+        for name, aggregate in self.aggregates.items():
+            if aggregate.persist and self._aggregate_ready[name] and self._aggregate_dirty[name]:
+                stored_key = self.AGGREGATE_PREFIX + name
+                self.backend.set_value(stored_key, {
+                    "folded": self._aggregate_folded[name],
+                    "state": aggregate.get_state()
+                })
+                self._stored_kinds[stored_key] = "value"
+                self._aggregate_dirty[name] = False
 
     def log_event(self, node_id: str, event_type: str, details: Dict[str, Any]):
         entry = {
@@ -38,11 +229,50 @@ class GlobalMemory:
         self.event_log.append(entry)
 
     def get_state(self, key: str) -> Any:
-        return self.memory.get(key)
+        self._ensure_loaded(key)
+        value = self.memory.get(key)
+        return value.rows() if isinstance(value, LeadTable) else value
 
     def get_list(self, key: str) -> List[Any]:
         """
-        Safely retrieve a list from memory.
+        Safely retrieve a list from memory. Columnar keys return a row view.
         """
         val = self.get_state(key)
-        return val if isinstance(val, list) else []
+        return val if isinstance(val, (list, LeadRows)) else []
+
+    def table(self, key: str) -> LeadTable:
+        """
+        Columnar table behind a key in TABLES, for vectorized analytics.
+        """
+        if key not in self.TABLES:
+            raise KeyError(f"{key} is not a columnar table.")
+        self._ensure_loaded(key)
+        if not isinstance(self.memory.get(key), LeadTable):
+            self.memory[key] = self.TABLES[key]()
+        return self.memory[key]
+
+    def iter_events(self, start: Any = None, end: Any = None, node_id: Optional[str] = None,
+                    event_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Reads back the full event history (disk segments + memory) with filters.
+        """
+        return self.event_log.iter_events(start, end, node_id, event_type)
+
+    def flush(self):
+        """
+        Persists buffered state so nothing is lost when the process exits.
+        """
+        self.event_log.flush()
+        self._persist_aggregates()
+        self.backend.commit()
+
+    def snapshot(self) -> Optional[str]:
+        """
+        Takes a point-in-time copy of the persistent backend.
+        """
+        self.flush()
+        return self.backend.snapshot()
+
+    def close(self):
+        self.flush()
+        self.backend.close()
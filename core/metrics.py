@@ -0,0 +1,228 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus style). Quantiles are interpolated
+    linearly inside the bucket that holds the requested rank.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                fraction = (rank - seen) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": round(self.quantile(0.50), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "p99": round(self.quantile(0.99), 6),
+            "max": round(self.max, 6)
+        }
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms for node runs and external calls,
+    exportable as Prometheus text or a JSON-friendly snapshot. Payload sizes
+    cost a full serialization, so they are only measured on a node's first
+    run and every `payload_sample_every`-th run after it (0 turns them off).
+    """
+
+    def __init__(self, payload_sample_every: int = 20):
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.help: Dict[str, str] = {}
+        self.payload_sample_every = max(0, payload_sample_every)
+        self._payload_runs: Dict[str, int] = {}
+        # External calls are timed from worker threads as well as the loop
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels: Optional[Dict[str, str]]) -> LabelKey:
+        return tuple(sorted((labels or {}).items()))
+
+    def inc(self, name: str, labels: Dict[str, str] = None, value: float = 1.0, help_text: str = ""):
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            key = self._key(labels)
+            series[key] = series.get(key, 0.0) + value
+            if help_text:
+                self.help.setdefault(name, help_text)
+
+    def observe(self, name: str, value: float, labels: Dict[str, str] = None,
+                buckets: Sequence[float] = LATENCY_BUCKETS, help_text: str = ""):
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            key = self._key(labels)
+            if key not in series:
+                series[key] = Histogram(buckets)
+            series[key].observe(value)
+            if help_text:
+                self.help.setdefault(name, help_text)
+
+    @contextmanager
+    def timer(self, name: str, labels: Dict[str, str] = None) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def record_node_run(self, node_id: str, status: str, duration: float,
+                        input_bytes: Optional[int] = None, output_bytes: Optional[int] = None):
+        """
+        Counts a run and its wall time; sizes left as None (not sampled) are not observed.
+        """
+        self.inc("node_runs_total", {"node": node_id, "status": status}, help_text="Node executions by outcome.")
+        if status == "blocked":
+            return
+        self.observe("node_run_seconds", duration, {"node": node_id}, help_text="Node wall time in seconds.")
+        if input_bytes is not None:
+            self.observe("node_input_bytes", input_bytes, {"node": node_id}, SIZE_BUCKETS,
+                         "Serialized node input size (sampled runs).")
+        if status == "success" and output_bytes is not None:
+            self.observe("node_output_bytes", output_bytes, {"node": node_id}, SIZE_BUCKETS,
+                         "Serialized node output size (sampled runs).")
+
+    def record_external_call(self, service: str, status: str, duration: float):
+        self.inc("external_calls_total", {"service": service, "status": status}, help_text="External API calls by outcome.")
+        self.observe("external_call_seconds", duration, {"service": service}, help_text="External API call latency in seconds.")
+
+    def sample_payloads(self, node_id: str) -> bool:
+        """
+        True when this run of `node_id` should have its payload sizes measured.
+        """
+        if not self.payload_sample_every:
+            return False
+        with self._lock:
+            runs = self._payload_runs.get(node_id, 0)
+            self._payload_runs[node_id] = runs + 1
+        return runs % self.payload_sample_every == 0
+
+    @staticmethod
+    def payload_size(payload: Any, measure: bool = True) -> Optional[int]:
+        """
+        Serialized size of a payload. Bytes and strings are measured for free;
+        anything else is only serialized when `measure` is set, else None.
+        """
+        if isinstance(payload, (bytes, bytearray)):
+            return len(payload)
+        if isinstance(payload, memoryview):
+            return payload.nbytes
+        if isinstance(payload, str):
+            return len(payload)
+        if not measure:
+            return None
+        try:
+            return len(json.dumps(payload, default=str))
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def _format_number(value: float) -> str:
+        value = float(value)
+        return str(int(value)) if value.is_integer() else repr(value)
+
+    @staticmethod
+    def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(key) + list(extra)
+        if not pairs:
+            return ""
+        body = ",".join(f'{k}="{str(v)}"' for k, v in pairs)
+        return "{" + body + "}"
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                if name in self.help:
+                    lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{self._format_labels(key)} {self._format_number(value)}")
+
+            for name, series in sorted(self.histograms.items()):
+                if name in self.help:
+                    lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, hist in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(list(hist.buckets) + ["+Inf"], hist.counts):
+                        cumulative += count
+                        le = bound if bound == "+Inf" else self._format_number(bound)
+                        lines.append(f"{name}_bucket{self._format_labels(key, (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{self._format_labels(key)} {self._format_number(hist.sum)}")
+                    lines.append(f"{name}_count{self._format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> str:
+        """
+        Writes the text exposition format atomically so scrapers never see a partial file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+        return path
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Per-node and per-service summary with p50/p95/p99, for system_summary.json.
+        """
+        nodes: Dict[str, Dict[str, Any]] = {}
+        services: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for key, value in self.counters.get("node_runs_total", {}).items():
+                labels = dict(key)
+                runs = nodes.setdefault(labels["node"], {}).setdefault("runs", {})
+                runs[labels["status"]] = int(value)
+            for metric, field in (("node_run_seconds", "latency_seconds"),
+                                  ("node_input_bytes", "input_bytes"),
+                                  ("node_output_bytes", "output_bytes")):
+                for key, hist in self.histograms.get(metric, {}).items():
+                    nodes.setdefault(dict(key)["node"], {})[field] = hist.summary()
+
+            for key, value in self.counters.get("external_calls_total", {}).items():
+                labels = dict(key)
+                calls = services.setdefault(labels["service"], {}).setdefault("calls", {})
+                calls[labels["status"]] = int(value)
+            for key, hist in self.histograms.get("external_call_seconds", {}).items():
+                services.setdefault(dict(key)["service"], {})["latency_seconds"] = hist.summary()
+
+        dominant = max(nodes.items(), key=lambda item: item[1].get("latency_seconds", {}).get("sum", 0.0), default=(None, {}))
+        return {"nodes": nodes, "external_calls": services, "dominant_node": dominant[0]}
@@ -15,26 +15,17 @@ class StrategicReallocationEngine(BaseNode):
         
         # 1. Get current state
         current_weights = self.global_memory.get_state("topic_weights") or {"industrial": 0.4, "commercial": 0.3, "warehouse": 0.3}
-        leads = self.global_memory.get_list("lead_quality")
+        lead_count = self.global_memory.list_length("lead_quality")
         
         # 2. Count lead occurrences by topic (simulated by looking for keywords in lead metadata/projections)
         # In a real system, we'd have a 'topic' field on the lead. 
-        # Here we simulate by looking at CAPEX potential or just frequency.
-        topic_performance = {"industrial": 0, "commercial": 0, "warehouse": 0}
-        
-        for lead in leads:
-            # Simple heuristic: If capex is high, it's likely industrial. 
-            # If medium, likely warehouse. If low, commercial.
-            capex = lead.get("capex", 0)
-            if capex > 2000000:
-                topic_performance["industrial"] += 1
-            elif capex > 800000:
-                topic_performance["warehouse"] += 1
-            else:
-                topic_performance["commercial"] += 1
+        # Here we simulate by CAPEX potential: high capex is likely industrial,
+        # medium likely warehouse, low likely commercial. The bands are kept
+        # current by the 'leads_by_capex_band' aggregate in GlobalMemory.
+        topic_performance = self.global_memory.aggregate("leads_by_capex_band")
         
         # 3. Calculate new weights (Normalize)
-        total_leads = len(leads) if leads else 1
+        total_leads = lead_count if lead_count else 1
         new_weights = {}
         for topic, count in topic_performance.items():
             # Blend 50% current weight with 50% performance weight for stability
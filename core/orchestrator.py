@@ -1,8 +1,14 @@
 import asyncio
-from typing import Dict, List, Any
+import os
+import time
+from typing import Dict, List, Any, Optional
 from core.base_node import BaseNode, NodeOutput
 from core.memory import GlobalMemory
+from core.storage import StorageBackend, SQLiteBackend
 from core.config_loader import ConfigLoader
+from core.metrics import MetricsRegistry
+from core.pipeline import Pipeline, PipelineExecutor
+from core.scheduler import Scheduler, parse_trigger
 
 class MasterOrchestrator:
     """
@@ -10,18 +16,60 @@ class MasterOrchestrator:
     Responsible for maintaining global state, triggering nodes, and managing phase transitions.
     """
 
+    # Default cadences; each can be overridden with SCHEDULE_<NODE_ID> in .env
+    DEFAULT_SCHEDULES = {
+        "NODE_6": "every 60 now",   # Analytics refresh
+        "NODE_2": "0 6 * * 1",      # Weekly SEO analysis (Monday 06:00)
+        "NODE_10": "0 9 * * 1",     # Weekly publishing cycle (Monday 09:00)
+        "NODE_8": "0 0 * * *",      # Daily phase check
+        "NODE_7": "0 0 1 * *",      # Monthly strategic reallocation
+    }
+
     def __init__(self):
-        self.memory = GlobalMemory()
         self.config = ConfigLoader()
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.data_dir = self.config.get("ENGINE_DATA_DIR", os.path.join(project_root, "data"))
+        self.memory = GlobalMemory(
+            event_log_capacity=self.config.get_int("EVENT_LOG_CAPACITY", 10000),
+            event_archive_dir=os.path.join(self.data_dir, "event_log"),
+            backend=self._create_backend()
+        )
+        self.metrics = MetricsRegistry(payload_sample_every=self.config.get_int("METRICS_PAYLOAD_SAMPLE_EVERY", 20))
         self.nodes: Dict[str, BaseNode] = {}
         self.is_running = False
+        self.scheduler = Scheduler()
+
+    def _create_backend(self) -> StorageBackend:
+        backend = self.config.get("MEMORY_BACKEND", "sqlite").lower()
+        if backend == "memory":
+            return StorageBackend()
+        db_path = self.config.get("MEMORY_DB_PATH", os.path.join(self.data_dir, "engine_state.db"))
+        print(f"[Orchestrator] Restoring state from {db_path}")
+        return SQLiteBackend(
+            db_path,
+            commit_every=self.config.get_int("MEMORY_COMMIT_EVERY", 200),
+            snapshot_retention=self.config.get_int("MEMORY_SNAPSHOT_RETENTION", 5)
+        )
 
     def register_node(self, node: BaseNode):
         node.set_memory(self.memory)
         node.set_config(self.config)
+        node.set_metrics(self.metrics)
         self.nodes[node.node_id] = node
         print(f"[Orchestrator] Registered node: {node.node_id} ({node.node_type})")
 
+    def risk_gate(self, node_id: str) -> Optional[float]:
+        """
+        Returns the current risk score if the NODE_5 gate would block `node_id`, else None.
+        """
+        if node_id == "NODE_5" or "NODE_5" not in self.nodes:
+            return None
+        risk_score = self.memory.get_state("current_risk_score") or 0
+        # Same threshold NODE_5 uses to flag content (rule file, or RISK_THRESHOLD_BLOCK)
+        gate = self.nodes["NODE_5"]
+        threshold = gate.block_threshold() if hasattr(gate, "block_threshold") else 70
+        return risk_score if risk_score >= threshold else None
+
     async def run_node(self, node_id: str, inputs: Dict[str, Any] = None) -> NodeOutput:
         if node_id not in self.nodes:
             raise ValueError(f"Node {node_id} not registered.")
@@ -30,37 +78,109 @@ class MasterOrchestrator:
         print(f"[Orchestrator] Triggering node: {node_id}")
         
         # Risk Gate Check (NODE_5)
-        if node_id != "NODE_5" and "NODE_5" in self.nodes:
-            risk_score = self.memory.get_state("current_risk_score") or 0
-            if risk_score > 70:
-                print(f"[Orchestrator] BLOCKED: Node {node_id} execution halted due to high risk score ({risk_score}).")
-                return NodeOutput(data=None, metadata={"status": "blocked", "risk_score": risk_score})
-
-        output = await node.run(inputs or {})
-        self.memory.log_event(node_id, "execution_success", {"output_metadata": output.metadata})
+        risk_score = self.risk_gate(node_id)
+        if risk_score is not None:
+            print(f"[Orchestrator] BLOCKED: Node {node_id} execution halted due to high risk score ({risk_score}).")
+            self.metrics.record_node_run(node_id, "blocked", 0.0)
+            return NodeOutput(data=None, metadata={"status": "blocked", "risk_score": risk_score})
+
+        inputs = inputs or {}
+        sample = self.metrics.sample_payloads(node_id)
+        input_bytes = self.metrics.payload_size(inputs, sample)
+        start = time.perf_counter()
+        try:
+            output = await node.run(inputs)
+        except Exception as e:
+            duration = time.perf_counter() - start
+            self.metrics.record_node_run(node_id, "failure", duration, input_bytes)
+            self.memory.log_event(node_id, "execution_failure", {"error": str(e), "duration_seconds": round(duration, 6)})
+            raise
+
+        duration = time.perf_counter() - start
+        output_bytes = self.metrics.payload_size(output.data, sample)
+        self.metrics.record_node_run(node_id, "success", duration, input_bytes, output_bytes)
+        details = {"output_metadata": output.metadata, "duration_seconds": round(duration, 6)}
+        if input_bytes is not None:
+            details["input_bytes"] = input_bytes
+        if output_bytes is not None:
+            details["output_bytes"] = output_bytes
+        self.memory.log_event(node_id, "execution_success", details)
         return output
 
+    async def run_pipeline(self, pipeline: Pipeline, max_concurrency: int = None) -> Dict[str, NodeOutput]:
+        """
+        Executes a DAG of node invocations, running every ready step concurrently.
+        Returns the output of each step keyed by step id.
+        """
+        if max_concurrency is None:
+            max_concurrency = self.config.get_int("PIPELINE_MAX_CONCURRENCY", 4)
+        print(f"[Orchestrator] Running pipeline '{pipeline.name}' ({len(pipeline.steps)} steps, concurrency {max_concurrency})")
+        executor = PipelineExecutor(self, max_concurrency)
+        return await executor.execute(pipeline)
+
+    def schedule_node(self, node_id: str, trigger: Any, inputs: Dict[str, Any] = None,
+                      jitter: float = 0.0, misfire: str = "skip"):
+        """
+        Runs a registered node on a cron or interval trigger.
+        """
+        if isinstance(trigger, str):
+            trigger = parse_trigger(trigger)
+
+        async def job():
+            await self.run_node(node_id, dict(inputs or {}))
+
+        self.scheduler.add_job(node_id, trigger, job, jitter=jitter, misfire=misfire)
+
+    async def _check_risk_threshold(self):
+        risk_score = self.memory.get_state("current_risk_score") or 0
+        if risk_score > 50:
+            self.memory.log_event("NODE_0", "high_risk_alert", {"risk_score": risk_score})
+
+    async def _snapshot_state(self):
+        path = self.memory.snapshot()
+        if path:
+            self.memory.log_event("NODE_0", "state_snapshot", {"path": path})
+
     async def start_scheduled_loop(self):
         """
-        Main execution loop for scheduled tasks.
+        Main execution loop for scheduled tasks. Sleeps until the next due job.
         """
         self.is_running = True
         print("[Orchestrator] Starting MASTER_ORCHESTRATOR loop...")
-        
-        while self.is_running:
-            # Example: Daily system check
-            await self.run_node("NODE_6") # Analytics Layer
-            
-            # Weekly Publishing Cycle (Simulated)
-            # This would be triggered by actual time checks
-            
-            # Risk Threshold Breach Check
-            risk_score = self.memory.get_state("current_risk_score") or 0
-            if risk_score > 50:
-                self.memory.log_event("NODE_0", "high_risk_alert", {"risk_score": risk_score})
-            
-            await asyncio.sleep(60) # Wait for next tick
+
+        jitter = float(self.config.get("SCHEDULE_JITTER_SECONDS", "0"))
+        misfire = self.config.get("SCHEDULE_MISFIRE_POLICY", "skip")
+        for node_id, default_spec in self.DEFAULT_SCHEDULES.items():
+            if node_id in self.nodes and node_id not in self.scheduler.jobs:
+                spec = self.config.get(f"SCHEDULE_{node_id}", default_spec)
+                self.schedule_node(node_id, spec, jitter=jitter, misfire=misfire)
+
+        # Incremental governance re-audit of published content (cheap when nothing changed)
+        if "NODE_5" in self.nodes and "NODE_5" not in self.scheduler.jobs:
+            spec = self.config.get("SCHEDULE_GOVERNANCE_AUDIT", "15 * * * *")
+            self.schedule_node("NODE_5", spec, inputs={"mode": "audit"}, jitter=jitter, misfire=misfire)
+
+        # Risk Threshold Breach Check
+        if "risk_watch" not in self.scheduler.jobs:
+            self.scheduler.add_job("risk_watch", parse_trigger("every 60 now"), self._check_risk_threshold)
+
+        # Periodic state snapshots
+        if "state_snapshot" not in self.scheduler.jobs:
+            spec = self.config.get("SCHEDULE_STATE_SNAPSHOT", "0 * * * *")
+            self.scheduler.add_job("state_snapshot", parse_trigger(spec), self._snapshot_state)
+
+        await self.scheduler.run()
 
     def stop(self):
         self.is_running = False
+        self.scheduler.stop()
         print("[Orchestrator] Stopping MASTER_ORCHESTRATOR.")
+
+    async def shutdown(self):
+        """
+        Shuts nodes down and flushes buffered state to disk. Call once before the process exits.
+        """
+        for node in self.nodes.values():
+            await node.shutdown()
+        self.memory.close()
+        print("[Orchestrator] State flushed.")
@@ -12,11 +12,10 @@ class BudgetPhaseManager(BaseNode):
 
     async def run(self, inputs: Dict[str, Any]) -> NodeOutput:
         current_phase = self.global_memory.get_state("budget_phase") or "STATE_1"
-        leads = self.global_memory.get_list("lead_quality")
-        lead_count = len(leads)
+        tier_counts = self.global_memory.aggregate("leads_by_tier")
         
         # Calculate 'qualified' lead count (Tier A and B)
-        qualified_leads = len([l for l in leads if l.get("score") in ["A", "B"]])
+        qualified_leads = tier_counts.get("A", 0) + tier_counts.get("B", 0)
         
         self.log(f"Phase Manager: Current Phase {current_phase}, Qualified Leads {qualified_leads}")
         
@@ -0,0 +1,177 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from core.base_node import NodeOutput
+
+@dataclass
+class PipelineStep:
+    """
+    A single node invocation inside a Pipeline.
+
+    `edges` maps an input key of this step to the output of an upstream step,
+    written as "<step_id>" (the whole `data`) or "<step_id>.<path>" where the
+    path walks `data` (e.g. "content.draft"). "<step_id>.metadata.<key>" reads
+    the upstream metadata instead. Dotted input keys ("content_draft.draft")
+    write into nested input dicts. `after` only orders execution: those steps
+    must finish first, but their outcome never skips this one.
+    """
+    step_id: str
+    node_id: str
+    inputs: Dict[str, Any] = field(default_factory=dict)
+    edges: Dict[str, str] = field(default_factory=dict)
+    after: List[str] = field(default_factory=list)
+    when: Optional[Callable[[Dict[str, NodeOutput]], bool]] = None
+
+    def dependencies(self) -> List[str]:
+        deps = [ref.split(".", 1)[0] for ref in self.edges.values()]
+        deps.extend(self.after)
+        return list(dict.fromkeys(deps))
+
+class Pipeline:
+    """
+    Declarative DAG of node invocations with explicit input/output edges.
+    """
+
+    def __init__(self, name: str = "pipeline"):
+        self.name = name
+        self.steps: Dict[str, PipelineStep] = {}
+
+    def add_step(self, step_id: str, node_id: str, inputs: Dict[str, Any] = None,
+                 edges: Dict[str, str] = None, after: List[str] = None,
+                 when: Optional[Callable[[Dict[str, NodeOutput]], bool]] = None) -> "Pipeline":
+        if step_id in self.steps:
+            raise ValueError(f"Duplicate pipeline step: {step_id}")
+        self.steps[step_id] = PipelineStep(
+            step_id=step_id,
+            node_id=node_id,
+            inputs=inputs or {},
+            edges=edges or {},
+            after=after or [],
+            when=when
+        )
+        return self
+
+    def validate(self):
+        """
+        Ensures every dependency exists and the graph is acyclic.
+        """
+        for step in self.steps.values():
+            for dep in step.dependencies():
+                if dep not in self.steps:
+                    raise ValueError(f"Step {step.step_id} depends on unknown step {dep}.")
+
+        # Kahn's algorithm: any step left unvisited sits on a cycle
+        indegree = {sid: len(s.dependencies()) for sid, s in self.steps.items()}
+        ready = [sid for sid, deg in indegree.items() if deg == 0]
+        visited = 0
+        dependents = self.dependents()
+        while ready:
+            sid = ready.pop()
+            visited += 1
+            for child in dependents[sid]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if visited != len(self.steps):
+            cyclic = [sid for sid, deg in indegree.items() if deg > 0]
+            raise ValueError(f"Pipeline {self.name} has a dependency cycle: {cyclic}")
+
+    def dependents(self) -> Dict[str, List[str]]:
+        children: Dict[str, List[str]] = {sid: [] for sid in self.steps}
+        for step in self.steps.values():
+            for dep in step.dependencies():
+                children[dep].append(step.step_id)
+        return children
+
+class PipelineExecutor:
+    """
+    Runs a Pipeline on the orchestrator, launching every step whose dependencies
+    have finished, bounded by a concurrency cap.
+    """
+
+    def __init__(self, orchestrator: Any, max_concurrency: int = 4):
+        self.orchestrator = orchestrator
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def execute(self, pipeline: Pipeline) -> Dict[str, NodeOutput]:
+        pipeline.validate()
+        results: Dict[str, NodeOutput] = {}
+        if not pipeline.steps:
+            return results
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        dependents = pipeline.dependents()
+        remaining = {sid: len(s.dependencies()) for sid, s in pipeline.steps.items()}
+        running: Dict[asyncio.Task, str] = {}
+
+        def launch(step_id: str):
+            task = asyncio.create_task(self._run_step(pipeline.steps[step_id], results, semaphore))
+            running[task] = step_id
+
+        for step_id, count in remaining.items():
+            if count == 0:
+                launch(step_id)
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step_id = running.pop(task)
+                    results[step_id] = task.result()
+                    for child in dependents[step_id]:
+                        remaining[child] -= 1
+                        if remaining[child] == 0:
+                            launch(child)
+        finally:
+            for task in running:
+                task.cancel()
+
+        return results
+
+    async def _run_step(self, step: PipelineStep, results: Dict[str, NodeOutput],
+                        semaphore: asyncio.Semaphore) -> NodeOutput:
+        # Upstream failures, blocks and skips propagate along data edges only;
+        # `after` dependencies just order execution
+        for dep in dict.fromkeys(ref.split(".", 1)[0] for ref in step.edges.values()):
+            status = results[dep].metadata.get("status")
+            if status in ("error", "skipped", "blocked"):
+                return NodeOutput(data=None, metadata={"status": "skipped", "reason": f"upstream {dep} {status}"})
+
+        if step.when is not None and not step.when(results):
+            return NodeOutput(data=None, metadata={"status": "skipped", "reason": "condition not met"})
+
+        inputs = dict(step.inputs)
+        for key, ref in step.edges.items():
+            self._assign(inputs, key, self._resolve(ref, results))
+
+        async with semaphore:
+            try:
+                return await self.orchestrator.run_node(step.node_id, inputs)
+            except Exception as e:
+                print(f"[Pipeline] Step {step.step_id} ({step.node_id}) failed: {e}")
+                return NodeOutput(data=None, metadata={"status": "error", "error": str(e)})
+
+    @staticmethod
+    def _resolve(ref: str, results: Dict[str, NodeOutput]) -> Any:
+        parts = ref.split(".")
+        output = results[parts[0]]
+        if len(parts) > 1 and parts[1] == "metadata":
+            value: Any = output.metadata
+            path = parts[2:]
+        else:
+            value = output.data
+            path = parts[1:]
+        for part in path:
+            value = value.get(part) if isinstance(value, dict) else None
+        return value
+
+    @staticmethod
+    def _assign(inputs: Dict[str, Any], key: str, value: Any):
+        parts = key.split(".")
+        target = inputs
+        for part in parts[:-1]:
+            nested = target.get(part)
+            nested = dict(nested) if isinstance(nested, dict) else {}
+            target[part] = nested
+            target = nested
+        target[parts[-1]] = value
@@ -0,0 +1,210 @@
+import os
+import json
+import datetime
+from typing import Any, Dict, List, Optional, Set
+from xml.sax.saxutils import escape
+
+class PostIndex:
+    """
+    Persistent index of published posts keyed by slug (title, date, URL,
+    content hash), kept as an append-only JSONL log so each publish is a
+    single appended line.
+
+    Every post gets a sequence number on first publish. Static artifacts
+    (paginated JSON index, sitemap chunks, RSS feed) are cut by sequence
+    number, oldest first, so a new post only touches the last page and the
+    last sitemap chunk; earlier files are never rewritten unless one of
+    their own posts changes.
+    """
+
+    def __init__(self, path: str, page_size: int = 50, sitemap_chunk: int = 5000, feed_size: int = 20):
+        self.path = path
+        self.state_path = f"{os.path.splitext(path)[0]}.state.json"
+        self.page_size = max(1, page_size)
+        self.sitemap_chunk = max(1, sitemap_chunk)
+        self.feed_size = max(1, feed_size)
+        self.posts: Dict[str, Dict[str, Any]] = {}
+        self._slugs: List[Optional[str]] = []   # seq -> slug (None once removed)
+        self._line_seqs: List[int] = []         # log line -> seq it touched
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-append
+                    continue
+                self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]):
+        slug = record["slug"]
+        if record.get("op") == "remove":
+            entry = self.posts.pop(slug, None)
+            if entry is not None:
+                self._slugs[entry["seq"]] = None
+                self._line_seqs.append(entry["seq"])
+            return
+        entry = {k: v for k, v in record.items() if k != "op"}
+        if slug in self.posts:
+            entry["seq"] = self.posts[slug]["seq"]
+        elif "seq" in record:
+            # Compacted record: keep its original position, holes stay holes
+            self._slugs.extend([None] * (record["seq"] + 1 - len(self._slugs)))
+            self._slugs[record["seq"]] = slug
+        else:
+            entry["seq"] = len(self._slugs)
+            self._slugs.append(slug)
+        self.posts[slug] = entry
+        self._line_seqs.append(entry["seq"])
+
+    def _append(self, record: Dict[str, Any]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        self._apply(record)
+
+    def upsert(self, slug: str, title: str, date: str, url: str, content_hash: str) -> bool:
+        """
+        Records a new or changed post. Returns False when nothing changed.
+        """
+        current = self.posts.get(slug)
+        if current and (current["title"], current["date"], current["url"], current["hash"]) == (title, date, url, content_hash):
+            return False
+        self._append({"op": "upsert", "slug": slug, "title": title, "date": date, "url": url, "hash": content_hash})
+        return True
+
+    def remove(self, slug: str) -> bool:
+        if slug not in self.posts:
+            return False
+        self._append({"op": "remove", "slug": slug})
+        return True
+
+    def latest(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Most recently first-published posts, newest first.
+        """
+        result = []
+        for slug in reversed(self._slugs):
+            if slug is not None:
+                result.append(self.posts[slug])
+                if len(result) == limit:
+                    break
+        return result
+
+    def _range(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        return [self.posts[slug] for slug in self._slugs[start:stop] if slug is not None]
+
+    # Artifacts
+
+    def _load_state(self) -> int:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("written_lines", 0)
+        except (OSError, ValueError):
+            return 0
+
+    @staticmethod
+    def _write_atomic(path: str, content: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def write_artifacts(self, public_dir: str, site_url: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Brings blog/posts/*.json, sitemap*.xml and feed.xml in `public_dir` up
+        to date with the log, rewriting only pages and chunks whose posts changed
+        since the last call.
+        """
+        posts_dir = os.path.join(public_dir, "blog", "posts")
+        written = 0 if force or not os.path.exists(os.path.join(posts_dir, "index.json")) else self._load_state()
+        if written > len(self._line_seqs):
+            written = 0
+        if written == len(self._line_seqs) and written:
+            return {"pages": 0, "sitemaps": 0, "feed": False}
+
+        changed: Set[int] = set(self._line_seqs[written:]) if written else set(range(len(self._slugs)))
+        pages = sorted({seq // self.page_size for seq in changed})
+        chunks = sorted({seq // self.sitemap_chunk for seq in changed})
+        page_count = -(-len(self._slugs) // self.page_size)
+        chunk_count = -(-len(self._slugs) // self.sitemap_chunk)
+        site_url = site_url.rstrip("/")
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        for page in pages:
+            entries = self._range(page * self.page_size, (page + 1) * self.page_size)
+            self._write_atomic(os.path.join(posts_dir, f"page-{page}.json"),
+                               json.dumps({"page": page, "posts": entries}))
+
+        self._write_atomic(os.path.join(posts_dir, "index.json"), json.dumps({
+            "total": len(self.posts),
+            "page_size": self.page_size,
+            "pages": page_count,
+            "updated_at": now.isoformat(),
+            "latest": self.latest(self.feed_size)
+        }))
+
+        for chunk in chunks:
+            urls = "".join(
+                f"  <url><loc>{escape(site_url + e['url'])}</loc><lastmod>{escape(e['date'])}</lastmod></url>\n"
+                for e in self._range(chunk * self.sitemap_chunk, (chunk + 1) * self.sitemap_chunk)
+            )
+            self._write_atomic(os.path.join(public_dir, f"sitemap-{chunk}.xml"),
+                               '<?xml version="1.0" encoding="UTF-8"?>\n'
+                               '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+                               f"{urls}</urlset>\n")
+        sitemaps = "".join(
+            f"  <sitemap><loc>{escape(site_url)}/sitemap-{chunk}.xml</loc></sitemap>\n" for chunk in range(chunk_count)
+        )
+        self._write_atomic(os.path.join(public_dir, "sitemap.xml"),
+                           '<?xml version="1.0" encoding="UTF-8"?>\n'
+                           '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+                           f"{sitemaps}</sitemapindex>\n")
+
+        self._write_atomic(os.path.join(public_dir, "feed.xml"), self._render_feed(site_url, now))
+
+        self._compact()
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump({"written_lines": len(self._line_seqs)}, f)
+        return {"pages": len(pages), "sitemaps": len(chunks), "feed": True}
+
+    def _render_feed(self, site_url: str, now: datetime.datetime) -> str:
+        items = []
+        for entry in self.latest(self.feed_size):
+            try:
+                published = datetime.datetime.fromisoformat(entry["date"]).replace(tzinfo=datetime.timezone.utc)
+                pub_date = f"<pubDate>{published.strftime('%a, %d %b %Y %H:%M:%S +0000')}</pubDate>"
+            except ValueError:
+                pub_date = ""
+            link = escape(site_url + entry["url"])
+            items.append(
+                f"    <item><title>{escape(entry['title'])}</title><link>{link}</link>"
+                f"<guid>{link}</guid>{pub_date}</item>\n"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0">\n  <channel>\n'
+            f"    <title>Manokamana Solar Insights</title>\n    <link>{escape(site_url)}/blog/index.html</link>\n"
+            "    <description>Solar ROI, subsidy and industrial energy analysis.</description>\n"
+            f"    <lastBuildDate>{now.strftime('%a, %d %b %Y %H:%M:%S +0000')}</lastBuildDate>\n"
+            f"{''.join(items)}  </channel>\n</rss>\n"
+        )
+
+    def _compact(self):
+        """
+        Rewrites the log as one line per live post once superseded lines dominate.
+        Records keep their sequence number, so pagination does not shift.
+        """
+        if len(self._line_seqs) <= 2 * len(self.posts) + 100:
+            return
+        live = [self.posts[slug] for slug in self._slugs if slug is not None]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in live:
+                f.write(json.dumps({"op": "upsert", **entry}) + "\n")
+        os.replace(tmp_path, self.path)
+        self._line_seqs = [entry["seq"] for entry in live]
@@ -1,40 +1,369 @@
 import json
 import csv
+import io
 import os
-from typing import Dict, List, Any
+import glob
+import datetime
+import hashlib
+import shutil
+from typing import Dict, Iterable, List, Any, Optional, Sequence
+import numpy as np
+import pandas as pd
 
 class ReportGenerator:
     """
     Utility for generating structured JSON and CSV performance reports.
+    Full reports are written atomically (temp file + rename) and skipped when
+    their content hash is unchanged; `append_csv` only writes rows added since
+    its last watermark and rotates the file by size. History for analytics is
+    kept as date-partitioned Parquet tables under `parquet/`.
     """
 
+    PARQUET_DIR = "parquet"
+    UNKNOWN_DATE = "unknown"
+
     def __init__(self, output_dir: str = "reports"):
         self.output_dir = output_dir
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
+        # path -> sha256 of the content last written (or found) there
+        self._hashes: Dict[str, str] = {}
+        # filename -> append_csv watermark state
+        self._states: Dict[str, Dict[str, Any]] = {}
+
+    def _write_if_changed(self, filepath: str, content: bytes) -> bool:
+        """
+        Atomically replaces `filepath` unless it already holds exactly `content`.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        if filepath not in self._hashes and os.path.exists(filepath):
+            with open(filepath, "rb") as f:
+                self._hashes[filepath] = hashlib.sha256(f.read()).hexdigest()
+        if self._hashes.get(filepath) == digest:
+            return False
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, filepath)
+        self._hashes[filepath] = digest
+        return True
 
     def generate_json(self, data: Dict[str, Any], filename: str) -> str:
         """
         Exports data as a JSON file.
         """
         filepath = os.path.join(self.output_dir, f"{filename}.json")
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        self._write_if_changed(filepath, json.dumps(data, indent=4).encode("utf-8"))
         return filepath
 
+    @staticmethod
+    def _csv_bytes(rows: Sequence[Dict[str, Any]], fieldnames: List[str], header: bool) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+        if header:
+            writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
     def generate_csv(self, list_data: List[Dict[str, Any]], filename: str) -> str:
         """
         Exports a list of dictionaries as a CSV file.
         """
         if not list_data:
             return ""
-        
+
         filepath = os.path.join(self.output_dir, f"{filename}.csv")
-        keys = list_data[0].keys()
-        
-        with open(filepath, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            writer.writerows(list_data)
-        
+        keys = list(list_data[0].keys())
+        self._write_if_changed(filepath, self._csv_bytes(list_data, keys, header=True))
         return filepath
+
+    # Incremental CSV
+
+    def _state_path(self, filename: str) -> str:
+        return os.path.join(self.output_dir, f".{filename}.state.json")
+
+    def _load_state(self, filename: str) -> Optional[Dict[str, Any]]:
+        if filename in self._states:
+            return self._states[filename]
+        try:
+            with open(self._state_path(filename), "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._states[filename] = state
+        return state
+
+    def _save_state(self, filename: str, state: Dict[str, Any]):
+        tmp_path = f"{self._state_path(filename)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._state_path(filename))
+        self._states[filename] = state
+
+    def rotated_files(self, filename: str) -> List[str]:
+        """
+        Rotated segments of an append_csv report, oldest first (the live file is not included).
+        """
+        state = self._load_state(filename) or {}
+        return [os.path.join(self.output_dir, f"{filename}.{part}.csv") for part in range(1, state.get("part", 0) + 1)]
+
+    def append_csv(self, rows: Sequence[Dict[str, Any]], filename: str, max_bytes: int = 50 * 1024 * 1024) -> str:
+        """
+        Incrementally exports a growing sequence of rows: only rows past the
+        stored watermark are appended. When the live file would exceed
+        `max_bytes` it is rotated to `<filename>.<n>.csv` and a new file with a
+        header is started. A tick with no new rows does no I/O.
+        """
+        filepath = os.path.join(self.output_dir, f"{filename}.csv")
+        state = self._load_state(filename)
+        total = len(rows)
+        if state is not None and state["rows"] == total and os.path.exists(filepath):
+            return filepath
+        if not total:
+            return ""
+
+        if state is None or state["rows"] > total or not os.path.exists(filepath):
+            # First run, or the source list was replaced: start over from a full, atomic write
+            for old in self.rotated_files(filename) if state else []:
+                if os.path.exists(old):
+                    os.remove(old)
+            fieldnames = list(rows[0].keys())
+            content = self._csv_bytes(rows, fieldnames, header=True)
+            self._hashes.pop(filepath, None)
+            self._write_if_changed(filepath, content)
+            self._save_state(filename, {"rows": total, "fieldnames": fieldnames, "bytes": len(content), "part": 0})
+            return filepath
+
+        # Bytes past the recorded size come from an append whose state update never
+        # landed (crash); drop them so those rows are not duplicated
+        if os.path.getsize(filepath) != state["bytes"]:
+            with open(filepath, "r+b") as f:
+                f.truncate(state["bytes"])
+
+        new_rows = rows[state["rows"]:]
+        fieldnames = state["fieldnames"]
+        content = self._csv_bytes(new_rows, fieldnames, header=False)
+        part, size = state["part"], state["bytes"]
+        if size + len(content) > max_bytes and size > 0:
+            part += 1
+            content = self._csv_bytes(new_rows, fieldnames, header=True)
+            tmp_path = f"{filepath}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(filepath, os.path.join(self.output_dir, f"{filename}.{part}.csv"))
+            os.replace(tmp_path, filepath)
+            size = len(content)
+        else:
+            # Only complete rows are appended; the recorded byte size marks the committed end
+            with open(filepath, "ab") as f:
+                f.write(content)
+            size += len(content)
+        self._hashes.pop(filepath, None)
+        self._save_state(filename, {"rows": total, "fieldnames": fieldnames, "bytes": size, "part": part})
+        return filepath
+
+    # Partitioned Parquet history
+
+    def _parquet_root(self, table: str) -> str:
+        return os.path.join(self.output_dir, self.PARQUET_DIR, table)
+
+    def parquet_watermark(self, table: str) -> Dict[str, Any]:
+        """
+        Export progress of a Parquet table ({} before the first export).
+        """
+        return self._load_state(f"parquet_{table}") or {}
+
+    def _write_partitions(self, frame: pd.DataFrame, table: str, dates: pd.Series, state: Dict[str, Any]) -> List[str]:
+        """
+        Writes one new part file per date partition touched by `frame`. Parts are
+        written to a temp name and renamed, so readers only ever see whole files.
+        """
+        paths = []
+        part = state.get("parts", 0)
+        for date, group in frame.groupby(dates.to_numpy(), sort=True):
+            partition = os.path.join(self._parquet_root(table), f"date={date}")
+            os.makedirs(partition, exist_ok=True)
+            part += 1
+            path = os.path.join(partition, f"part-{part:06d}.parquet")
+            tmp_path = f"{path}.tmp"
+            group.to_parquet(tmp_path, engine="pyarrow", index=False)
+            os.replace(tmp_path, path)
+            paths.append(path)
+        state["parts"] = part
+        return paths
+
+    @staticmethod
+    def _partition_dates(timestamps: pd.Series) -> pd.Series:
+        return timestamps.dt.strftime("%Y-%m-%d").fillna(ReportGenerator.UNKNOWN_DATE)
+
+    @staticmethod
+    def _row_fingerprint(table: Any, index: int) -> List[Optional[float]]:
+        """
+        (timestamp, capex, co2_offset) of one row, to tell an extended table from a replaced one.
+        """
+        values = [float(table.column(name)[index]) for name in ("timestamp", "capex", "co2_offset")]
+        return [None if np.isnan(v) else v for v in values]
+
+    def new_leads_frame(self, table: Any) -> Optional[Dict[str, Any]]:
+        """
+        Copies the leads of a columnar LeadTable added since the last export into
+        a frame, ready for `write_leads_parquet` (which may run on another
+        thread). Tier, industry and NODE_4's routing are dictionary-encoded
+        categoricals. If the lead list was replaced, every row is returned and
+        the table is rewritten, so no history is exported twice.
+        """
+        state = self.parquet_watermark("leads")
+        start = state.get("rows", 0)
+        replaced = start > len(table) or (start and state.get("last") != self._row_fingerprint(table, start - 1))
+        if replaced:
+            start = 0
+        if start == len(table):
+            return None
+
+        # LeadTable keeps UTC epoch seconds; partitions are UTC days
+        timestamps = pd.to_datetime(np.array(table.column("timestamp")[start:]), unit="s", utc=True)
+        frame = pd.DataFrame({"timestamp": timestamps})
+        for field in ("score", "industry", "routing"):
+            frame[field] = pd.Categorical.from_codes(np.array(table.column(field)[start:], dtype=np.int64),
+                                                     categories=table.labels(field))
+        for field in ("capex", "co2_offset"):
+            frame[field] = np.array(table.column(field)[start:])
+        return {"frame": frame, "rows": len(table), "last": self._row_fingerprint(table, len(table) - 1),
+                "replaced": bool(replaced)}
+
+    def write_leads_parquet(self, batch: Optional[Dict[str, Any]]) -> List[str]:
+        """
+        Writes a batch from `new_leads_frame` and advances the leads watermark.
+        """
+        if batch is None:
+            return []
+        state = self.parquet_watermark("leads")
+        if batch["replaced"]:
+            shutil.rmtree(self._parquet_root("leads"), ignore_errors=True)
+        frame = batch["frame"]
+        paths = self._write_partitions(frame, "leads", self._partition_dates(frame["timestamp"]), state)
+        state["rows"], state["last"] = batch["rows"], batch["last"]
+        self._save_state("parquet_leads", state)
+        return paths
+
+    def export_leads_parquet(self, table: Any) -> List[str]:
+        """
+        Appends leads added since the last export from a columnar LeadTable.
+        """
+        return self.write_leads_parquet(self.new_leads_frame(table))
+
+    def export_events_parquet(self, events: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Appends event-log entries newer than the last exported timestamp. Pass
+        the events from `GlobalMemory.iter_events(start=parquet_watermark("events").get("timestamp"))`.
+        """
+        state = self.parquet_watermark("events")
+        since = state.get("timestamp", "")
+        rows = [e for e in events if e.get("timestamp", "") > since]
+        if not rows:
+            return []
+        frame = pd.DataFrame({
+            "timestamp": pd.to_datetime([e["timestamp"] for e in rows], errors="coerce"),
+            "node_id": pd.Categorical([e.get("node_id") for e in rows]),
+            "event_type": pd.Categorical([e.get("event_type") for e in rows]),
+            "details": [json.dumps(e.get("details"), default=str) for e in rows]
+        })
+        paths = self._write_partitions(frame, "events", self._partition_dates(frame["timestamp"]), state)
+        state["timestamp"] = max(e["timestamp"] for e in rows)
+        self._save_state("parquet_events", state)
+        return paths
+
+    SUMMARY_FIELDS = ("total_leads", "tier_a", "tier_b", "tier_c", "published_assets_count",
+                      "total_capex_potential", "total_co2_offset", "risk_health")
+
+    def export_summary_parquet(self, summary: Dict[str, Any], min_interval: float = 900.0) -> List[str]:
+        """
+        Appends one row of headline counters, building a time series of system
+        summaries. Nothing is written while the counters are unchanged, or
+        within `min_interval` seconds of the previous row.
+        """
+        tiers = summary.get("tier_counts", {})
+        values = {
+            "total_leads": int(summary.get("total_leads", 0)),
+            "tier_a": int(tiers.get("A", 0)),
+            "tier_b": int(tiers.get("B", 0)),
+            "tier_c": int(tiers.get("C", 0)),
+            "published_assets_count": int(summary.get("published_assets_count", 0)),
+            "total_capex_potential": float(summary.get("total_capex_potential", 0) or 0),
+            "total_co2_offset": float(summary.get("total_co2_offset", 0) or 0),
+            "risk_health": summary.get("current_risk_health", "Healthy")
+        }
+        state = self.parquet_watermark("summary")
+        now = pd.Timestamp.now()
+        if state.get("values") == values:
+            return []
+        if "written_at" in state and (now - pd.Timestamp(state["written_at"])).total_seconds() < min_interval:
+            return []
+        frame = pd.DataFrame({"timestamp": [now]})
+        for field in self.SUMMARY_FIELDS:
+            value = values[field]
+            if field == "risk_health":
+                frame[field] = pd.Categorical([value])
+            elif isinstance(value, int):
+                frame[field] = pd.array([value], dtype="int64")
+            else:
+                frame[field] = [value]
+        paths = self._write_partitions(frame, "summary", self._partition_dates(frame["timestamp"]), state)
+        state["values"], state["written_at"] = values, now.isoformat()
+        self._save_state("parquet_summary", state)
+        return paths
+
+    @staticmethod
+    def _concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Concatenates parts, keeping categorical columns categorical even when
+        later parts saw new labels.
+        """
+        categorical = {c for f in frames for c in f.columns if isinstance(f[c].dtype, pd.CategoricalDtype)}
+        merged = pd.concat(frames, ignore_index=True)
+        for column in categorical:
+            if not isinstance(merged[column].dtype, pd.CategoricalDtype):
+                merged[column] = merged[column].astype("category")
+        return merged
+
+    def compact_parquet(self, table: str, before: Optional[str] = None) -> int:
+        """
+        Merges the part files of each closed day (before `before`, default today)
+        into one file, so long histories are not spread over many small parts.
+        Returns the number of partitions compacted.
+        """
+        before = before or datetime.date.today().isoformat()
+        compacted = 0
+        for partition in sorted(glob.glob(os.path.join(self._parquet_root(table), "date=*"))):
+            date = os.path.basename(partition)[len("date="):]
+            parts = sorted(glob.glob(os.path.join(partition, "part-*.parquet")))
+            if date >= before or len(parts) < 2:
+                continue
+            merged = self._concat_frames([pd.read_parquet(p, engine="pyarrow") for p in parts])
+            # Keeps the name of the newest part so later exports never collide with it
+            target = parts[-1]
+            tmp_path = f"{target}.tmp"
+            merged.to_parquet(tmp_path, engine="pyarrow", index=False)
+            os.replace(tmp_path, target)
+            for p in parts[:-1]:
+                os.remove(p)
+            compacted += 1
+        return compacted
+
+    def read_parquet(self, table: str, columns: Optional[List[str]] = None,
+                     start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Reads a Parquet table, opening only the date partitions within
+        [start, end] (ISO dates, inclusive) and only the requested columns.
+        """
+        files = []
+        for partition in sorted(glob.glob(os.path.join(self._parquet_root(table), "date=*"))):
+            date = os.path.basename(partition)[len("date="):]
+            if (start or end) and date == self.UNKNOWN_DATE:
+                continue
+            if (start and date < start) or (end and date > end):
+                continue
+            files.extend(sorted(glob.glob(os.path.join(partition, "part-*.parquet"))))
+        if not files:
+            return pd.DataFrame(columns=columns or [])
+        return self._concat_frames([pd.read_parquet(f, engine="pyarrow", columns=columns) for f in files])
@@ -1,4 +1,30 @@
-from typing import Dict
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+
+# Bill multipliers by operation type used to score lead quality
+INDUSTRY_MULTIPLIERS = {
+    "manufacturing": 1.2,
+    "cold-storage": 1.5,
+    "warehousing": 1.1,
+    "other": 1.0
+}
+
+def _round_like_python(values: np.ndarray, ndigits: int = 2) -> np.ndarray:
+    """
+    np.round rounds the value scaled by 10**ndigits, so near-halfway values
+    such as 0.015 or 2.675 can round the other way from Python's exact
+    `round`. Those few are re-rounded with `round`, keeping batch results
+    (and the tiers decided on them) identical to `calculate`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, ndigits)
+    with np.errstate(invalid="ignore"):
+        scaled = values * 10 ** ndigits
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-9 * np.maximum(1.0, np.abs(scaled))
+    if near_half.any():
+        rounded[near_half] = [round(float(v), ndigits) for v in values[near_half]]
+    return rounded
 
 class ROICalculator:
     """
@@ -43,3 +69,46 @@ class ROICalculator:
             "roi_percentage": round((monthly_savings * 12 / capex) * 100, 2) if capex > 0 else 0,
             "annual_co2_offset_tons": round(annual_co2_offset_tons, 2)
         }
+
+    def calculate_batch(self, roof_sizes_sqft: Any, monthly_bills_inr: Optional[Any] = None) -> Any:
+        """
+        Vectorized `calculate` over many sites in one NumPy pass.
+        Accepts two array-likes, or a DataFrame with `roof_size` and
+        `electricity_bill` columns (returned with the result columns added).
+        Otherwise returns a dict of arrays keyed like `calculate`.
+        """
+        frame = roof_sizes_sqft if isinstance(roof_sizes_sqft, pd.DataFrame) else None
+        if frame is not None:
+            roof = frame["roof_size"].to_numpy(dtype=np.float64)
+            bill = frame["electricity_bill"].to_numpy(dtype=np.float64)
+        else:
+            roof = np.asarray(roof_sizes_sqft, dtype=np.float64)
+            bill = np.asarray(monthly_bills_inr, dtype=np.float64)
+
+        recommended_capacity_kw = roof / 100
+        needed_capacity_kw = (bill * 0.9) / (self.units_per_kw_monthly * self.rate_per_unit)
+        final_capacity_kw = np.minimum(recommended_capacity_kw, needed_capacity_kw)
+
+        capex = final_capacity_kw * self.cost_per_kw
+        monthly_savings = final_capacity_kw * self.units_per_kw_monthly * self.rate_per_unit
+        annual_savings = monthly_savings * 12
+
+        # Guard the divisions the scalar version short-circuits
+        with np.errstate(divide="ignore", invalid="ignore"):
+            payback_years = np.where(monthly_savings > 0, capex / annual_savings, 0.0)
+            roi_percentage = np.where(capex > 0, annual_savings / capex * 100, 0.0)
+
+        annual_generation_kwh = final_capacity_kw * self.units_per_kw_monthly * 12
+        annual_co2_offset_tons = (annual_generation_kwh * self.co2_factor_kg_per_kwh) / 1000
+
+        results = {
+            "capacity_kw": _round_like_python(final_capacity_kw),
+            "capex_estimate": _round_like_python(capex),
+            "monthly_savings": _round_like_python(monthly_savings),
+            "payback_years": _round_like_python(payback_years),
+            "roi_percentage": _round_like_python(roi_percentage),
+            "annual_co2_offset_tons": _round_like_python(annual_co2_offset_tons)
+        }
+        if frame is not None:
+            return frame.assign(**results)
+        return results
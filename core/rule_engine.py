@@ -0,0 +1,251 @@
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+@dataclass
+class Rule:
+    rule_id: str
+    category: str
+    weight: int
+    flag: str
+    phrases: Tuple[str, ...] = ()
+    regex: Optional[str] = None
+    # Literal (lowercase) substrings, one of which occurs in every regex match
+    anchors: Tuple[str, ...] = ()
+
+class RuleSet:
+    """
+    Declarative compliance rules compiled once for fast scanning.
+
+    Every rule's phrases are merged into one prefix-trie regex, so a single pass
+    finds them all. The regex reports the longest phrase at each position; the
+    rules of shorter phrases that also match there (its prefixes) are looked up
+    from a table built at compile time, so every matching rule is reported.
+    Rule regexes are compiled separately; a rule that lists `anchors` (literals
+    every match contains) is only run in windows around them. Text is
+    lowercased and matched case-sensitively, so regexes are written in
+    lowercase. Each rule counts once towards the risk score.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, rules: List[Rule], review_threshold: int = 50, block_threshold: int = 70,
+                 max_match_length: int = 256, version: str = ""):
+        self.rules = {rule.rule_id: rule for rule in rules}
+        self.review_threshold = review_threshold
+        self.block_threshold = block_threshold
+        self.max_match_length = max_match_length
+        self.version = version
+        self._phrase_rules: Dict[str, List[str]] = {}
+        # normalized phrase -> rules of that phrase and of every phrase that matches wherever it does
+        self._phrase_hits: Dict[str, Tuple[str, ...]] = {}
+        self._regex_rules: List[Tuple[str, "re.Pattern", Tuple[str, ...]]] = []
+        self.pattern = self._compile()
+
+    @classmethod
+    def load(cls, path: str) -> "RuleSet":
+        with open(path, "rb") as f:
+            raw = f.read()
+        spec = json.loads(raw)
+        rules = [
+            Rule(
+                rule_id=r["id"],
+                category=r.get("category", "general"),
+                weight=int(r.get("weight", 0)),
+                flag=r.get("flag", r["id"]),
+                phrases=tuple(r.get("phrases", [])),
+                regex=r.get("regex"),
+                anchors=tuple(a.lower() for a in r.get("anchors", []))
+            )
+            for r in spec.get("rules", [])
+        ]
+        thresholds = spec.get("thresholds", {})
+        return cls(
+            rules,
+            review_threshold=int(thresholds.get("review", 50)),
+            block_threshold=int(thresholds.get("block", 70)),
+            max_match_length=int(spec.get("max_match_length", 256)),
+            version=hashlib.sha256(raw).hexdigest()[:16]
+        )
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    @staticmethod
+    def _trie_regex(phrases: Iterable[str]) -> str:
+        trie: Dict[str, Any] = {}
+        for phrase in phrases:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def emit(node: Dict[str, Any]) -> str:
+            terminal = "" in node
+            branches = []
+            for char in sorted(k for k in node if k):
+                atom = r"\s+" if char == " " else re.escape(char)
+                branches.append(atom + emit(node[char]))
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 and not terminal else "(?:" + "|".join(branches) + ")"
+            return body + "?" if terminal else body
+
+        return emit(trie)
+
+    @staticmethod
+    def _minimal_anchors(anchors: Iterable[str]) -> Tuple[str, ...]:
+        """
+        Drops anchors that contain another anchor; finding the shorter one already covers them.
+        """
+        result: List[str] = []
+        for anchor in sorted(set(anchors), key=len):
+            if not any(kept in anchor for kept in result):
+                result.append(anchor)
+        return tuple(result)
+
+    def _compile(self) -> Optional["re.Pattern"]:
+        for rule in self.rules.values():
+            for phrase in rule.phrases:
+                self._phrase_rules.setdefault(self._normalize(phrase), []).append(rule.rule_id)
+            if rule.regex:
+                self._regex_rules.append((rule.rule_id, re.compile(rule.regex), self._minimal_anchors(rule.anchors)))
+        if not self._phrase_rules:
+            return None
+        for phrase in self._phrase_rules:
+            rule_ids: List[str] = []
+            for other, other_rules in self._phrase_rules.items():
+                # A prefix matches too when the longer phrase continues with a non-word character
+                if phrase.startswith(other) and (len(other) == len(phrase) or not phrase[len(other)].isalnum()):
+                    rule_ids.extend(r for r in other_rules if r not in rule_ids)
+            self._phrase_hits[phrase] = tuple(rule_ids)
+        # Consuming the boundary character (rather than a lookbehind) lets `re`
+        # skip ahead on a character set instead of trying the trie everywhere
+        return re.compile(r"[^a-z0-9](" + self._trie_regex(self._phrase_rules) + r")(?![a-z0-9])")
+
+    def _windows(self, text: str, anchors: Tuple[str, ...]) -> List[Tuple[int, int]]:
+        """
+        Merged [start, end) windows reaching `max_match_length` either side of
+        every anchor occurrence, so they contain every match that includes one.
+        """
+        span = self.max_match_length
+        hits = []
+        for anchor in anchors:
+            i = text.find(anchor)
+            while i != -1:
+                hits.append(i)
+                i = text.find(anchor, i + 1)
+        windows: List[Tuple[int, int]] = []
+        for i in sorted(hits):
+            start, end = max(0, i - span), min(len(text), i + span + 1)
+            if windows and start <= windows[-1][1]:
+                windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+            else:
+                windows.append((start, end))
+        return windows
+
+    def _finditer_anchored(self, pattern: "re.Pattern", text: str, anchors: Tuple[str, ...],
+                           final: bool) -> Iterable["re.Match"]:
+        for start, end in self._windows(text, anchors):
+            for match in pattern.finditer(text, max(start, 1), end):
+                # Lookaheads treat the window end as the end of the text, so a
+                # match ending there may be cut short; real matches end earlier
+                if match.end() == end and (end < len(text) or not final):
+                    continue
+                yield match
+
+    def _chunks(self, text: str) -> Iterable[Tuple[int, str]]:
+        """
+        Yields (offset, chunk) windows that overlap by `max_match_length` so
+        matches straddling a boundary are still found.
+        """
+        step = self.CHUNK_SIZE
+        if len(text) <= step:
+            yield 0, text
+            return
+        for start in range(0, len(text), step):
+            yield start, text[start:start + step + self.max_match_length]
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """
+        Returns match counts per rule id.
+        """
+        return self.scan_stream(self._chunks(text))
+
+    def scan_stream(self, chunks: Iterable[Tuple[int, str]]) -> Dict[str, int]:
+        """
+        Scans (offset, chunk) windows, which must overlap or at least touch;
+        matches are de-duplicated by absolute position across windows. Each
+        chunk is read with the character before it from the previous chunk, and
+        matches running into the end of a chunk are left to the next one, so
+        chunk edges never look like word boundaries.
+        """
+        counts: Dict[str, int] = {}
+        seen = set()
+
+        def hit(rule_id: str, position: int):
+            if (rule_id, position) not in seen:
+                seen.add((rule_id, position))
+                counts[rule_id] = counts.get(rule_id, 0) + 1
+
+        chunks = iter(chunks)
+        current = next(chunks, None)
+        previous: Optional[Tuple[int, str]] = None
+        while current is not None:
+            following = next(chunks, None)
+            final = following is None
+            offset, chunk = current
+            # Text position 0 is preceded by a space, the boundary for a phrase at the very start
+            context = " "
+            if previous is not None and previous[0] < offset <= previous[0] + len(previous[1]):
+                context = previous[1][offset - 1 - previous[0]]
+            text = (context + chunk).lower()
+
+            if self.pattern is not None:
+                pos = 0
+                while True:
+                    match = self.pattern.search(text, pos)
+                    if match is None:
+                        break
+                    # Resume inside the match, so phrases starting within it are found too
+                    pos = match.start(1)
+                    if match.end() == len(text) and not final:
+                        continue
+                    for rule_id in self._phrase_hits.get(self._normalize(match.group(1)), ()):
+                        hit(rule_id, offset + match.start(1) - 1)
+            for rule_id, pattern, anchors in self._regex_rules:
+                if anchors:
+                    matches = self._finditer_anchored(pattern, text, anchors, final)
+                else:
+                    matches = (m for m in pattern.finditer(text, 1) if final or m.end() < len(text))
+                for match in matches:
+                    hit(rule_id, offset + match.start() - 1)
+            previous, current = current, following
+        return counts
+
+    def evaluate(self, text: str) -> Dict[str, Any]:
+        """
+        Scores text: the sum of weights of every rule that matched at least once.
+        """
+        matches = self.scan(text)
+        rules = [self.rules[rule_id] for rule_id in matches]
+        return {
+            "risk_score": sum(rule.weight for rule in rules),
+            "flags": [rule.flag for rule in rules],
+            "categories": sorted({rule.category for rule in rules}),
+            "matches": matches
+        }
+
+    def status(self, risk_score: int, review_threshold: Optional[int] = None,
+               block_threshold: Optional[int] = None) -> str:
+        """
+        "cleared", "review" or "flagged"; thresholds default to the rule file's.
+        """
+        if risk_score >= (self.block_threshold if block_threshold is None else block_threshold):
+            return "flagged"
+        if risk_score >= (self.review_threshold if review_threshold is None else review_threshold):
+            return "review"
+        return "cleared"
@@ -0,0 +1,339 @@
+import asyncio
+import datetime
+import heapq
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+class Clock:
+    """
+    Wall-clock time source for the Scheduler. Swapped for a ManualClock in tests.
+    """
+
+    def time(self) -> float:
+        return time.time()
+
+    async def wait(self, event: asyncio.Event, timeout: Optional[float]):
+        """
+        Sleeps until `event` is set or `timeout` seconds pass (forever if None).
+        """
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+class ManualClock(Clock):
+    """
+    Fake clock that only moves when `advance` is called, so schedules can be
+    exercised without real sleeping.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self._advanced = asyncio.Event()
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+        self._advanced.set()
+
+    async def wait(self, event: asyncio.Event, timeout: Optional[float]):
+        deadline = None if timeout is None else self.now + timeout
+        while not event.is_set() and (deadline is None or self.now < deadline):
+            self._advanced.clear()
+            waiters = [asyncio.ensure_future(event.wait()), asyncio.ensure_future(self._advanced.wait())]
+            _, pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in pending:
+                waiter.cancel()
+
+class IntervalTrigger:
+    """
+    Fires every `seconds`, anchored at the time the job is scheduled.
+    """
+
+    def __init__(self, seconds: float, fire_immediately: bool = False):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive.")
+        self.seconds = seconds
+        self.fire_immediately = fire_immediately
+        self.anchor: Optional[float] = None
+
+    def first_fire(self, now: float) -> float:
+        self.anchor = now
+        return now if self.fire_immediately else now + self.seconds
+
+    def next_after(self, t: float) -> float:
+        anchor = self.anchor if self.anchor is not None else t
+        ticks = int((t - anchor) // self.seconds) + 1
+        return anchor + max(ticks, 1) * self.seconds
+
+    def __repr__(self) -> str:
+        return f"every {self.seconds:g}s"
+
+class CronTrigger:
+    """
+    Standard 5-field cron expression (minute hour day-of-month month day-of-week)
+    evaluated in local time. Supports `*`, lists, ranges, steps and the
+    @hourly/@daily/@weekly/@monthly aliases.
+    """
+
+    ALIASES = {
+        "@hourly": "0 * * * *",
+        "@daily": "0 0 * * *",
+        "@weekly": "0 0 * * 0",
+        "@monthly": "0 0 1 * *",
+    }
+    BOUNDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+    MAX_SEARCH_YEARS = 5
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = self.ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+        parsed = [self._parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, self.BOUNDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Cron allows 7 for Sunday; Python weekday() has Monday=0
+        self.weekdays = {(d - 1) % 7 for d in weekdays} | ({6} if 7 in weekdays else set())
+        self.day_restricted = fields[2] != "*"
+        self.weekday_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse_field(spec: str, lo: int, hi: int) -> Set[int]:
+        values: Set[int] = set()
+        for part in spec.split(","):
+            step = 1
+            if "/" in part:
+                part, step_str = part.split("/", 1)
+                step = int(step_str)
+            if part == "*":
+                start, end = lo, hi
+            elif "-" in part:
+                start, end = (int(x) for x in part.split("-", 1))
+            else:
+                start = int(part)
+                end = hi if step > 1 else start
+            if start < lo or end > (7 if hi == 6 else hi) or start > end or step < 1:
+                raise ValueError(f"Invalid cron field '{spec}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt: datetime.datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = dt.weekday() in self.weekdays
+        # Cron semantics: if both fields are restricted either one may match
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def first_fire(self, now: float) -> float:
+        return self.next_after(now)
+
+    def next_after(self, t: float) -> float:
+        dt = datetime.datetime.fromtimestamp(t).replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        limit = dt.year + self.MAX_SEARCH_YEARS
+
+        # Jump whole months/days/hours at a time instead of walking minutes
+        while dt.year <= limit:
+            if dt.month not in self.months:
+                year, month = (dt.year + 1, 1) if dt.month == 12 else (dt.year, dt.month + 1)
+                dt = dt.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(dt):
+                dt = (dt + datetime.timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if dt.hour not in self.hours:
+                dt = (dt + datetime.timedelta(hours=1)).replace(minute=0)
+                continue
+            if dt.minute not in self.minutes:
+                dt += datetime.timedelta(minutes=1)
+                continue
+            return dt.timestamp()
+
+        raise ValueError(f"Cron expression '{self.expression}' never fires.")
+
+    def __repr__(self) -> str:
+        return f"cron '{self.expression}'"
+
+def parse_trigger(spec: str) -> Any:
+    """
+    Builds a trigger from a config string: "every <seconds>" (append "now" to
+    also fire at startup) or a cron expression.
+    """
+    spec = spec.strip()
+    if spec.lower().startswith("every "):
+        return IntervalTrigger(float(spec.split()[1]), fire_immediately=spec.lower().endswith("now"))
+    return CronTrigger(spec)
+
+@dataclass
+class ScheduledJob:
+    """
+    A callable bound to a trigger.
+
+    misfire: "skip" runs a late tick once, folding any ticks missed meanwhile
+    into that run, and drops ticks that land while the previous run is still
+    going; with `grace` set it also drops ticks more than `grace` seconds late.
+    "catch_up" queues one run per missed tick, up to `max_catch_up`, and runs
+    them back to back.
+    """
+    name: str
+    trigger: Any
+    func: Callable[[], Awaitable[Any]]
+    jitter: float = 0.0
+    misfire: str = "skip"
+    grace: Optional[float] = None
+    max_catch_up: int = 10
+    next_tick: float = 0.0
+    fire_at: float = 0.0
+    running: bool = False
+    pending_runs: int = 0
+    run_count: int = 0
+    skipped_count: int = 0
+    last_run: Optional[float] = None
+    version: int = 0
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+class Scheduler:
+    """
+    Heap-based job scheduler. Sleeps exactly until the next due job, so an idle
+    engine does no work between ticks.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None, rng: Optional[random.Random] = None):
+        self.clock = clock or Clock()
+        self.rng = rng or random.Random()
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._seq = 0
+        self._wake: Optional[asyncio.Event] = None
+        self.is_running = False
+
+    def add_job(self, name: str, trigger: Any, func: Callable[[], Awaitable[Any]],
+                jitter: float = 0.0, misfire: str = "skip", grace: Optional[float] = None,
+                max_catch_up: int = 10) -> ScheduledJob:
+        if misfire not in ("skip", "catch_up"):
+            raise ValueError(f"Unknown misfire policy: {misfire}")
+        if name in self.jobs:
+            self.remove_job(name)
+
+        job = ScheduledJob(name=name, trigger=trigger, func=func, jitter=jitter,
+                           misfire=misfire, grace=grace, max_catch_up=max_catch_up)
+        job.next_tick = trigger.first_fire(self.clock.time())
+        self._push(job)
+        print(f"[Scheduler] Scheduled {name} ({trigger})")
+        return job
+
+    def remove_job(self, name: str):
+        # Heap entries of removed jobs are discarded lazily when popped
+        self.jobs.pop(name, None)
+        self._notify()
+
+    def next_fire_time(self) -> Optional[float]:
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def _push(self, job: ScheduledJob):
+        job.version += 1
+        job.fire_at = job.next_tick + (self.rng.uniform(0, job.jitter) if job.jitter > 0 else 0.0)
+        self.jobs[job.name] = job
+        self._seq += 1
+        heapq.heappush(self._heap, (job.fire_at, self._seq, job.name, job.version))
+        self._notify()
+
+    def _discard_stale(self):
+        while self._heap:
+            _, _, name, version = self._heap[0]
+            job = self.jobs.get(name)
+            if job is not None and job.version == version:
+                return
+            heapq.heappop(self._heap)
+
+    def _notify(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    def run_pending(self) -> List[str]:
+        """
+        Dispatches every job due at the current clock time and reschedules it.
+        Returns the names of jobs that were started or queued.
+        """
+        now = self.clock.time()
+        fired = []
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _, _, name, _ = heapq.heappop(self._heap)
+            job = self.jobs[name]
+
+            # Ticks that were due between the scheduled one and now
+            missed = 0
+            tick = job.next_tick
+            next_tick = job.trigger.next_after(tick)
+            while next_tick <= now and missed < job.max_catch_up:
+                missed += 1
+                next_tick = job.trigger.next_after(next_tick)
+            if next_tick <= now:
+                next_tick = job.trigger.next_after(now)
+
+            late = job.grace is not None and now - job.fire_at > job.grace
+            if job.misfire == "catch_up":
+                runs = 1 + missed
+            else:
+                runs = 0 if late or job.running else 1
+
+            if runs:
+                job.pending_runs += runs
+                if not job.running:
+                    job.running = True
+                    job.task = asyncio.ensure_future(self._run_job(job))
+                fired.append(name)
+            else:
+                job.skipped_count += 1
+                print(f"[Scheduler] Skipped {name}: {'misfired' if late else 'previous run still active'}")
+
+            job.next_tick = next_tick
+            self._push(job)
+        return fired
+
+    async def _run_job(self, job: ScheduledJob):
+        # Overlap guard: a job never runs concurrently with itself
+        try:
+            while job.pending_runs > 0:
+                job.pending_runs -= 1
+                job.last_run = self.clock.time()
+                job.run_count += 1
+                try:
+                    await job.func()
+                except Exception as e:
+                    print(f"[Scheduler] Job {job.name} failed: {e}")
+        finally:
+            job.running = False
+            job.task = None
+
+    async def run(self):
+        """
+        Main loop: sleep until the earliest fire time (or a schedule change), then
+        dispatch everything that is due.
+        """
+        self.is_running = True
+        self._wake = asyncio.Event()
+        try:
+            while self.is_running:
+                next_fire = self.next_fire_time()
+                timeout = None if next_fire is None else max(0.0, next_fire - self.clock.time())
+                if timeout is None or timeout > 0:
+                    await self.clock.wait(self._wake, timeout)
+                self._wake.clear()
+                if self.is_running:
+                    self.run_pending()
+        finally:
+            self.is_running = False
+            self._wake = None
+
+    def stop(self):
+        self.is_running = False
+        self._notify()
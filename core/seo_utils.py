@@ -1,4 +1,62 @@
-from typing import List, Dict
+import functools
+from typing import Any, List, Dict, Optional, Tuple
+from core.keyword_clustering import KeywordClusterer, TOKEN_PATTERN
+
+BASELINE_TOPIC_WEIGHT = 0.1
+
+def _stem(token: str) -> str:
+    """
+    Light plural stripping so "warehouses" matches the "warehouse" topic.
+    """
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+class TopicWeightIndex:
+    """
+    Token -> topic map built once from `topic_weights`. Scoring a keyword is a
+    single pass over its tokens, independent of the number of topics. Topics
+    may be multi-word ("cold storage"); when several topics match, `combine`
+    picks the "max" weight or the "sum" of them.
+    """
+
+    def __init__(self, topic_weights: Dict[str, float], combine: str = "max",
+                 baseline: float = BASELINE_TOPIC_WEIGHT):
+        if combine not in ("max", "sum"):
+            raise ValueError(f"Unknown combine policy: {combine}")
+        self.combine = combine
+        self.baseline = baseline
+        # first token -> [(remaining tokens, topic, weight)], longest phrase first
+        self._by_first: Dict[str, List[Tuple[Tuple[str, ...], str, float]]] = {}
+        for topic, weight in topic_weights.items():
+            tokens = [_stem(t) for t in TOKEN_PATTERN.findall(topic.lower())]
+            if tokens:
+                self._by_first.setdefault(tokens[0], []).append((tuple(tokens[1:]), topic, weight))
+        for entries in self._by_first.values():
+            entries.sort(key=lambda entry: len(entry[0]), reverse=True)
+
+    def matches(self, keyword: str) -> Dict[str, float]:
+        """
+        Topics found in the keyword, mapped to their weights.
+        """
+        tokens = [_stem(t) for t in TOKEN_PATTERN.findall(keyword.lower())]
+        found: Dict[str, float] = {}
+        for i, token in enumerate(tokens):
+            for rest, topic, weight in self._by_first.get(token, ()):
+                if tuple(tokens[i + 1:i + 1 + len(rest)]) == rest:
+                    found[topic] = weight
+        return found
+
+    def score(self, keyword: str) -> float:
+        found = self.matches(keyword)
+        if not found:
+            return self.baseline
+        return max(found.values()) if self.combine == "max" else sum(found.values())
+
+    def score_many(self, keywords: List[str]) -> List[float]:
+        return [self.score(keyword) for keyword in keywords]
 
 class SEOUtils:
     """
@@ -28,12 +86,66 @@ class SEOUtils:
 
         return clusters
 
+    # Query modifiers that signal purchase intent vs research
+    COMMERCIAL_MODIFIERS = frozenset((
+        "price", "cost", "quote", "installation", "installer", "subsidy", "roi", "payback", "company",
+        "companies", "supplier", "best", "epc", "loan", "emi", "factory", "factories", "warehouse",
+        "warehouses", "industrial", "commercial", "kw", "mw", "near"
+    ))
+    INFORMATIONAL_MODIFIERS = frozenset(("what", "why", "how", "guide", "meaning", "definition", "is", "does"))
+
+    @staticmethod
+    def classify_intent(keyword: str) -> str:
+        """
+        Heuristic intent for raw Search Console queries: "high", "medium" or "low".
+        """
+        tokens = set(TOKEN_PATTERN.findall(keyword.lower()))
+        if tokens & SEOUtils.COMMERCIAL_MODIFIERS:
+            return "high"
+        if tokens & SEOUtils.INFORMATIONAL_MODIFIERS:
+            return "low"
+        return "medium"
+
+    @staticmethod
+    def cluster_topics(keywords: List[Dict], clusterer: Optional[KeywordClusterer] = None,
+                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Groups keywords by topical similarity (MinHash/LSH). With a fitted
+        clusterer, new keywords are assigned incrementally instead of re-clustering.
+        Returns clusters with a label, representative query and total volume.
+        """
+        if clusterer is None:
+            clusterer = KeywordClusterer()
+        if clusterer.clusters:
+            clusterer.assign(keywords)
+        else:
+            clusterer.fit(keywords)
+        return clusterer.summary(limit)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _cached_topic_index(weights: Tuple[Tuple[str, float], ...], combine: str) -> TopicWeightIndex:
+        return TopicWeightIndex(dict(weights), combine)
+
     @staticmethod
-    def calculate_topic_weight(keyword: str, global_weights: Dict[str, float]) -> float:
+    def topic_index(global_weights: Dict[str, float], combine: str = "max") -> TopicWeightIndex:
+        """
+        Returns the compiled index for these weights; it is only rebuilt when
+        NODE_7 publishes different weights.
+        """
+        return SEOUtils._cached_topic_index(tuple(sorted(global_weights.items())), combine)
+
+    @staticmethod
+    def calculate_topic_weight(keyword: str, global_weights: Dict[str, float], combine: str = "max") -> float:
         """
         Calculates a priority weight for a keyword based on system topic affinities.
         """
-        for topic, weight in global_weights.items():
-            if topic.lower() in keyword.lower():
-                return weight
-        return 0.1 # Baseline
+        return SEOUtils.topic_index(global_weights, combine).score(keyword)
+
+    @staticmethod
+    def calculate_topic_weights(keywords: List[str], global_weights: Dict[str, float],
+                                combine: str = "max") -> List[float]:
+        """
+        Batch form of calculate_topic_weight: one pass over the keyword list.
+        """
+        return SEOUtils.topic_index(global_weights, combine).score_many(keywords)
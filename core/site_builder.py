@@ -1,36 +1,370 @@
 import os
-import shutil
+import re
+import json
+import html
+import hashlib
 import datetime
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+from core.post_index import PostIndex
+
+# Bump when the page template or renderer changes so every post is re-rendered
+TEMPLATE_VERSION = "3"
+
+INLINE_PATTERNS = [
+    (re.compile(r"`([^`]+)`"), r"<code>\1</code>"),
+    (re.compile(r"\*\*([^*]+)\*\*"), r"<strong>\1</strong>"),
+    (re.compile(r"(?<!\*)\*([^*]+)\*(?!\*)"), r"<em>\1</em>"),
+]
+LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+# A whole line wrapped in one of these tags, without attributes, keeps its tag
+# (generated drafts use <h1> and <p>); its text is escaped like any other line
+BLOCK_TAG = re.compile(r"<(h[1-6]|p|blockquote)>(.*)</\1>$", re.IGNORECASE)
+URL_SCHEME = re.compile(r"^([a-z][a-z0-9+.-]*):")
+SAFE_SCHEMES = ("http", "https")
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} | Manokamana Solar</title>
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Outfit:wght@400;500;700;800&display=swap" rel="stylesheet">
+    <link rel="stylesheet" href="../style.css">
+{head}
+</head>
+
+<body>
+    <main class="container--full">
+        <header class="container fade-in">
+            <a href="../index.html" class="logo">MANOKAMANA.SOLAR</a>
+            <nav>
+                <a href="../index.html">Intelligence</a>
+                <a href="index.html">Insights</a>
+                <a href="../dashboard.html">Live Dashboard</a>
+            </nav>
+        </header>
+
+{body}
+    </main>
+
+    <footer style="padding: 100px 0 60px; text-align: center; color: var(--text-secondary);">
+        <p style="font-size: 0.9rem; letter-spacing: 1px;">&copy; 2026 MANOKAMANA SOLAR OS | AGENTIC GROWTH ENGINE</p>
+    </footer>
+</body>
+
+</html>
+"""
+
+def parse_post(text: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Splits a blog post into its front matter (title, date, schema, ...) and Markdown body.
+    """
+    meta: Dict[str, Any] = {}
+    if not text.startswith("---"):
+        return meta, text
+    end = text.find("\n---", 3)
+    if end == -1:
+        return meta, text
+    for line in text[3:end].strip().splitlines():
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        value = value.strip()
+        if key.strip() == "schema":
+            try:
+                meta["schema"] = json.loads(value)
+            except ValueError:
+                continue
+        else:
+            meta[key.strip()] = value
+    return meta, text[end + 4:].lstrip("\n")
+
+def _safe_href(href: str) -> bool:
+    """
+    True for http(s) and relative URLs. Browsers ignore control characters and
+    whitespace inside a scheme, so they are dropped before it is checked.
+    """
+    url = re.sub(r"[\x00-\x20\x7f]", "", html.unescape(href)).lower()
+    scheme = URL_SCHEME.match(url)
+    return scheme is None or scheme.group(1) in SAFE_SCHEMES
+
+def _link(match: "re.Match") -> str:
+    label, href = match.group(1), match.group(2)
+    return f'<a href="{href}">{label}</a>' if _safe_href(href) else label
+
+def _inline(text: str) -> str:
+    # Escape first: the patterns below only ever add markup
+    text = html.escape(text)
+    for pattern, replacement in INLINE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return LINK_PATTERN.sub(_link, text)
+
+def render_markdown(body: str) -> str:
+    """
+    Minimal Markdown: headings, paragraphs, bullet lists and inline emphasis,
+    code and links. Text is HTML-escaped and only http(s) or relative links
+    are kept. A line that is a single attribute-free BLOCK_TAG element keeps
+    that tag; any other HTML is escaped as text.
+    """
+    out: List[str] = []
+    paragraph: List[str] = []
+    in_list = False
+
+    def flush():
+        nonlocal in_list
+        if paragraph:
+            out.append(f"<p>{_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+        if in_list:
+            out.append("</ul>")
+            in_list = False
+
+    for raw in body.splitlines():
+        line = raw.strip()
+        if not line:
+            flush()
+        elif BLOCK_TAG.match(line):
+            flush()
+            tag, inner = BLOCK_TAG.match(line).groups()
+            tag = tag.lower()
+            out.append(f"<{tag}>{_inline(inner.strip())}</{tag}>")
+        elif line.startswith("#"):
+            flush()
+            level = min(len(line) - len(line.lstrip("#")), 6)
+            out.append(f"<h{level}>{_inline(line[level:].strip())}</h{level}>")
+        elif line[:2] in ("- ", "* "):
+            if paragraph:
+                flush()
+            if not in_list:
+                out.append("<ul>")
+                in_list = True
+            out.append(f"<li>{_inline(line[2:].strip())}</li>")
+        else:
+            if in_list:
+                flush()
+            paragraph.append(line)
+    flush()
+    return "\n".join(out)
+
+def _write_atomic(path: str, content: str):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def render_post(slug: str, text: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Renders one post to a full HTML page. Returns the page and its index entry.
+    """
+    meta, body = parse_post(text)
+    title = meta.get("title") or slug.replace("-", " ").title()
+    date = meta.get("date", "")
+    head = ""
+    if meta.get("schema"):
+        # "</" inside JSON-LD would end the script element early
+        schema = json.dumps(meta["schema"], ensure_ascii=False).replace("</", "<\\/")
+        head = f'    <script type="application/ld+json">{schema}</script>'
+    article = (
+        '        <article class="blog-content fade-in">\n'
+        f'            <div class="blog-meta">{html.escape(date)} | High Authority Report</div>\n'
+        f'            <div class="blog-body">\n{render_markdown(body)}\n            </div>\n'
+        '        </article>'
+    )
+    page = PAGE_TEMPLATE.format(title=html.escape(title), head=head, body=article)
+    return page, {"title": title, "date": date}
+
+def render_batch(output_dir: str, items: List[Tuple[str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Process pool entry point: renders and writes (slug, source text) pairs.
+    """
+    results = []
+    for slug, text in items:
+        page, entry = render_post(slug, text)
+        _write_atomic(os.path.join(output_dir, f"{slug}.html"), page)
+        results.append((slug, entry))
+    return results
 
 class SiteBuilder:
     """
     Utility to manage static site builds and directory structures for Manokamana Solar.
+    Builds are incremental: a manifest of source hashes in public/blog/ decides
+    which posts need rendering, and the blog index is only rewritten when the
+    set of posts changes. With a PostIndex, the sitemap, RSS feed and paginated
+    JSON post index are patched from the same build. Large builds render on a
+    process pool that is started once and kept until close().
     """
 
-    def __init__(self, base_dir: str):
+    # Builds run on a worker thread of a process with live threads and sockets;
+    # forking there can copy held locks, so workers start from a clean interpreter
+    POOL_CONTEXT = multiprocessing.get_context(
+        "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+
+    def __init__(self, base_dir: str, workers: int = 4, batch_size: int = 64, inline_below: int = 32,
+                 post_index: Optional[PostIndex] = None, site_url: str = "https://manokamanasolar.com"):
         self.base_dir = base_dir
         self.content_dir = os.path.join(base_dir, "content")
         self.blog_dir = os.path.join(self.content_dir, "blogs")
         self.public_dir = os.path.join(base_dir, "public")
-        
+        self.output_dir = os.path.join(self.public_dir, "blog")
+        self.manifest_path = os.path.join(self.output_dir, ".build_manifest.json")
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        # Small builds are cheaper to render in-process than to start a pool for
+        self.inline_below = inline_below
+        self.post_index = post_index
+        self.site_url = site_url
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
         self._ensure_dirs()
 
     def _ensure_dirs(self):
         """Create necessary project directories if they don't exist."""
-        for d in [self.content_dir, self.blog_dir, self.public_dir]:
+        for d in [self.content_dir, self.blog_dir, self.public_dir, self.output_dir]:
             if not os.path.exists(d):
                 os.makedirs(d)
                 print(f"[SiteBuilder] Created directory: {d}")
 
-    def rebuild_site(self):
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {"template": TEMPLATE_VERSION, "posts": {}, "index": None}
+        if manifest.get("template") != TEMPLATE_VERSION:
+            # Renderer changed: keep nothing, so every page is rebuilt
+            return {"template": TEMPLATE_VERSION, "posts": {}, "index": None}
+        return manifest
+
+    def _render(self, dirty: List[Tuple[str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+        if len(dirty) < self.inline_below:
+            return render_batch(self.output_dir, dirty)
+        batches = [dirty[i:i + self.batch_size] for i in range(0, len(dirty), self.batch_size)]
+        pool = self._process_pool()
+        try:
+            chunks = pool.map(render_batch, [self.output_dir] * len(batches), batches)
+            return [result for chunk in chunks for result in chunk]
+        except BrokenProcessPool:
+            # A dead worker breaks the pool for good; the next build starts a new one
+            with self._pool_lock:
+                if self._pool is pool:
+                    self._pool = None
+            raise
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=self.POOL_CONTEXT)
+            return self._pool
+
+    def close(self):
+        """
+        Stops the render pool, if one was started.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def _render_index(self, posts: List[Tuple[str, Dict[str, Any]]]) -> str:
+        cards = "\n".join(
+            '            <div class="glass blog-card">\n'
+            f'                <div class="date">{html.escape(entry["date"])}</div>\n'
+            f'                <h2><a href="{slug}.html">{html.escape(entry["title"])}</a></h2>\n'
+            '            </div>'
+            for slug, entry in posts
+        )
+        body = f'        <section class="container fade-in">\n{cards}\n        </section>'
+        return PAGE_TEMPLATE.format(title="Insights", head="", body=body)
+
+    def build(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Renders new and changed posts, removes pages of deleted posts and
+        rewrites the blog index if the post list changed.
+        """
+        manifest = {"template": TEMPLATE_VERSION, "posts": {}, "index": None} if force else self._load_manifest()
+        previous = manifest["posts"]
+        posts: Dict[str, Dict[str, Any]] = {}
+        dirty: List[Tuple[str, str]] = []
+        touched = 0
+
+        with os.scandir(self.blog_dir) as entries:
+            for dir_entry in entries:
+                if not dir_entry.name.endswith(".md") or not dir_entry.is_file():
+                    continue
+                slug = dir_entry.name[:-3]
+                stat = dir_entry.stat()
+                entry = previous.get(slug)
+                # Unchanged size and mtime: trust the manifest without reading the file
+                if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    posts[slug] = entry
+                    continue
+                with open(dir_entry.path, "r", encoding="utf-8") as f:
+                    text = f.read()
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                posts[slug] = {"hash": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                               "title": entry["title"] if entry else "", "date": entry["date"] if entry else ""}
+                touched += 1
+                if not entry or entry["hash"] != digest:
+                    dirty.append((slug, text))
+
+        for slug, page_entry in self._render(dirty):
+            posts[slug].update(page_entry)
+
+        removed = [slug for slug in previous if slug not in posts]
+        for slug in removed:
+            try:
+                os.remove(os.path.join(self.output_dir, f"{slug}.html"))
+            except FileNotFoundError:
+                pass
+
+        # Titles and dates only change when a post is re-rendered, so the index
+        # can only differ after renders or removals
+        index_hash = manifest.get("index")
+        index_changed = False
+        if dirty or removed or index_hash is None:
+            # Newest first
+            listing = sorted(((slug, {"title": e["title"], "date": e["date"]}) for slug, e in posts.items()),
+                             key=lambda item: (item[1]["date"], item[0]), reverse=True)
+            new_hash = hashlib.sha256(json.dumps(listing).encode("utf-8")).hexdigest()
+            if new_hash != index_hash:
+                _write_atomic(os.path.join(self.output_dir, "index.html"), self._render_index(listing))
+                index_hash, index_changed = new_hash, True
+
+        if touched or removed or index_changed:
+            _write_atomic(self.manifest_path, json.dumps({"template": TEMPLATE_VERSION, "posts": posts, "index": index_hash}))
+
+        stats = {"posts": len(posts), "rendered": len(dirty), "removed": len(removed), "index_rebuilt": index_changed}
+        if self.post_index is not None:
+            # Posts edited or dropped outside publish_blog are caught up here; unchanged ones are no-ops
+            # New posts are numbered oldest first, so pagination follows publish dates
+            for slug in sorted((slug for slug, _ in dirty), key=lambda slug: (posts[slug]["date"], slug)):
+                entry = posts[slug]
+                self.post_index.upsert(slug, entry["title"], entry["date"], f"/blog/{slug}.html", entry["hash"])
+            for slug in removed:
+                self.post_index.remove(slug)
+            stats["artifacts"] = self.post_index.write_artifacts(self.public_dir, self.site_url, force=force)
+        return stats
+
+    def rebuild_site(self, force: bool = False) -> Dict[str, Any]:
         """
-        Simulates a static site rebuild process.
-        In a real scenario, this would trigger Vite, Next.js, or Hugo.
+        Incrementally builds public/blog/ from the Markdown posts in content/blogs/.
         """
-        print(f"[SiteBuilder] Rebuilding static site at {datetime.datetime.now()}...")
-        # Simulate build by syncing content to public (toy example)
-        # In real world: `npm run build`
-        return {"status": "success", "timestamp": datetime.datetime.now().isoformat()}
+        started = datetime.datetime.now()
+        stats = self.build(force)
+        elapsed_ms = (datetime.datetime.now() - started).total_seconds() * 1000
+        print(f"[SiteBuilder] Built {stats['rendered']}/{stats['posts']} posts "
+              f"({stats['removed']} removed, index {'rebuilt' if stats['index_rebuilt'] else 'unchanged'}) "
+              f"in {elapsed_ms:.1f} ms.")
+        return {"status": "success", "timestamp": datetime.datetime.now().isoformat(), **stats}
 
     def get_blog_path(self, slug: str) -> str:
         return os.path.join(self.blog_dir, f"{slug}.md")
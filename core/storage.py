@@ -0,0 +1,184 @@
+import datetime
+import json
+import os
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+class StorageBackend:
+    """
+    Persistence interface for GlobalMemory. The base class keeps nothing, which
+    gives the original purely in-memory behaviour.
+    """
+
+    def keys(self) -> Dict[str, str]:
+        """
+        Returns every stored key mapped to its kind ("list" or "value").
+        """
+        return {}
+
+    def load_value(self, key: str) -> Any:
+        return None
+
+    def load_list(self, key: str) -> List[Any]:
+        return []
+
+    def list_length(self, key: str) -> int:
+        return 0
+
+    def set_value(self, key: str, value: Any):
+        pass
+
+    def set_list(self, key: str, values: List[Any]):
+        pass
+
+    def append(self, key: str, value: Any):
+        pass
+
+    def extend(self, key: str, values: List[Any]):
+        for value in values:
+            self.append(key, value)
+
+    def commit(self):
+        pass
+
+    def snapshot(self) -> Optional[str]:
+        return None
+
+    def close(self):
+        pass
+
+class SQLiteBackend(StorageBackend):
+    """
+    Write-through SQLite store in WAL mode. Scalar state lives in `state`; list
+    keys get one row per item in `list_items`, so appends never rewrite history.
+    """
+
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS state ("
+        " key TEXT PRIMARY KEY, kind TEXT NOT NULL, value TEXT, length INTEGER NOT NULL DEFAULT 0)",
+        "CREATE TABLE IF NOT EXISTS list_items ("
+        " key TEXT NOT NULL, seq INTEGER NOT NULL, value TEXT NOT NULL, PRIMARY KEY (key, seq)) WITHOUT ROWID",
+    ]
+
+    def __init__(self, db_path: str, commit_every: int = 200, snapshot_dir: Optional[str] = None,
+                 snapshot_retention: int = 5):
+        self.db_path = db_path
+        self.commit_every = max(1, commit_every)
+        self.snapshot_dir = snapshot_dir or os.path.join(os.path.dirname(db_path) or ".", "snapshots")
+        self.snapshot_retention = snapshot_retention
+        self._uncommitted = 0
+        self._lengths: Dict[str, int] = {}
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    @staticmethod
+    def _dump(value: Any) -> str:
+        return json.dumps(value, default=str)
+
+    def _written(self, count: int = 1):
+        self._uncommitted += count
+        if self._uncommitted >= self.commit_every:
+            self.commit()
+
+    def keys(self) -> Dict[str, str]:
+        rows = self.conn.execute("SELECT key, kind, length FROM state").fetchall()
+        self._lengths = {key: length for key, kind, length in rows if kind == "list"}
+        return {key: kind for key, kind, _ in rows}
+
+    def load_value(self, key: str) -> Any:
+        row = self.conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def load_list(self, key: str) -> List[Any]:
+        cursor = self.conn.execute("SELECT value FROM list_items WHERE key = ? ORDER BY seq", (key,))
+        return [json.loads(row[0]) for row in cursor]
+
+    def list_length(self, key: str) -> int:
+        return self._length(key)
+
+    def set_value(self, key: str, value: Any):
+        self.conn.execute(
+            "INSERT INTO state (key, kind, value, length) VALUES (?, 'value', ?, 0) "
+            "ON CONFLICT(key) DO UPDATE SET kind = 'value', value = excluded.value, length = 0",
+            (key, self._dump(value))
+        )
+        self.conn.execute("DELETE FROM list_items WHERE key = ?", (key,))
+        self._lengths.pop(key, None)
+        self._written()
+
+    def set_list(self, key: str, values: List[Any]):
+        self.conn.execute("DELETE FROM list_items WHERE key = ?", (key,))
+        self.conn.executemany(
+            "INSERT INTO list_items (key, seq, value) VALUES (?, ?, ?)",
+            ((key, seq, self._dump(v)) for seq, v in enumerate(values))
+        )
+        self._set_length(key, len(values))
+        self._written(max(1, len(values)))
+
+    def append(self, key: str, value: Any):
+        self.extend(key, [value])
+
+    def extend(self, key: str, values: List[Any]):
+        if not values:
+            return
+        start = self._length(key)
+        self.conn.executemany(
+            "INSERT INTO list_items (key, seq, value) VALUES (?, ?, ?)",
+            ((key, start + i, self._dump(v)) for i, v in enumerate(values))
+        )
+        self._set_length(key, start + len(values))
+        self._written(len(values))
+
+    def _length(self, key: str) -> int:
+        if key not in self._lengths:
+            row = self.conn.execute("SELECT length FROM state WHERE key = ? AND kind = 'list'", (key,)).fetchone()
+            self._lengths[key] = row[0] if row else 0
+        return self._lengths[key]
+
+    def _set_length(self, key: str, length: int):
+        self.conn.execute(
+            "INSERT INTO state (key, kind, value, length) VALUES (?, 'list', NULL, ?) "
+            "ON CONFLICT(key) DO UPDATE SET kind = 'list', value = NULL, length = excluded.length",
+            (key, length)
+        )
+        self._lengths[key] = length
+
+    def commit(self):
+        self.conn.commit()
+        self._uncommitted = 0
+
+    def snapshot(self) -> Optional[str]:
+        """
+        Copies a consistent image of the database to the snapshot directory using
+        SQLite's online backup API and prunes old snapshots.
+        """
+        self.commit()
+        if not os.path.exists(self.snapshot_dir):
+            os.makedirs(self.snapshot_dir)
+        stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(self.snapshot_dir, f"engine_state-{stamp}.db")
+        target = sqlite3.connect(path)
+        try:
+            self.conn.backup(target)
+        finally:
+            target.close()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        snapshots = sorted(n for n in os.listdir(self.snapshot_dir) if n.startswith("engine_state-"))
+        if self.snapshot_retention > 0:
+            for name in snapshots[:-self.snapshot_retention]:
+                os.remove(os.path.join(self.snapshot_dir, name))
+        return path
+
+    def close(self):
+        self.commit()
+        self.conn.close()
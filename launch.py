@@ -1,4 +1,5 @@
 import asyncio
+import os
 import sys
 from core.orchestrator import MasterOrchestrator
 from agents.digital_asset_engine import DigitalAssetEngine
@@ -9,6 +10,9 @@ from agents.governance_risk_engine import GovernanceRiskEngine
 from agents.analytics_dashboard_engine import AnalyticsDashboardEngine
 from core.optimization_engine import StrategicReallocationEngine
 from core.phase_manager import BudgetPhaseManager
+from core.pipeline import Pipeline
+from core.ingestion import LeadIngestionService
+from core.dashboard_server import DashboardServer
 
 async def production_launch():
     print("\n🚀 --- Manokamana Solar Agentic Engine: PRODUCTION LAUNCH --- 🚀\n")
@@ -28,27 +32,51 @@ async def production_launch():
     # 1. Initial High-Priority Cycle (SEO -> Content -> Publish)
     print("\n[Launch] Running initial high-priority SEO and Content cycle...")
     
-    # Analyze SEO Trends
-    await orchestrator.run_node("NODE_2")
-    
-    # Pick a high-priority topic and generate content
+    # Analyze SEO Trends while the content chain runs
     topic = "Industrial Solar Subsidy 2026 India"
-    content_output = await orchestrator.run_node("NODE_3", {"topic": topic, "platform": "blog"})
-    
+    pipeline = Pipeline("launch")
+    pipeline.add_step("seo", "NODE_2")
+    pipeline.add_step("content", "NODE_3", inputs={"topic": topic, "platform": "blog"})
+
     # Governance Gate
-    risk_output = await orchestrator.run_node("NODE_5", {"content": content_output.data["draft"], "type": "blog"})
-    
-    if risk_output.metadata.get("status") == "cleared":
-        await orchestrator.run_node("NODE_1", {
-            "action": "publish_blog", 
-            "content_draft": {"title": topic, "draft": content_output.data["draft"]}
-        })
-        await orchestrator.run_node("NODE_1", {"action": "deploy_site"})
+    pipeline.add_step("risk", "NODE_5", inputs={"type": "blog"}, edges={"content": "content.draft"})
+    pipeline.add_step(
+        "publish", "NODE_1",
+        inputs={"action": "publish_blog", "content_draft": {"title": topic}},
+        edges={"content_draft.draft": "content.draft"},
+        after=["risk"],
+        when=lambda results: results["risk"].metadata.get("status") == "cleared"
+    )
+    pipeline.add_step(
+        "deploy", "NODE_1",
+        inputs={"action": "deploy_site"},
+        after=["publish"],
+        when=lambda results: results["publish"].metadata.get("status") == "published"
+    )
+    await orchestrator.run_pipeline(pipeline)
     
     print("\n[Launch] Initial cycle complete. Entering scheduled background loop.")
     print("Press Ctrl+C to stop the engine.\n")
 
-    # 2. Enter Continuous Intelligence Loop
+    # 2. Lead Ingestion (drop directory + HTTP endpoint) feeding NODE_4 workers
+    config = orchestrator.config
+    ingestion = LeadIngestionService(
+        orchestrator,
+        workers=config.get_int("LEAD_INGEST_WORKERS", 4),
+        queue_size=config.get_int("LEAD_INGEST_QUEUE_SIZE", 1000),
+        inbox_dir=config.get("LEAD_INBOX_DIR", os.path.join(orchestrator.data_dir, "inbox")),
+        drain_timeout=float(config.get("LEAD_INGEST_DRAIN_SECONDS", "10"))
+    )
+    await ingestion.start(config.get("LEAD_INGEST_HOST", "127.0.0.1"), config.get_int("LEAD_INGEST_PORT", 8081))
+
+    # 3. Live dashboard (summary with ETag, paged leads, SSE updates) served from public/
+    dashboard = DashboardServer(
+        orchestrator.memory,
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "public")
+    )
+    await dashboard.start(config.get("DASHBOARD_HOST", "127.0.0.1"), config.get_int("DASHBOARD_PORT", 8080))
+
+    # 4. Enter Continuous Intelligence Loop
     try:
         await orchestrator.start_scheduled_loop()
     except KeyboardInterrupt:
@@ -57,6 +85,10 @@ async def production_launch():
     except Exception as e:
         print(f"\n[Launch] Critical Error: {e}")
         orchestrator.stop()
+    finally:
+        await dashboard.stop()
+        await ingestion.stop()
+        await orchestrator.shutdown()
 
 if __name__ == "__main__":
     try:
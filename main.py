@@ -10,6 +10,57 @@ from agents.carbon_reporting_engine import CarbonReportingEngine
 from agents.social_distribution_swarm import SocialDistributionSwarm
 from core.optimization_engine import StrategicReallocationEngine
 from core.phase_manager import BudgetPhaseManager
+from core.pipeline import Pipeline
+
+def build_simulation_pipeline(topic: str, leads: list) -> Pipeline:
+    """
+    Declares the full engine cycle as a DAG. SEO analysis runs beside the
+    content chain; lead processing waits for the risk check, as every node
+    after it is gated on the risk score NODE_5 sets.
+    """
+    pipeline = Pipeline("simulation")
+
+    # 1. SEO Intelligence
+    pipeline.add_step("seo", "NODE_2")
+
+    # 2. Content Generation -> Risk Check -> Publish -> Deploy
+    pipeline.add_step("content", "NODE_3", inputs={"topic": topic, "platform": "blog"})
+    pipeline.add_step("risk", "NODE_5", inputs={"type": "blog"}, edges={"content": "content.draft"})
+    pipeline.add_step(
+        "publish", "NODE_1",
+        inputs={"action": "publish_blog", "content_draft": {"title": topic}},
+        edges={"content_draft.draft": "content.draft"},
+        after=["risk"],
+        when=lambda results: results["risk"].metadata.get("status") == "cleared"
+    )
+    pipeline.add_step("deploy", "NODE_1", inputs={"action": "deploy_site"}, after=["publish"])
+
+    # 3. Lead Processing, with a Carbon Report (NODE_9) for every Tier A lead.
+    # Leads run after the risk check so the orchestrator's risk gate sees its verdict
+    lead_steps = []
+    for i, lead in enumerate(leads):
+        lead_step = f"lead_{i}"
+        lead_steps.append(lead_step)
+        pipeline.add_step(lead_step, "NODE_4", inputs={"lead": lead}, after=["risk"])
+        pipeline.add_step(
+            f"carbon_{i}", "NODE_9",
+            inputs={"lead": {"name": lead["name"]}},
+            edges={"roi_results": lead_step},
+            when=lambda results, step=lead_step: results[step].metadata.get("score") == "A"
+        )
+
+    # 4. Phase Transition, Analytics and Optimization
+    pipeline.add_step("phase", "NODE_8", after=lead_steps)
+    pipeline.add_step("analytics", "NODE_6", after=["phase", "deploy"])
+    # NODE_7 rewrites the topic weights NODE_2 reads, so it waits for SEO analysis
+    pipeline.add_step("optimize", "NODE_7", after=lead_steps + ["seo"])
+
+    # 5. Marketing Swarm
+    pipeline.add_step("social", "NODE_10", after=lead_steps + ["deploy"])
+
+    # 6. Governance re-audit of everything published, including new drafts
+    pipeline.add_step("audit", "NODE_5", inputs={"mode": "audit"}, after=["social", "publish"])
+    return pipeline
 
 async def main():
     orchestrator = MasterOrchestrator()
@@ -28,68 +79,30 @@ async def main():
 
     print("\n--- Starting Manokamana Solar Agentic Engine Simulation ---\n")
 
-    # 1. SEO Intelligence
-    print("\nStep 1: SEO Analysis")
-    await orchestrator.run_node("NODE_2")
-
-    # 2. Content Generation with Risk Check
-    print("\nStep 2: Content Generation and Publishing")
     topic = "Solar ROI for Industrial Clients"
-    # Execute Content Engine (NODE_3)
-    content_output = await orchestrator.run_node("NODE_3", {"topic": topic, "platform": "blog"})
-    draft_data = content_output.data # {draft, platform, topic}
-    
-    # Execute Risk Check (NODE_5)
-    risk_output = await orchestrator.run_node("NODE_5", {"content": draft_data["draft"], "type": "blog"})
-    
-    # If safe, publish via Digital Asset Engine (NODE_1)
-    if risk_output.metadata["status"] == "cleared":
-        print("[Simulation] Content cleared by Governance. Publishing...")
-        publish_input = {
-            "action": "publish_blog",
-            "content_draft": {
-                "title": topic,
-                "draft": draft_data["draft"]
-            }
+    leads = [
+        {
+            "name": f"Industrial Client {i}",
+            "roof_size": 25000,
+            "electricity_bill": 150000,
+            "operation_type": "manufacturing"
         }
-        await orchestrator.run_node("NODE_1", publish_input)
-    else:
-        print("[Simulation] Content blocked by Governance.")
+        for i in range(6)  # Simulate 6 leads to trigger Phase 2
+    ]
 
-    print("\nStep 3: Site Deployment")
-    await orchestrator.run_node("NODE_1", {"action": "deploy_site"})
-    
-    # 3. Lead Processing and Phase Transition
-    print("\nStep 4: Lead Processing and Phase Transition Simulation")
-    # Simulate 6 leads to trigger Phase 2
-    for i in range(6):
-        # NODE_4 Processes lead and puts it in memory
-        lead_result = await orchestrator.run_node("NODE_4", {
-            "lead": {
-                "name": f"Industrial Client {i}",
-                "roof_size": 25000,
-                "electricity_bill": 150000,
-                "operation_type": "manufacturing"
-            }
-        })
+    pipeline = build_simulation_pipeline(topic, leads)
+    results = await orchestrator.run_pipeline(pipeline)
 
-        # Step 4.2: If Tier A, Generate Carbon Environmental Report (NODE_9)
-        if lead_result.metadata.get("score") == "A":
-            await orchestrator.run_node("NODE_9", {
-                "lead": {"name": f"Industrial Client {i}"},
-                "roi_results": lead_result.data
-            })
-    
-    await orchestrator.run_node("NODE_8") # Check phase
-
-    # 4. Analytics and Optimization
-    print("\nStep 5: Final Analytics and Optimization")
-    await orchestrator.run_node("NODE_6")
-    await orchestrator.run_node("NODE_7")
+    verdict = results["risk"].metadata.get("status")
+    publish_status = results["publish"].metadata.get("status")
+    if verdict != "cleared":
+        print(f"[Simulation] Content held by Governance ({verdict}).")
+    elif publish_status == "published":
+        print("[Simulation] Content cleared by Governance and published.")
+    else:
+        print(f"[Simulation] Content cleared by Governance but not published ({publish_status}).")
 
-    # 5. Marketing Swarm
-    print("\nStep 6: Social Distribution Swarm")
-    await orchestrator.run_node("NODE_10")
+    await orchestrator.shutdown()
 
     print("\n--- Simulation Complete ---\n")
 
@@ -1,20 +1,23 @@
 /**
  * Manokamana Solar Agentic Engine - Frontend Controller
- * Responsible for fetching data from the local engine folders (reports/ and content/blogs/)
+ * Dashboard data comes from the engine's dashboard server (/api/*); blog listings
+ * come from the precomputed post index in blog/posts/.
  */
 
+const LEAD_PAGE_SIZE = 25;
+let summaryState = {};
+let summaryEtag = null;
+
 document.addEventListener('DOMContentLoaded', () => {
     initApp();
-    loadDashboardStats();
-    loadLeadTable();
     loadBlogInsights();
 
-    // Auto-refresh dashboard every 30 seconds
     if (window.location.pathname.includes('dashboard.html')) {
-        setInterval(() => {
-            loadDashboardStats();
-            loadLeadTable();
-        }, 30000);
+        loadDashboardStats();
+        loadLeadTable();
+        // New leads and changed counters are pushed; the poll is only a cheap ETag check
+        connectStream();
+        setInterval(loadDashboardStats, 30000);
     }
 });
 
@@ -58,105 +61,156 @@ function initApp() {
 
 async function loadDashboardStats() {
     try {
-        const response = await fetch('../reports/system_summary.json');
-        if (!response.ok) return;
-        const data = await response.json();
+        const headers = summaryEtag ? { 'If-None-Match': summaryEtag } : {};
+        const response = await fetch('/api/summary', { headers });
+        if (response.status === 304 || !response.ok) return;
+        summaryEtag = response.headers.get('ETag');
+        renderStats(await response.json());
+    } catch (e) {
+        console.log("Stats not available yet.");
+    }
+}
 
-        document.getElementById('stat-total-leads').innerText = data.total_leads || 0;
+function renderStats(changes) {
+    // Stream updates carry only the fields that changed
+    summaryState = { ...summaryState, ...changes };
+    const data = summaryState;
 
-        // Accessing tier_counts based on actual JSON structure
-        const tierA = data.tier_counts ? data.tier_counts.A : 0;
-        document.getElementById('stat-tier-a').innerText = tierA || 0;
+    document.getElementById('stat-total-leads').innerText = data.total_leads || 0;
 
-        const co2 = data.total_co2_offset || 0.0;
-        document.getElementById('stat-co2').innerText = `${co2.toFixed(1)}t`;
+    const tierA = data.tier_counts ? data.tier_counts.A : 0;
+    document.getElementById('stat-tier-a').innerText = tierA || 0;
 
-        document.getElementById('stat-phase').innerText = data.published_assets_count > 0 ? 'PHASE 2: OPTIMIZING' : 'PHASE 1: INITIALIZING';
+    const co2 = data.total_co2_offset || 0.0;
+    document.getElementById('stat-co2').innerText = `${co2.toFixed(1)}t`;
 
-        const health = data.current_risk_health === 'Healthy' ? 100 : 85;
-        const healthElement = document.getElementById('stat-health');
-        if (healthElement) healthElement.innerText = `${health}%`;
+    document.getElementById('stat-phase').innerText = data.published_assets_count > 0 ? 'PHASE 2: OPTIMIZING' : 'PHASE 1: INITIALIZING';
 
-        const lastUpdated = document.getElementById('last-updated');
-        if (lastUpdated) {
-            lastUpdated.innerText = `LAST SYNC: ${new Date().toLocaleTimeString()}`;
-        }
-    } catch (e) {
-        console.log("Stats not available yet.");
+    const health = data.current_risk_health === 'Healthy' ? 100 : 85;
+    const healthElement = document.getElementById('stat-health');
+    if (healthElement) healthElement.innerText = `${health}%`;
+
+    const lastUpdated = document.getElementById('last-updated');
+    if (lastUpdated) {
+        lastUpdated.innerText = `LAST SYNC: ${new Date().toLocaleTimeString()}`;
     }
 }
 
+function leadCell(tr, text, style) {
+    // Lead fields come from form and file input: always set them as text
+    const td = document.createElement('td');
+    td.style.cssText = `padding: 24px;${style || ''}`;
+    if (text !== undefined) td.textContent = text;
+    tr.appendChild(td);
+    return td;
+}
+
+function formatTimestamp(value) {
+    // Lead timestamps are UTC ISO strings; show them in the viewer's local time
+    const date = new Date(value);
+    return Number.isNaN(date.getTime()) ? value : date.toLocaleString();
+}
+
+function renderLeadRow(lead) {
+    const score = lead.score;
+    const priority = score === 'A';
+    const co2 = Number(lead.co2_offset || 0).toFixed(1);
+    const tr = document.createElement('tr');
+    tr.dataset.leadId = lead.id;
+    leadCell(tr, formatTimestamp(lead.timestamp));
+    leadCell(tr, lead.industry, ' text-transform: uppercase; font-size: 0.8rem;');
+
+    const tier = document.createElement('span');
+    tier.style.cssText = `color: ${priority ? 'var(--accent)' : '#fff'}; font-weight: 700;`;
+    tier.textContent = score;
+    leadCell(tr).appendChild(tier);
+
+    leadCell(tr, `${co2}t CO2`);
+
+    const routing = document.createElement('span');
+    routing.style.cssText = `padding: 4px 12px; border-radius: 20px; font-size: 0.75rem; font-weight: 600; background: ${priority ? 'rgba(255, 180, 0, 0.1)' : 'rgba(255,255,255,0.05)'}; color: ${priority ? 'var(--accent)' : 'var(--text-secondary)'};`;
+    routing.textContent = priority ? 'PRIORITY ROUTING' : 'NURTURING';
+    leadCell(tr).appendChild(routing);
+    return tr;
+}
+
 async function loadLeadTable() {
     try {
-        const response = await fetch('../reports/leads_detailed.csv');
+        // One page, newest first; the server pages through its sort index
+        const response = await fetch(`/api/leads?page=1&size=${LEAD_PAGE_SIZE}&sort=timestamp&order=desc`);
         if (!response.ok) return;
-        const csvText = await response.text();
-        const rows = csvText.split('\n').filter(r => r.trim()).slice(1); // Skip header and empty rows
+        const data = await response.json();
 
         const tbody = document.getElementById('lead-table-body');
         if (!tbody) return;
 
         tbody.innerHTML = '';
-        if (rows.length === 0) {
+        if (data.leads.length === 0) {
             tbody.innerHTML = '<tr><td colspan="4" style="padding: 40px; text-align: center; color: var(--text-secondary);">No leads captured in current cycle.</td></tr>';
             return;
         }
-
-        rows.forEach(row => {
-            const columns = row.split(',');
-            if (columns.length < 5) return; // Expecting more columns now
-
-            const [timestamp, score, capex, industry, co2] = columns;
-            const tr = document.createElement('tr');
-            tr.innerHTML = `
-                <td style="padding: 24px;">${timestamp}</td>
-                <td style="padding: 24px; text-transform: uppercase; font-size: 0.8rem;">${industry}</td>
-                <td style="padding: 24px;"><span style="color: ${score === 'A' ? 'var(--accent)' : '#fff'}; font-weight: 700;">${score}</span></td>
-                <td style="padding: 24px;">${co2}t CO2</td>
-                <td style="padding: 24px;">
-                    <span style="padding: 4px 12px; border-radius: 20px; font-size: 0.75rem; font-weight: 600; background: ${score === 'A' ? 'rgba(255, 180, 0, 0.1)' : 'rgba(255,255,255,0.05)'}; color: ${score === 'A' ? 'var(--accent)' : 'var(--text-secondary)'};">
-                        ${score === 'A' ? 'PRIORITY ROUTING' : 'NURTURING'}
-                    </span>
-                </td>
-            `;
-            tbody.appendChild(tr);
-        });
+        data.leads.forEach(lead => tbody.appendChild(renderLeadRow(lead)));
     } catch (e) {
         console.log("Lead data not available yet.");
     }
 }
 
+function connectStream() {
+    if (!window.EventSource) return;
+    // EventSource reconnects by itself; the first event is always the full summary
+    const stream = new EventSource('/api/stream');
+
+    stream.addEventListener('summary', (event) => renderStats(JSON.parse(event.data)));
+
+    stream.addEventListener('lead', (event) => {
+        const tbody = document.getElementById('lead-table-body');
+        if (!tbody) return;
+        if (!tbody.querySelector('tr[data-lead-id]')) tbody.innerHTML = '';
+        tbody.insertBefore(renderLeadRow(JSON.parse(event.data)), tbody.firstChild);
+        while (tbody.children.length > LEAD_PAGE_SIZE) tbody.removeChild(tbody.lastChild);
+    });
+}
+
 async function loadBlogInsights() {
     const container = document.getElementById('blog-container');
     if (!container) return;
 
     try {
-        const blogs = ['solar-roi-for-industrial-clients'];
-        container.innerHTML = '';
-
-        for (const slug of blogs) {
-            const response = await fetch(`../content/blogs/${slug}.md`);
-            if (!response.ok) continue;
-            const text = await response.text();
-
-            // Simplified extraction for the simulation
-            const titleMatch = text.match(/# (.*)/);
-            const contentMatch = text.split('\n').slice(5, 10).join(' '); // Skip frontmatter
+        // Precomputed by the site build: newest posts first, no Markdown parsing needed
+        const response = await fetch('blog/posts/index.json');
+        if (!response.ok) return;
+        const index = await response.json();
+        const posts = (index.latest || []).slice(0, 6);
+        if (posts.length === 0) return;
 
+        container.innerHTML = '';
+        for (const post of posts) {
             const card = document.createElement('div');
             card.className = 'glass blog-card fade-in';
-            card.innerHTML = `
-                <div class="date">High Authority Report</div>
-                <h2>${titleMatch ? titleMatch[1] : 'Autonomous Insight'}</h2>
-                <p style="margin-top: 16px; color: var(--text-secondary);">
-                    ${contentMatch ? contentMatch.substring(0, 250) + '...' : 'Analysis in progress...'}
-                </p>
-                <div style="margin-top: 24px;">
-                    <a href="blog.html?slug=${slug}" style="color: var(--accent); text-decoration: none; font-weight: 600; font-size: 0.9rem;">Read Full Analysis →</a>
-                </div>
-            `;
+            // Titles and dates come from post front matter: set them as text
+            const date = document.createElement('div');
+            date.className = 'date';
+            date.textContent = post.date || 'High Authority Report';
+            const title = document.createElement('h2');
+            title.textContent = post.title || 'Autonomous Insight';
+            const footer = document.createElement('div');
+            footer.style.marginTop = '24px';
+            const link = document.createElement('a');
+            link.href = `blog/${encodeURIComponent(post.slug)}.html`;
+            link.style.cssText = 'color: var(--accent); text-decoration: none; font-weight: 600; font-size: 0.9rem;';
+            link.textContent = 'Read Full Analysis →';
+            footer.appendChild(link);
+            card.append(date, title, footer);
             container.appendChild(card);
         }
+
+        if (index.total > posts.length) {
+            const more = document.createElement('a');
+            more.href = 'blog/index.html';
+            more.style.cssText = 'color: var(--accent); text-decoration: none; font-weight: 600;';
+            more.innerText = `All ${index.total} insights →`;
+            container.appendChild(more);
+        }
     } catch (e) {
         console.log("Blogs not available yet.");
     }
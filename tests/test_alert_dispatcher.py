@@ -0,0 +1,80 @@
+import asyncio
+import json
+from aiohttp import web
+from core.alert_dispatcher import SlackAlertDispatcher
+
+async def start_stub(handler):
+    app = web.Application()
+    app.router.add_post("/api/chat.postMessage", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/api"
+
+def test_rate_limited_and_failed_sends_are_retried(tmp_path):
+    received = []
+    responses = [
+        web.Response(status=429, headers={"Retry-After": "0"}),
+        web.json_response({"ok": False, "error": "internal_error"}, status=500),
+    ]
+
+    async def handler(request):
+        received.append((await request.json())["text"])
+        return responses.pop(0) if responses else web.json_response({"ok": True})
+
+    async def scenario():
+        runner, base_url = await start_stub(handler)
+        dispatcher = SlackAlertDispatcher("token", base_url=base_url, rate_per_minute=6000, backoff_base=0.01,
+                                          retry_path=str(tmp_path / "retries.json"))
+        dispatcher.enqueue("lead A")
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if dispatcher.stats["sent"]:
+                break
+        await dispatcher.close(timeout=1.0)
+        await runner.cleanup()
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+    assert received == ["lead A"] * 3
+    assert dispatcher.stats["sent"] == 1 and dispatcher.stats["retried"] == 2
+    assert json.loads((tmp_path / "retries.json").read_text()) == []
+
+def test_in_flight_alert_is_persisted_on_shutdown(tmp_path):
+    retry_path = str(tmp_path / "retries.json")
+
+    async def scenario():
+        request_seen = asyncio.Event()
+        release = asyncio.Event()
+
+        async def hang(request):
+            request_seen.set()
+            await release.wait()
+            return web.json_response({"ok": True})
+
+        runner, base_url = await start_stub(hang)
+        dispatcher = SlackAlertDispatcher("token", base_url=base_url, retry_path=retry_path)
+        dispatcher.enqueue("lead B")
+        await asyncio.wait_for(request_seen.wait(), 5)
+        await dispatcher.close(timeout=0.1)
+        release.set()
+        await runner.cleanup()
+
+        saved = json.loads(open(retry_path).read())
+        assert [entry["text"] for entry in saved] == ["lead B"]
+
+        # The next start picks it up again
+        sent = []
+
+        async def ok(request):
+            sent.append((await request.json())["text"])
+            return web.json_response({"ok": True})
+
+        runner, base_url = await start_stub(ok)
+        restarted = SlackAlertDispatcher("token", base_url=base_url, retry_path=retry_path)
+        await restarted.close(timeout=2.0)
+        await runner.cleanup()
+        return sent
+
+    assert asyncio.run(scenario()) == ["lead B"]
@@ -0,0 +1,76 @@
+import asyncio
+from agents.authority_content_engine import AuthorityContentEngine
+from core.config_loader import ConfigLoader
+from core.content_templates import ContentTemplates
+from core.memory import GlobalMemory
+
+def make_node(tmp_path, monkeypatch, concurrency=2, timeout=1):
+    monkeypatch.setenv("ENGINE_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("CONTENT_FANOUT_CONCURRENCY", str(concurrency))
+    monkeypatch.setenv("CONTENT_FANOUT_TIMEOUT_SECONDS", str(timeout))
+    node = AuthorityContentEngine()
+    node.set_memory(GlobalMemory())
+    node.set_config(ConfigLoader(env_path="/nonexistent/.env"))
+    # Any client counts as live; generation itself is replaced per test
+    node.client = object()
+    return node
+
+def platform_of(request):
+    return request["messages"][1]["content"].split()[3]
+
+def test_fanout_never_exceeds_the_concurrency_cap(tmp_path, monkeypatch):
+    node = make_node(tmp_path, monkeypatch, concurrency=2)
+    active, peak = [0], [0]
+
+    async def generate(request):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.02)
+        active[0] -= 1
+        return f"draft for {platform_of(request)}"
+    node._generate = generate
+
+    output = asyncio.run(node.run({"topic": "Solar ROI", "platforms": "all"}))
+    assert output.metadata["platforms"] == list(ContentTemplates.TEMPLATES)
+    assert set(output.metadata["modes"].values()) == {"live"}
+    assert peak[0] == 2
+    assert "draft for linkedin" in output.data["platforms"]["linkedin"]["draft"]
+
+def test_one_failing_or_slow_platform_does_not_fail_the_pack(tmp_path, monkeypatch):
+    node = make_node(tmp_path, monkeypatch, concurrency=5, timeout=1)
+
+    async def generate(request):
+        platform = platform_of(request)
+        if platform == "instagram":
+            raise RuntimeError("rate limited")
+        if platform == "facebook":
+            await asyncio.sleep(30)
+        return f"draft for {platform}"
+    node._generate = generate
+
+    async def scenario():
+        started = asyncio.get_running_loop().time()
+        output = await node.run({"topic": "Solar ROI", "platforms": ["linkedin", "instagram", "facebook", "linkedin"]})
+        return output, asyncio.get_running_loop().time() - started
+
+    output, elapsed = asyncio.run(scenario())
+    assert output.metadata["status"] == "content_pack_generated"
+    # Duplicates collapse; the failed and timed-out platforms fall back to mock drafts
+    assert output.metadata["modes"] == {"linkedin": "live", "instagram": "mock", "facebook": "mock"}
+    assert "(Mock Mode)" in output.data["platforms"]["facebook"]["draft"]
+    assert "draft for linkedin" in output.data["platforms"]["linkedin"]["draft"]
+    assert elapsed < 5
+
+def test_unknown_platforms_are_rejected_before_any_generation(tmp_path, monkeypatch):
+    node = make_node(tmp_path, monkeypatch)
+    calls = []
+
+    async def generate(request):
+        calls.append(request)
+        return "draft"
+    node._generate = generate
+
+    output = asyncio.run(node.run({"topic": "Solar ROI", "platforms": ["linkedin", "myspace"]}))
+    assert output.metadata["status"] == "error" and "myspace" in output.metadata["message"]
+    assert asyncio.run(node.run({"topic": "Solar ROI", "platforms": []})).metadata["status"] == "error"
+    assert calls == []
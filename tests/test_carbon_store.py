@@ -0,0 +1,19 @@
+import os
+from core.carbon_store import CarbonReportStore
+
+def test_export_keeps_external_ids_inside_the_export_dir(tmp_path):
+    store = CarbonReportStore(str(tmp_path / "store"))
+    export_dir = tmp_path / "exports"
+    hostile = "../../etc/passwd"
+    store.put({"entity_name": "Acme"}, report_id=hostile)
+    generated = store.put({"entity_name": "Acme Mills"})
+    store.flush()
+
+    path = store.export(hostile, str(export_dir))
+    assert os.path.dirname(path) == str(export_dir)
+    assert os.path.basename(path).startswith("carbon_report_etc_passwd-")
+    assert not (tmp_path / "etc").exists()
+    # Generated ids are already safe and keep their readable file name
+    assert os.path.basename(store.export(generated, str(export_dir))) == f"carbon_report_{generated}.json"
+    assert CarbonReportStore.export_name("a/b") != CarbonReportStore.export_name("a\\b")
+    store.close()
@@ -0,0 +1,48 @@
+import asyncio
+import os
+from core.content_audit import ContentAuditor
+from core.rule_engine import RuleSet
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "governance_rules.json")
+
+def test_undecodable_files_are_reported_not_fatal(tmp_path):
+    blogs = tmp_path / "content" / "blogs"
+    blogs.mkdir(parents=True)
+    (blogs / "good.md").write_text("Rooftop solar for textile mills.")
+    (blogs / "latin1.md").write_bytes("Caf\xe9 rooftop".encode("latin-1"))
+    social = tmp_path / "content" / "social"
+    social.mkdir()
+    (social / "broken.json").write_bytes(b"\xff\xfe[")
+
+    auditor = ContentAuditor(str(tmp_path / "content"), str(tmp_path / "cache.json"))
+    report = asyncio.run(auditor.audit(RuleSet.load(RULES_PATH), RULES_PATH))
+    assert report["summary"]["unreadable"] == 2
+    assert report["summary"]["assets"] == 3
+    statuses = {row["asset"]: row["status"] for row in report["assets"]}
+    assert statuses[os.path.join("blogs", "latin1.md")] == "unreadable"
+    assert statuses[os.path.join("social", "broken.json")] == "unreadable"
+    assert statuses[os.path.join("blogs", "good.md")] == "cleared"
+
+def test_audits_reuse_one_pool(tmp_path):
+    blogs = tmp_path / "content" / "blogs"
+    blogs.mkdir(parents=True)
+    for i in range(4):
+        (blogs / f"post-{i}.md").write_text(f"Post {i}: guaranteed 100% returns")
+    rules = RuleSet.load(RULES_PATH)
+    auditor = ContentAuditor(str(tmp_path / "content"), str(tmp_path / "cache.json"),
+                             workers=2, batch_size=2, inline_below=0)
+
+    async def run():
+        first = await auditor.audit(rules, RULES_PATH)
+        pool = auditor._pool
+        (blogs / "post-0.md").write_text("Edited post")
+        second = await auditor.audit(rules, RULES_PATH)
+        return first, second, pool
+
+    try:
+        first, second, pool = asyncio.run(run())
+        assert first["summary"]["scanned"] == 4 and second["summary"]["scanned"] == 1
+        assert auditor._pool is pool
+    finally:
+        auditor.close()
+    assert auditor._pool is None
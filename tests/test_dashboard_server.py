@@ -0,0 +1,93 @@
+import asyncio
+import json
+import socket
+import aiohttp
+from core.dashboard_server import DashboardServer
+from core.memory import GlobalMemory
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def lead(score: str = "A") -> dict:
+    return {"timestamp": "2026-03-01T10:00:00", "score": score, "capex": 1500000.0,
+            "industry": "textile", "co2_offset": 12.5, "routing": "Sales Dashboard"}
+
+async def serve(tmp_path, memory):
+    server = DashboardServer(memory, str(tmp_path), summary_debounce=0.01, keepalive_seconds=0.05)
+    port = free_port()
+    await server.start(port=port)
+    return server, f"http://127.0.0.1:{port}"
+
+def test_unchanged_summary_and_lead_pages_cost_a_304(tmp_path):
+    async def scenario():
+        memory = GlobalMemory()
+        memory.append_to_list("lead_quality", lead())
+        server, base = await serve(tmp_path, memory)
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{base}/api/summary") as resp:
+                    assert resp.status == 200
+                    etag = resp.headers["ETag"]
+                    assert (await resp.json())["total_leads"] == 1
+                async with session.get(f"{base}/api/summary", headers={"If-None-Match": etag}) as resp:
+                    assert resp.status == 304
+                    assert resp.headers["ETag"] == etag
+
+                async with session.get(f"{base}/api/leads?size=10") as resp:
+                    lead_etag = resp.headers["ETag"]
+                    assert [row["id"] for row in (await resp.json())["leads"]] == [0]
+                async with session.get(f"{base}/api/leads?size=10", headers={"If-None-Match": lead_etag}) as resp:
+                    assert resp.status == 304
+
+                memory.append_to_list("lead_quality", lead("B"))
+                await asyncio.sleep(0.1)
+                async with session.get(f"{base}/api/summary", headers={"If-None-Match": etag}) as resp:
+                    assert resp.status == 200
+                    assert resp.headers["ETag"] != etag
+                    assert (await resp.json())["tier_counts"] == {"A": 1, "B": 1, "C": 0}
+                async with session.get(f"{base}/api/leads?size=10", headers={"If-None-Match": lead_etag}) as resp:
+                    assert resp.status == 200
+                    assert (await resp.json())["total"] == 2
+        finally:
+            await server.stop()
+
+    asyncio.run(scenario())
+
+def test_stream_pushes_new_leads_and_changed_counters(tmp_path):
+    async def read_event(resp):
+        while True:
+            block = (await asyncio.wait_for(resp.content.readuntil(b"\n\n"), 2)).decode()
+            if not block.startswith(":"):
+                event, data = block.strip().split("\n", 1)
+                return event[len("event: "):], json.loads(data[len("data: "):])
+
+    async def scenario():
+        memory = GlobalMemory()
+        server, base = await serve(tmp_path, memory)
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{base}/api/stream") as resp:
+                    assert resp.headers["Content-Type"] == "text/event-stream"
+                    event, summary = await read_event(resp)
+                    assert event == "summary" and summary["total_leads"] == 0
+
+                    memory.extend_list("lead_quality", [lead(), lead("C")])
+                    events = [await read_event(resp) for _ in range(3)]
+                    assert events[0] == ("lead", {"id": 0, **lead()})
+                    assert events[1] == ("lead", {"id": 1, **lead("C")})
+                    event, changed = events[2]
+                    # One debounced update with only the counters that moved
+                    assert event == "summary"
+                    assert changed["total_leads"] == 2 and changed["tier_counts"] == {"A": 1, "B": 0, "C": 1}
+                    assert "published_assets_count" not in changed
+
+                    # Stopping the server ends open streams
+                    await server.stop()
+                    await asyncio.wait_for(resp.content.read(), 2)
+                    assert resp.content.at_eof()
+        finally:
+            await server.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,70 @@
+import json
+import core.generation_cache as generation_cache
+from core.generation_cache import GenerationCache
+
+class FakeTime:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+def make_cache(tmp_path, monkeypatch, **options):
+    clock = FakeTime()
+    monkeypatch.setattr(generation_cache, "time", clock)
+    return GenerationCache(str(tmp_path / "cache"), **options), clock
+
+def test_entries_go_fresh_then_stale_then_expire(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl_seconds=60, stale_seconds=120)
+    key = GenerationCache.key(prompt="solar roi", model="m")
+    cache.put(key, {"text": "draft"})
+
+    assert cache.get(key) == ({"text": "draft"}, "fresh")
+    clock.now += 61
+    # Stale entries are still served so the caller can revalidate in the background
+    assert cache.get(key) == ({"text": "draft"}, "stale")
+    cache.put(key, {"text": "revalidated"})
+    assert cache.get(key) == ({"text": "revalidated"}, "fresh")
+    clock.now += 181
+    assert cache.get(key) == (None, "miss")
+    assert len(cache) == 0 and not (tmp_path / "cache" / f"{key}.json").exists()
+    assert cache.stats == {"hits": 2, "stale_hits": 1, "misses": 1, "writes": 2, "evictions": 0}
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    for name in ("a", "b", "c"):
+        cache.put(name, "x" * 100)
+    cache.max_bytes = cache.size_bytes
+    cache.get("a")
+    cache.put("d", "x" * 100)
+
+    assert cache.get("b") == (None, "miss")
+    assert [cache.get(name)[1] for name in ("a", "c", "d")] == ["fresh"] * 3
+    assert cache.stats["evictions"] == 1 and cache.size_bytes <= cache.max_bytes
+
+def test_entries_survive_a_restart(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.put("a", ["draft", 1])
+    reopened = GenerationCache(str(tmp_path / "cache"))
+    assert reopened.size_bytes == cache.size_bytes
+    assert reopened.get("a") == (["draft", 1], "fresh")
+
+def test_corrupt_or_malformed_entries_are_misses(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    bodies = {
+        "truncated": '{"created": 1000.0, "val',
+        "no_created": json.dumps({"value": "x"}),
+        "no_value": json.dumps({"created": 1000.0}),
+        "bad_created": json.dumps({"created": "yesterday", "value": "x"}),
+        "null_created": json.dumps({"created": None, "value": "x"}),
+        "not_an_object": json.dumps(["x"]),
+    }
+    for key, body in bodies.items():
+        (cache_dir / f"{key}.json").write_text(body)
+    cache, _ = make_cache(tmp_path, monkeypatch)
+
+    for key in bodies:
+        assert cache.get(key) == (None, "miss"), key
+        assert not (cache_dir / f"{key}.json").exists()
+    assert len(cache) == 0 and cache.size_bytes == 0
@@ -0,0 +1,102 @@
+import asyncio
+import datetime
+from aiohttp import web
+from core.gsc_sync import GSCSync, KeywordStore
+
+SITE = "sc-domain:example.com"
+
+class SearchConsoleStub:
+    """
+    Local stand-in for searchAnalytics.query: serves `rows` for each date in
+    pages of the requested rowLimit, after the queued error responses.
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.errors = {}
+        self.requests = []
+
+    async def handle(self, request):
+        body = await request.json()
+        date, start, limit = body["startDate"], body["startRow"], body["rowLimit"]
+        self.requests.append((request.match_info["site"], date, start))
+        errors = self.errors.get(date)
+        if errors:
+            status, headers = errors.pop(0)
+            return web.Response(status=status, headers=headers)
+        page = self.rows.get(date, [])[start:start + limit]
+        return web.json_response({"rows": page} if page else {})
+
+async def start_stub(stub):
+    app = web.Application()
+    app.router.add_post("/sites/{site}/searchAnalytics/query", stub.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+def gsc_row(date, query, page, impressions, clicks=1, position=3.0):
+    return {"keys": [date, query, page], "clicks": clicks, "impressions": impressions,
+            "ctr": clicks / impressions, "position": position}
+
+def run_sync(stub, store, today, **options):
+    async def scenario():
+        runner, base_url = await start_stub(stub)
+        try:
+            sync = GSCSync(store, SITE, base_url=base_url, row_limit=2, lookback_days=3, data_lag_days=2,
+                           backoff_base=0.01, **options)
+            return await sync.sync(today=today)
+        finally:
+            await runner.cleanup()
+    return asyncio.run(scenario())
+
+def test_pages_are_followed_until_a_short_page(tmp_path):
+    stub = SearchConsoleStub()
+    stub.rows["2026-03-01"] = [gsc_row("2026-03-01", f"solar {i}", "/a", 10 + i) for i in range(5)]
+    store = KeywordStore(str(tmp_path / "gsc.db"))
+
+    result = run_sync(stub, store, datetime.date(2026, 3, 3))
+    assert result == {"days": 3, "rows": 5, "watermark": "2026-03-01"}
+    # Site URL is path-encoded; 5 rows at 2 per page take 3 requests
+    assert {site for site, _, _ in stub.requests} == {SITE}
+    assert sorted(start for _, date, start in stub.requests if date == "2026-03-01") == [0, 2, 4]
+    assert [row["keyword"] for row in store.query_totals(SITE)] == [f"solar {i}" for i in range(4, -1, -1)]
+
+def test_rate_limits_and_server_errors_are_retried(tmp_path):
+    stub = SearchConsoleStub()
+    stub.rows["2026-03-01"] = [gsc_row("2026-03-01", "solar roi", "/a", 40)]
+    stub.errors["2026-03-01"] = [(429, {"Retry-After": "0"}), (503, {})]
+    stub.errors["2026-02-28"] = [(400, {})]
+    store = KeywordStore(str(tmp_path / "gsc.db"))
+
+    result = run_sync(stub, store, datetime.date(2026, 3, 3), max_attempts=3)
+    assert [start for _, date, start in stub.requests if date == "2026-03-01"] == [0, 0, 0]
+    # A client error is not retried; the day is skipped and holds the watermark back
+    assert [start for _, date, start in stub.requests if date == "2026-02-28"] == [0]
+    assert result == {"days": 2, "rows": 1, "watermark": "2026-02-27"}
+    assert store.query_totals(SITE)[0]["volume"] == 40
+
+    stub.errors["2026-03-02"] = [(503, {})] * 3
+    stub.rows["2026-03-02"] = [gsc_row("2026-03-02", "solar roi", "/a", 5)]
+    result = run_sync(stub, store, datetime.date(2026, 3, 4), max_attempts=3)
+    assert result["watermark"] == "2026-03-01"
+    # Out of attempts on 03-02: it is left for the next sync
+    assert [row["volume"] for row in store.query_totals(SITE)] == [40]
+
+def test_incremental_sync_upserts_days_after_the_watermark(tmp_path):
+    stub = SearchConsoleStub()
+    stub.rows["2026-03-01"] = [gsc_row("2026-03-01", "solar roi", "/a", 10)]
+    store = KeywordStore(str(tmp_path / "gsc.db"))
+    run_sync(stub, store, datetime.date(2026, 3, 3))
+    stub.requests.clear()
+
+    # Only the day past the watermark is fetched; a re-synced day replaces its rows
+    stub.rows["2026-03-02"] = [gsc_row("2026-03-02", "solar roi", "/a", 7),
+                               gsc_row("2026-03-02", "rooftop subsidy", "/b", 3)]
+    assert run_sync(stub, store, datetime.date(2026, 3, 4)) == {"days": 1, "rows": 2, "watermark": "2026-03-02"}
+    assert {date for _, date, _ in stub.requests} == {"2026-03-02"}
+    store.write_day(SITE, "2026-03-02", [gsc_row("2026-03-02", "solar roi", "/a", 9)], advance_watermark=False)
+    assert {row["keyword"]: row["volume"] for row in store.query_totals(SITE)} == {"solar roi": 19}
+    assert sorted(store.daily_series(SITE, "2026-03-01")) == [("solar roi", "2026-03-01", 10),
+                                                               ("solar roi", "2026-03-02", 9)]
+    store.close()
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+from core.base_node import BaseNode, NodeOutput
+from core.ingestion import LeadIngestionService
+
+class FakeLeadNode(BaseNode):
+    def __init__(self):
+        super().__init__("NODE_4", "Test")
+
+    async def run(self, inputs):
+        return NodeOutput(data={})
+
+class FakeOrchestrator:
+    def __init__(self, blocked: bool = False, delay: float = 0.0):
+        self.blocked = blocked
+        self.delay = delay
+        self.nodes = {"NODE_4": FakeLeadNode()}
+        self.scored = []
+
+    def risk_gate(self, node_id):
+        return 90 if self.blocked else None
+
+    async def run_node(self, node_id, inputs):
+        if self.blocked:
+            return NodeOutput(data=None, metadata={"status": "blocked", "risk_score": 90})
+        await asyncio.sleep(self.delay)
+        self.scored.append(inputs["lead"])
+        return NodeOutput(data={}, metadata={"score": "C"})
+
+def test_bad_rows_are_reported_and_the_watcher_keeps_running(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "a.jsonl").write_text('{"name": "ok"}\n[1]\n5\nnot json\n{"name": "ok2"}\n')
+    (inbox / "b.jsonl").write_bytes(b'{"name": "x"}\n\xff\xfe\n')
+
+    async def scenario():
+        orchestrator = FakeOrchestrator()
+        service = LeadIngestionService(orchestrator, workers=1, inbox_dir=str(inbox), poll_interval=0.01)
+        await service.start()
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if not os.path.exists(inbox / "a.jsonl") and not os.path.exists(inbox / "b.jsonl"):
+                break
+        await service.join()
+        await service.stop()
+        return orchestrator, service
+
+    orchestrator, service = asyncio.run(scenario())
+    assert [lead["name"] for lead in orchestrator.scored] == ["ok", "ok2"]
+    assert service.stats["rejected"] == 3
+    errors = [json.loads(line) for line in (inbox / "processed" / "a.jsonl.errors.jsonl").read_text().splitlines()]
+    assert [e["line"] for e in errors] == [2, 3, 4]
+    # The undecodable file queued nothing, so dropping it again cannot duplicate leads
+    assert (inbox / "failed" / "b.jsonl").exists()
+
+def test_blocked_leads_are_parked_and_released(tmp_path):
+    async def scenario():
+        orchestrator = FakeOrchestrator(blocked=True)
+        service = LeadIngestionService(orchestrator, workers=1, poll_interval=0.01)
+        await service.start()
+        await service.submit({"name": "held"})
+        await service.join()
+        assert service.stats["blocked"] == 1 and service.stats["processed"] == 0
+        orchestrator.blocked = False
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if orchestrator.scored:
+                break
+        await service.join()
+        await service.stop()
+        return orchestrator, service
+
+    orchestrator, service = asyncio.run(scenario())
+    assert [lead["name"] for lead in orchestrator.scored] == ["held"]
+    assert service.stats["processed"] == 1
+
+def test_stop_saves_queued_leads_and_files_wait_for_their_leads(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "bulk.jsonl").write_text("".join(json.dumps({"name": f"lead-{i}"}) + "\n" for i in range(20)))
+
+    async def scenario():
+        orchestrator = FakeOrchestrator(delay=0.05)
+        service = LeadIngestionService(orchestrator, workers=1, queue_size=50, inbox_dir=str(inbox),
+                                       poll_interval=0.01, drain_timeout=0.12)
+        await service.start()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if service.stats["queued"] == 20:
+                break
+        # Leads are queued but not scored: the file must stay in the inbox
+        assert (inbox / "bulk.jsonl").exists()
+        await service.stop()
+        return orchestrator
+
+    orchestrator = asyncio.run(scenario())
+    scored = [lead["name"] for lead in orchestrator.scored]
+    assert 0 < len(scored) < 20
+    pending = list(inbox.glob("pending-*.jsonl"))
+    assert len(pending) == 1
+    saved = [json.loads(line)["name"] for line in pending[0].read_text().splitlines()]
+    # Every accepted lead was either scored or saved, none twice
+    assert sorted(scored + saved) == sorted(f"lead-{i}" for i in range(20))
+    assert (inbox / "processed" / "bulk.jsonl").exists()
+
+    async def restart():
+        orchestrator = FakeOrchestrator()
+        service = LeadIngestionService(orchestrator, workers=2, inbox_dir=str(inbox), poll_interval=0.01)
+        await service.start()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if not list(inbox.glob("pending-*.jsonl")):
+                break
+        await service.stop()
+        return orchestrator
+
+    assert sorted(lead["name"] for lead in asyncio.run(restart()).scored) == sorted(saved)
@@ -0,0 +1,18 @@
+from core.keyword_clustering import KeywordClusterer
+
+def test_devanagari_queries_keep_whole_words():
+    assert KeywordClusterer.tokenize("सोलर पैनल की कीमत") == ["सोलर", "पैनल", "की", "कीमत"]
+
+def test_queries_without_tokens_get_singleton_clusters():
+    clusterer = KeywordClusterer()
+    keywords = [{"keyword": k, "volume": v} for k, v in [
+        ("!!!", 5), ("???", 4), ("की सोलर", 3), ("what is the", 2),
+        ("सोलर पैनल की कीमत", 10), ("सोलर पैनल कीमत", 8)
+    ]]
+    clusters = {tuple(c["sample"]) for c in clusterer.fit(keywords)}
+    assert {("!!!",), ("???",), ("की सोलर",), ("what is the",)} <= clusters
+    assert ("सोलर पैनल की कीमत", "सोलर पैनल कीमत") in clusters
+
+    before = len(clusterer.clusters)
+    assigned = clusterer.assign([{"keyword": "...", "volume": 1}, {"keyword": "---", "volume": 1}])
+    assert assigned == [before, before + 1]
@@ -0,0 +1,30 @@
+import datetime
+from core.gsc_sync import KeywordStore
+from core.keyword_trends import KeywordTrends
+
+SITE = "sc-domain:example.com"
+
+def test_flat_series_has_no_trend(tmp_path):
+    store = KeywordStore(str(tmp_path / "keywords.db"))
+    today = datetime.date(2026, 6, 15)
+    # Synced like GSCSync: up to two days before today, nothing after the watermark
+    last_synced = today - datetime.timedelta(days=2)
+    for offset in range(119, -1, -1):
+        date = (last_synced - datetime.timedelta(days=offset)).isoformat()
+        store.write_day(SITE, date, [{"keys": [date, "solar roi", "/a"], "impressions": 100}], advance_watermark=True)
+
+    trends = KeywordTrends.from_store(store, SITE, days=90, today=today)
+    signals = trends.signals()["solar roi"]
+    store.close()
+
+    assert trends.volumes[0, -1] == 100
+    assert abs(signals["momentum"]) < 1e-6
+    assert abs(signals["growth"]) < 1e-6
+    assert abs(signals["spike_z"]) < 1e-6
+
+def test_window_without_watermark_ends_before_data_lag(tmp_path):
+    store = KeywordStore(str(tmp_path / "keywords.db"))
+    today = datetime.date(2026, 6, 15)
+    trends = KeywordTrends.from_store(store, SITE, days=30, today=today)
+    store.close()
+    assert trends.start == today - datetime.timedelta(days=2 + 29)
@@ -0,0 +1,48 @@
+from core.lead_table import LeadTable
+from core.memory import GlobalMemory
+from core.storage import SQLiteBackend
+
+def test_unknown_fields_are_kept_per_row():
+    table = LeadTable()
+    table.extend([
+        {"timestamp": "2026-01-01T00:00:00", "score": "A", "capex": 5.0, "industry": "textile",
+         "co2_offset": 2.0, "company": "Acme", "source": "csv"},
+        {"timestamp": "2026-01-02T00:00:00", "score": "B", "capex": 1.0, "industry": "dairy", "co2_offset": 0.5}
+    ])
+    assert table.row(0)["company"] == "Acme"
+    assert table.row(0)["source"] == "csv"
+    assert set(table.row(1)) == set(LeadTable.FIELDS)
+
+def test_missing_tier_is_an_explicit_label(tmp_path):
+    memory = GlobalMemory(backend=SQLiteBackend(str(tmp_path / "state.db")))
+    memory.append_to_list("lead_quality", {"timestamp": "2026-01-01T00:00:00", "score": None,
+                                           "capex": 1.0, "industry": "textile", "co2_offset": 1.0})
+    table = memory.table("lead_quality")
+    assert table.row(0)["score"] == LeadTable.MISSING
+    assert "None" not in table.labels("score")
+    # Incremental counts and a refold from the table agree
+    assert memory.aggregate("leads_by_tier") == {LeadTable.MISSING: 1}
+    memory.update_state("lead_quality", list(memory.get_list("lead_quality")))
+    assert memory.aggregate("leads_by_tier") == {LeadTable.MISSING: 1}
+    memory.backend.close()
+
+def test_timestamps_are_stored_as_utc_epochs(monkeypatch):
+    import time
+    monkeypatch.setenv("TZ", "Asia/Kathmandu")
+    time.tzset()
+    try:
+        table = LeadTable()
+        table.extend([
+            {"timestamp": "2026-03-01T10:00:00+05:45", "score": "A"},
+            {"timestamp": "2026-03-01T04:15:00Z", "score": "B"},
+            # Legacy rows without an offset were written in local time
+            {"timestamp": "2026-03-01T10:00:00", "score": "C"},
+            {"timestamp": 1772338500.0, "score": "C"},
+            {"timestamp": "now", "score": "C"},
+        ])
+        assert list(table.column("timestamp")[:4]) == [1772338500.0] * 4
+        assert table.row(0)["timestamp"] == "2026-03-01T04:15:00+00:00"
+        assert table.row(4)["timestamp"] == "now"
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
@@ -0,0 +1,43 @@
+from core.memory import GlobalMemory
+from core.storage import SQLiteBackend
+
+def test_risk_score_is_not_restored_on_restart(tmp_path):
+    db_path = str(tmp_path / "state.db")
+    memory = GlobalMemory(backend=SQLiteBackend(db_path))
+    memory.update_state("current_risk_score", 95)
+    memory.update_state("budget_phase", "STATE_2")
+    memory.flush()
+    memory.backend.close()
+
+    restored = GlobalMemory(backend=SQLiteBackend(db_path))
+    assert restored.get_state("current_risk_score") is None
+    assert restored.get_state("budget_phase") == "STATE_2"
+    restored.backend.close()
+
+def test_tier_a_index_holds_positions_and_is_not_persisted(tmp_path):
+    db_path = str(tmp_path / "state.db")
+    memory = GlobalMemory(backend=SQLiteBackend(db_path))
+    for score in ("B", "A", "C", "A"):
+        memory.append_to_list("lead_quality", {"timestamp": "2026-01-01T00:00:00", "score": score,
+                                               "capex": 1.0, "industry": "textile", "co2_offset": 1.0})
+    assert memory.aggregate("tier_a_leads") == [1, 3]
+    memory.flush()
+    assert "__aggregate__:tier_a_leads" not in memory.backend.keys()
+    memory.backend.close()
+
+    restored = GlobalMemory(backend=SQLiteBackend(db_path))
+    assert restored.aggregate("tier_a_leads") == [1, 3]
+    assert restored.aggregate("leads_by_tier") == {"B": 1, "A": 2, "C": 1}
+    restored.backend.close()
+
+def test_index_readers_get_only_new_positions():
+    memory = GlobalMemory()
+    for score in ("A", "B", "A", "C", "A"):
+        memory.append_to_list("lead_quality", {"timestamp": "2026-01-01T00:00:00", "score": score,
+                                               "capex": 1.0, "industry": "textile", "co2_offset": 1.0})
+    assert memory.aggregate_since("tier_a_leads", 0) == [0, 2, 4]
+    assert memory.aggregate_since("tier_a_leads", 1) == [2, 4]
+    assert memory.aggregate_since("tier_a_leads", 5) == []
+    # The returned slice is the caller's own: mutating it leaves the index alone
+    memory.aggregate_since("tier_a_leads", 0).append(99)
+    assert memory.aggregate("tier_a_leads") == [0, 2, 4]
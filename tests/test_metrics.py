@@ -0,0 +1,23 @@
+from core.metrics import MetricsRegistry
+
+class Unserializable:
+    def __str__(self):
+        raise AssertionError("payload was serialized")
+
+def test_payload_sizes_are_sampled_per_node():
+    metrics = MetricsRegistry(payload_sample_every=3)
+    sampled = [metrics.sample_payloads("NODE_1") for _ in range(7)]
+    assert sampled == [True, False, False, True, False, False, True]
+    assert metrics.sample_payloads("NODE_2")
+    assert not MetricsRegistry(payload_sample_every=0).sample_payloads("NODE_1")
+
+def test_unsampled_payloads_are_not_serialized():
+    metrics = MetricsRegistry()
+    assert metrics.payload_size({"x": Unserializable()}, measure=False) is None
+    # Bytes and strings are measured even on unsampled runs
+    assert metrics.payload_size(b"abcd", measure=False) == 4
+    assert metrics.payload_size("abc", measure=False) == 3
+    metrics.record_node_run("NODE_1", "success", 0.1, None, None)
+    assert "node_input_bytes" not in metrics.histograms
+    metrics.record_node_run("NODE_1", "success", 0.1, 10, 20)
+    assert metrics.histograms["node_output_bytes"][(("node", "NODE_1"),)].count == 1
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from core.base_node import NodeOutput
+from core.pipeline import Pipeline, PipelineExecutor
+from main import build_simulation_pipeline
+
+class FakeOrchestrator:
+    """
+    Records when each node call starts and ends. `outputs` maps node ids to a
+    NodeOutput or an exception to raise.
+    """
+
+    def __init__(self, outputs=None, delay: float = 0.01):
+        self.outputs = outputs or {}
+        self.delay = delay
+        self.log = []
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def run_node(self, node_id, inputs):
+        self.calls.append((node_id, inputs))
+        self.log.append(("start", node_id, inputs.get("tag")))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            output = self.outputs.get(node_id, NodeOutput(data={"node": node_id}, metadata={"status": "ok"}))
+            if isinstance(output, Exception):
+                raise output
+            return output
+        finally:
+            self.active -= 1
+            self.log.append(("end", node_id, inputs.get("tag")))
+
+def run(pipeline, orchestrator, max_concurrency=4):
+    return asyncio.run(PipelineExecutor(orchestrator, max_concurrency=max_concurrency).execute(pipeline))
+
+def test_steps_start_only_after_their_dependencies_finish():
+    pipeline = build_simulation_pipeline("Solar", [{"name": "Mill"}, {"name": "Shop"}])
+    for step in pipeline.steps.values():
+        step.inputs["tag"] = step.step_id
+    orchestrator = FakeOrchestrator({
+        "NODE_3": NodeOutput(data={"draft": "text"}, metadata={"status": "generated"}),
+        "NODE_5": NodeOutput(data={}, metadata={"status": "cleared"}),
+        "NODE_4": NodeOutput(data={"capex_estimate": 1.0}, metadata={"score": "A"}),
+    })
+    results = run(pipeline, orchestrator)
+
+    assert set(results) == set(pipeline.steps)
+    position = {(event, tag): i for i, (event, _, tag) in enumerate(orchestrator.log)}
+    for step in pipeline.steps.values():
+        for dep in step.dependencies():
+            assert position[("end", dep)] < position[("start", step.step_id)], (dep, step.step_id)
+    # Leads wait for the risk check (after=["risk"]) even with no data edge to it
+    assert position[("end", "risk")] < min(position[("start", "lead_0")], position[("start", "lead_1")])
+    # Independent branches overlap: SEO runs beside the content chain
+    assert position[("start", "seo")] < position[("end", "content")]
+    risk_inputs = next(inputs for _, inputs in orchestrator.calls if inputs["tag"] == "risk")
+    assert risk_inputs["content"] == "text"
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    pipeline = Pipeline("loop").add_step("a", "N", after=["c"]).add_step("b", "N", after=["a"])
+    pipeline.add_step("c", "N", edges={"x": "b.value"}).add_step("free", "N")
+    with pytest.raises(ValueError, match="cycle"):
+        pipeline.validate()
+    orchestrator = FakeOrchestrator()
+    with pytest.raises(ValueError, match="cycle"):
+        run(pipeline, orchestrator)
+    assert orchestrator.calls == []
+
+    with pytest.raises(ValueError, match="unknown step ghost"):
+        Pipeline().add_step("a", "N", edges={"x": "ghost"}).validate()
+    with pytest.raises(ValueError, match="Duplicate"):
+        Pipeline().add_step("a", "N").add_step("a", "N")
+
+def test_failures_propagate_along_data_edges_only():
+    pipeline = Pipeline("failing")
+    pipeline.add_step("source", "BROKEN")
+    pipeline.add_step("child", "N", edges={"x": "source.value"})
+    pipeline.add_step("grandchild", "N", edges={"x": "child"})
+    pipeline.add_step("ordered", "N", after=["source"])
+    pipeline.add_step("gated", "N", after=["ordered"], when=lambda results: False)
+    pipeline.add_step("blocked", "BLOCKED")
+    pipeline.add_step("downstream", "N", edges={"x": "blocked.metadata.risk_score"})
+    orchestrator = FakeOrchestrator({
+        "BROKEN": RuntimeError("boom"),
+        "BLOCKED": NodeOutput(data=None, metadata={"status": "blocked", "risk_score": 90}),
+    })
+    results = run(pipeline, orchestrator)
+
+    assert results["source"].metadata == {"status": "error", "error": "boom"}
+    assert results["child"].metadata["reason"] == "upstream source error"
+    assert results["grandchild"].metadata["reason"] == "upstream child skipped"
+    assert results["ordered"].metadata["status"] == "ok"
+    assert results["gated"].metadata == {"status": "skipped", "reason": "condition not met"}
+    assert results["downstream"].metadata["reason"] == "upstream blocked blocked"
+    assert [node for node, _ in orchestrator.calls].count("N") == 1
+
+def test_edges_resolve_paths_metadata_and_nested_inputs():
+    pipeline = Pipeline("edges")
+    pipeline.add_step("up", "UP")
+    pipeline.add_step("down", "N", inputs={"draft": {"title": "T"}},
+                      edges={"draft.body": "up.content.body", "score": "up.metadata.score", "missing": "up.nope.deeper"})
+    orchestrator = FakeOrchestrator({"UP": NodeOutput(data={"content": {"body": "B"}}, metadata={"score": "A"})})
+    run(pipeline, orchestrator)
+    assert orchestrator.calls[1][1] == {"draft": {"title": "T", "body": "B"}, "score": "A", "missing": None}
+    # The declared inputs are copied, never mutated
+    assert pipeline.steps["down"].inputs == {"draft": {"title": "T"}}
+
+def test_concurrency_cap_is_respected():
+    pipeline = Pipeline("wide")
+    for i in range(8):
+        pipeline.add_step(f"s{i}", "N")
+    orchestrator = FakeOrchestrator()
+    assert len(run(pipeline, orchestrator, max_concurrency=3)) == 8
+    assert orchestrator.peak == 3
@@ -0,0 +1,63 @@
+import json
+from core.post_index import PostIndex
+
+def publish(index, slug, title=None, date="2026-03-01", content_hash="h"):
+    return index.upsert(slug, title or slug.title(), date, f"/blog/{slug}.html", content_hash)
+
+def test_log_survives_reload_and_keeps_first_publish_order(tmp_path):
+    path = str(tmp_path / "data" / "posts.jsonl")
+    index = PostIndex(path)
+    assert publish(index, "a") and publish(index, "b") and publish(index, "c")
+    assert not publish(index, "a")
+    assert publish(index, "a", title="A, edited")
+    assert index.remove("b") and not index.remove("b")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op": "upsert", "slug": "torn"')
+
+    reloaded = PostIndex(path)
+    assert [post["slug"] for post in reloaded.latest(10)] == ["c", "a"]
+    assert reloaded.posts["a"]["title"] == "A, edited" and reloaded.posts["a"]["seq"] == 0
+    assert reloaded.posts["c"]["seq"] == 2
+
+def test_artifacts_rewrite_only_the_pages_that_changed(tmp_path):
+    public = tmp_path / "public"
+    index = PostIndex(str(tmp_path / "posts.jsonl"), page_size=2, sitemap_chunk=2, feed_size=2)
+    for slug in ("a", "b", "c"):
+        publish(index, slug)
+
+    assert index.write_artifacts(str(public), "https://example.com/") == {"pages": 2, "sitemaps": 2, "feed": True}
+    assert index.write_artifacts(str(public), "https://example.com/") == {"pages": 0, "sitemaps": 0, "feed": False}
+
+    publish(index, "d", title="Tariffs & <Subsidies>")
+    assert index.write_artifacts(str(public), "https://example.com/") == {"pages": 1, "sitemaps": 1, "feed": True}
+    posts_dir = public / "blog" / "posts"
+    summary = json.loads((posts_dir / "index.json").read_text())
+    assert summary["total"] == 4 and summary["pages"] == 2
+    assert [post["slug"] for post in summary["latest"]] == ["d", "c"]
+    assert [post["slug"] for post in json.loads((posts_dir / "page-1.json").read_text())["posts"]] == ["c", "d"]
+
+    sitemap = (public / "sitemap.xml").read_text()
+    assert "https://example.com/sitemap-0.xml" in sitemap and "https://example.com/sitemap-1.xml" in sitemap
+    assert "<loc>https://example.com/blog/d.html</loc>" in (public / "sitemap-1.xml").read_text()
+    feed = (public / "feed.xml").read_text()
+    assert "<title>Tariffs &amp; &lt;Subsidies&gt;</title>" in feed
+    assert "<pubDate>Sun, 01 Mar 2026 00:00:00 +0000</pubDate>" in feed
+
+    # A fresh process with the same log and state file has nothing to write
+    assert PostIndex(str(tmp_path / "posts.jsonl"), page_size=2).write_artifacts(
+        str(public), "https://example.com") == {"pages": 0, "sitemaps": 0, "feed": False}
+
+def test_compaction_keeps_sequence_numbers_and_removed_holes(tmp_path):
+    path = tmp_path / "posts.jsonl"
+    index = PostIndex(str(path), page_size=2)
+    for slug in ("a", "b", "c"):
+        publish(index, slug)
+    index.remove("b")
+    for i in range(120):
+        publish(index, "c", content_hash=str(i))
+    index.write_artifacts(str(tmp_path / "public"), "https://example.com")
+
+    assert len(path.read_text().splitlines()) == 2
+    reloaded = PostIndex(str(path), page_size=2)
+    assert {slug: post["seq"] for slug, post in reloaded.posts.items()} == {"a": 0, "c": 2}
+    assert [post["slug"] for post in reloaded.latest(5)] == ["c", "a"]
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+import core.report_generator as report_generator
+from agents.lead_intelligence_engine import LeadIntelligenceEngine
+from core.config_loader import ConfigLoader
+from core.memory import GlobalMemory
+from core.report_generator import ReportGenerator
+
+LEADS = [
+    {"name": "Mill", "roof_size": 20000, "electricity_bill": 400000, "operation_type": "textile"},
+    {"name": "Office", "roof_size": 2000, "electricity_bill": 20000, "operation_type": "other"},
+    {"name": "Shop", "roof_size": 300, "electricity_bill": 3000, "operation_type": "other"},
+]
+
+def score(memory, leads):
+    node = LeadIntelligenceEngine()
+    node.set_memory(memory)
+    node.set_config(ConfigLoader(env_path="/nonexistent/.env"))
+    return asyncio.run(node.run({"leads": leads})).data["results"]
+
+def test_routing_column_holds_node_4_routing(tmp_path):
+    memory = GlobalMemory()
+    results = score(memory, LEADS)
+    assert {r["lead_score"] for r in results} == {"A", "B", "C"}
+    reporter = ReportGenerator(str(tmp_path))
+    reporter.export_leads_parquet(memory.table("lead_quality"))
+    frame = reporter.read_parquet("leads")
+    assert list(frame["routing"].astype(str)) == [r["routing"] for r in results]
+    assert dict(zip(frame["score"].astype(str), frame["routing"].astype(str))) == {
+        "A": "Sales Dashboard", "B": "Sales Dashboard", "C": "Nurture Sequence"
+    }
+
+def test_repeated_exports_do_not_duplicate_rows(tmp_path):
+    memory = GlobalMemory()
+    score(memory, LEADS)
+    reporter = ReportGenerator(str(tmp_path))
+    table = memory.table("lead_quality")
+    assert reporter.export_leads_parquet(table)
+    assert reporter.export_leads_parquet(table) == []
+    score(memory, LEADS[:1])
+    reporter.export_leads_parquet(table)
+    assert len(reporter.read_parquet("leads")) == 4
+
+    # A replaced (shorter) list rewrites the table instead of appending all of it again
+    memory.update_state("lead_quality", list(memory.get_list("lead_quality"))[:2])
+    reporter.export_leads_parquet(memory.table("lead_quality"))
+    assert len(reporter.read_parquet("leads")) == 2
+    # A fresh reporter resumes from the stored watermark
+    assert ReportGenerator(str(tmp_path)).export_leads_parquet(memory.table("lead_quality")) == []
+
+def test_summary_rows_only_when_counters_change(tmp_path):
+    reporter = ReportGenerator(str(tmp_path))
+    summary = {"total_leads": 3, "tier_counts": {"A": 1, "B": 1, "C": 1}}
+    assert reporter.export_summary_parquet(summary, min_interval=0)
+    assert reporter.export_summary_parquet(summary, min_interval=0) == []
+    assert reporter.export_summary_parquet({**summary, "total_leads": 4}, min_interval=3600) == []
+    assert reporter.export_summary_parquet({**summary, "total_leads": 4}, min_interval=0)
+    assert len(reporter.read_parquet("summary")) == 2
+
+def test_lead_timestamps_are_exported_in_utc(tmp_path):
+    memory = GlobalMemory()
+    memory.extend_list("lead_quality", [
+        {"timestamp": "2026-03-01T23:30:00-05:00", "score": "A", "capex": 1.0, "industry": "textile", "co2_offset": 1.0},
+        {"timestamp": "2026-03-01T23:30:00+00:00", "score": "B", "capex": 1.0, "industry": "textile", "co2_offset": 1.0},
+    ])
+    reporter = ReportGenerator(str(tmp_path))
+    reporter.export_leads_parquet(memory.table("lead_quality"))
+    assert sorted(p.name for p in (tmp_path / "parquet" / "leads").iterdir()) == ["date=2026-03-01", "date=2026-03-02"]
+    frame = reporter.read_parquet("leads")
+    assert str(frame["timestamp"].dt.tz) == "UTC"
+    assert sorted(frame["timestamp"].dt.strftime("%Y-%m-%dT%H:%M")) == ["2026-03-01T23:30", "2026-03-02T04:30"]
+
+def rows(start, stop):
+    return [{"id": i, "score": "A" if i % 2 else "C"} for i in range(start, stop)]
+
+def test_append_csv_writes_the_header_once_across_runs(tmp_path):
+    reporter = ReportGenerator(str(tmp_path))
+    path = reporter.append_csv(rows(0, 2), "leads")
+    reporter.append_csv(rows(0, 3), "leads")
+    # A no-op tick, then a fresh process picking up from the saved watermark
+    reporter.append_csv(rows(0, 3), "leads")
+    ReportGenerator(str(tmp_path)).append_csv(rows(0, 5), "leads")
+
+    lines = open(path, encoding="utf-8").read().splitlines()
+    assert lines == ["id,score"] + [f"{i},{'A' if i % 2 else 'C'}" for i in range(5)]
+
+def test_append_csv_drops_bytes_from_an_uncommitted_append(tmp_path):
+    reporter = ReportGenerator(str(tmp_path))
+    path = reporter.append_csv(rows(0, 2), "leads")
+    # A crash after appending rows 2-3 but before the state was saved
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("2,C\n3,A\n")
+    ReportGenerator(str(tmp_path)).append_csv(rows(0, 4), "leads")
+    assert open(path, encoding="utf-8").read().splitlines()[1:] == ["0,C", "1,A", "2,C", "3,A"]
+
+def test_append_csv_rotates_and_rewrites_atomically(tmp_path, monkeypatch):
+    reporter = ReportGenerator(str(tmp_path))
+    path = reporter.append_csv(rows(0, 3), "leads", max_bytes=30)
+    reporter.append_csv(rows(0, 6), "leads", max_bytes=30)
+    assert [open(p, encoding="utf-8").read() for p in reporter.rotated_files("leads")] == ["id,score\n0,C\n1,A\n2,C\n"]
+    assert open(path, encoding="utf-8").read() == "id,score\n3,A\n4,C\n5,A\n"
+
+    # A replaced source list is rewritten in full through a temp file: if the
+    # rename fails, the previous report is left whole
+    real_replace = report_generator.os.replace
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(report_generator.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        reporter.append_csv(rows(10, 12), "leads", max_bytes=30)
+    assert open(path, encoding="utf-8").read() == "id,score\n3,A\n4,C\n5,A\n"
+
+    monkeypatch.setattr(report_generator.os, "replace", real_replace)
+    reporter.append_csv(rows(10, 12), "leads", max_bytes=30)
+    assert open(path, encoding="utf-8").read() == "id,score\n10,C\n11,A\n"
+    assert sorted(p.name for p in tmp_path.glob("leads*")) == ["leads.csv"]
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+from core.roi_calculator import ROICalculator
+
+def assert_batch_matches_scalar(calculator, roofs, bills):
+    batch = calculator.calculate_batch(pd.DataFrame({"roof_size": roofs, "electricity_bill": bills}))
+    for i, (roof, bill) in enumerate(zip(roofs, bills)):
+        expected = calculator.calculate(roof, bill)
+        assert {key: float(batch[key].iloc[i]) for key in expected} == expected, (roof, bill)
+
+def test_batch_rounds_exactly_like_calculate():
+    calculator = ROICalculator()
+    # 1.5 and 267.5 sq ft give 0.015 and 2.675 kW, where np.round and round disagree
+    roofs = [1.5, 267.5, 0.0, 1000.0, 14.5]
+    assert_batch_matches_scalar(calculator, roofs, [1e9] * len(roofs))
+
+    rng = np.random.default_rng(3)
+    roofs = np.round(rng.uniform(0, 50000, 2000), 1).tolist()
+    bills = np.round(rng.uniform(0, 500000, 2000), 2).tolist()
+    assert_batch_matches_scalar(calculator, roofs, bills)
+
+def test_payback_on_a_rounding_edge_gets_the_same_value_in_both_paths():
+    # 50100 / 12000 = 4.175: round() gives 4.17, np.round alone gave 4.18
+    calculator = ROICalculator(cost_per_kw=50100.0, units_per_kw_monthly=100.0, rate_per_unit=10.0)
+    assert calculator.calculate(1000, 1e9)["payback_years"] == 4.17
+    assert calculator.calculate_batch([1000], [1e9])["payback_years"].tolist() == [4.17]
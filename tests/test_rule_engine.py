@@ -0,0 +1,57 @@
+import asyncio
+from core.config_loader import ConfigLoader
+from core.memory import GlobalMemory
+from core.rule_engine import Rule, RuleSet
+from agents.governance_risk_engine import GovernanceRiskEngine
+
+def make_rules() -> RuleSet:
+    return RuleSet([
+        Rule("short", "financial", 10, "Short", phrases=("guaranteed",)),
+        Rule("long", "financial", 40, "Long", phrases=("guaranteed ROI",)),
+        Rule("pct", "performance", 20, "Pct", regex=r"[1-9][0-9]{2}\s*%\s+(?:savings|roi)\b", anchors=("%",)),
+    ])
+
+def test_shorter_phrase_matches_when_longer_fails_boundary():
+    rules = make_rules()
+    assert rules.scan("guaranteed roix") == {"short": 1}
+    assert rules.scan("unguaranteed") == {}
+
+def test_every_rule_matching_at_a_position_is_reported():
+    rules = make_rules()
+    # "guaranteed" is a prefix of "guaranteed ROI": both rules fire
+    assert rules.scan("Guaranteed\n  ROI.") == {"short": 1, "long": 1}
+    assert rules.evaluate("guaranteed roi")["risk_score"] == 50
+    overlapping = RuleSet([
+        Rule("a", "policy", 10, "A", phrases=("solar subsidy",)),
+        Rule("b", "policy", 10, "B", phrases=("subsidy scheme",)),
+    ])
+    assert overlapping.scan("the solar subsidy scheme") == {"a": 1, "b": 1}
+
+def test_chunk_edges_are_not_word_boundaries():
+    rules = make_rules()
+    rules.CHUNK_SIZE, rules.max_match_length = 64, 16
+    # Second chunk starts at 64, inside "unguaranteed"; the first ends at 80, inside "guaranteedly"
+    text = "x" * 62 + "unguaranteed" + "y" * 60
+    assert rules.scan(text) == {}
+    text = "x " * 35 + "guaranteedly" + " z" * 40
+    assert text.index("guaranteedly") + len("guaranteed") == 80
+    assert rules.scan(text) == {}
+    text = "x " * 35 + "guaranteed roi" + " z" * 40
+    assert rules.scan(text) == {"short": 1, "long": 1}
+
+def test_phrases_at_chunk_edges_and_anchored_regexes():
+    rules = make_rules()
+    assert rules.scan("guaranteed") == {"short": 1}
+    assert rules.scan("We promise 150 % savings") == {"pct": 1}
+    assert rules.scan("We promise 150 savings") == {}
+    # Matches far apart in a multi-chunk text are each counted once
+    text = "guaranteed roi " + "x " * RuleSet.CHUNK_SIZE + "guaranteed roi and 200% roi"
+    assert rules.scan(text) == {"short": 2, "long": 2, "pct": 1}
+
+def test_missing_rules_file_fails_closed(tmp_path, monkeypatch):
+    monkeypatch.setenv("GOVERNANCE_RULES_PATH", str(tmp_path / "missing.json"))
+    node = GovernanceRiskEngine()
+    node.set_config(ConfigLoader(str(tmp_path / ".env")))
+    node.set_memory(GlobalMemory(event_archive_dir=str(tmp_path / "events")))
+    output = asyncio.run(node.run({"content": "Solar ROI analysis " * 10, "type": "blog"}))
+    assert output.metadata["status"] == "review"
@@ -0,0 +1,117 @@
+import asyncio
+import datetime
+import random
+import pytest
+from core.scheduler import CronTrigger, IntervalTrigger, ManualClock, Scheduler, parse_trigger
+
+def local(*args) -> float:
+    return datetime.datetime(*args).timestamp()
+
+def test_cron_parsing_and_next_fire():
+    trigger = CronTrigger("*/15 9-17 * * 1-5")
+    assert trigger.minutes == {0, 15, 30, 45} and trigger.hours == set(range(9, 18))
+    # Friday 17:50 -> Monday 09:00
+    assert trigger.next_after(local(2026, 3, 6, 17, 50)) == local(2026, 3, 9, 9, 0)
+    assert trigger.next_after(local(2026, 3, 9, 9, 0)) == local(2026, 3, 9, 9, 15)
+
+    assert CronTrigger("@daily").next_after(local(2026, 3, 6, 0, 0)) == local(2026, 3, 7, 0, 0)
+    # 7 is Sunday, like 0
+    assert CronTrigger("0 12 * * 7").next_after(local(2026, 3, 6, 0, 0)) == local(2026, 3, 8, 12, 0)
+    # Day of month and weekday both restricted: either one matches
+    assert CronTrigger("0 0 13 * 1").next_after(local(2026, 3, 10, 0, 0)) == local(2026, 3, 13, 0, 0)
+    assert isinstance(parse_trigger("every 30 now"), IntervalTrigger)
+
+    for bad in ("* * * *", "60 * * * *", "5-1 * * * *", "*/0 * * * *", "0 0 31 2 *"):
+        with pytest.raises(ValueError):
+            CronTrigger(bad).next_after(local(2026, 1, 1))
+
+def run_ticks(advances, **job_options):
+    """
+    Runs the scheduler loop on a manual clock starting at 0, advancing it by
+    each of `advances` in turn. Returns the job and the clock time of each run.
+    """
+    clock = ManualClock(0.0)
+    scheduler = Scheduler(clock=clock)
+    runs = []
+
+    async def job():
+        runs.append(clock.time())
+
+    async def scenario():
+        scheduler.add_job("job", IntervalTrigger(10), job, **job_options)
+        loop = asyncio.ensure_future(scheduler.run())
+        for seconds in advances:
+            await asyncio.sleep(0)
+            clock.advance(seconds)
+            for _ in range(5):
+                await asyncio.sleep(0)
+        scheduler.stop()
+        await loop
+
+    asyncio.run(scenario())
+    return scheduler.jobs["job"], runs
+
+def test_interval_fires_on_each_tick():
+    job, runs = run_ticks([5, 5, 10, 3, 7])
+    assert runs == [10.0, 20.0, 30.0]
+    assert job.next_tick == 40.0
+
+def test_late_tick_runs_once_by_default():
+    # A 35 s stall over a 10 s interval: the late tick runs once, missed ticks fold into it
+    job, runs = run_ticks([35])
+    assert runs == [35.0]
+    assert job.next_tick == 40.0 and job.skipped_count == 0
+
+def test_grace_drops_late_ticks_and_catch_up_replays_them():
+    job, runs = run_ticks([35], grace=1.0)
+    assert runs == [] and job.skipped_count == 1
+    # Ticks at 10, 20 and 30 each get a run
+    job, runs = run_ticks([35], misfire="catch_up")
+    assert runs == [35.0, 35.0, 35.0]
+    job, runs = run_ticks([35], misfire="catch_up", max_catch_up=1)
+    assert len(runs) == 2 and job.next_tick == 40.0
+
+def test_a_job_never_overlaps_itself():
+    clock = ManualClock(0.0)
+    scheduler = Scheduler(clock=clock)
+    release = asyncio.Event()
+    started = []
+
+    async def scenario():
+        async def slow():
+            started.append(clock.time())
+            await release.wait()
+        scheduler.add_job("slow", IntervalTrigger(10), slow)
+        clock.advance(10)
+        assert scheduler.run_pending() == ["slow"]
+        await asyncio.sleep(0)
+        clock.advance(10)
+        assert scheduler.run_pending() == []
+        release.set()
+        await scheduler.jobs["slow"].task
+
+    asyncio.run(scenario())
+    assert started == [10.0]
+    assert scheduler.jobs["slow"].skipped_count == 1
+
+def test_jitter_stays_within_bounds():
+    async def scenario():
+        clock = ManualClock(0.0)
+        scheduler = Scheduler(clock=clock, rng=random.Random(7))
+
+        async def noop():
+            pass
+        job = scheduler.add_job("jittered", IntervalTrigger(60), noop, jitter=5.0)
+        offsets = []
+        for _ in range(50):
+            offsets.append(job.fire_at - job.next_tick)
+            clock.now = job.fire_at
+            scheduler.run_pending()
+            await asyncio.sleep(0)
+        return offsets, job
+
+    offsets, job = asyncio.run(scenario())
+    assert all(0.0 <= offset <= 5.0 for offset in offsets)
+    assert len(set(offsets)) > 1
+    # Jitter delays a run but never shifts the ticks themselves
+    assert job.next_tick == 60.0 * 51 and job.run_count == 50
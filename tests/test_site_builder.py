@@ -0,0 +1,43 @@
+from core.site_builder import SiteBuilder, render_markdown
+
+def test_text_is_escaped_before_inline_markup():
+    out = render_markdown("Costs <script>alert(1)</script> & **less** `a<b`")
+    assert "<script>" not in out
+    assert "&lt;script&gt;alert(1)&lt;/script&gt; &amp; <strong>less</strong> <code>a&lt;b</code>" in out
+
+def test_only_http_and_relative_links_are_kept():
+    out = render_markdown(
+        "[ok](https://example.com/?a=1&b=2) [rel](/blog/x.html) [bad](javascript:alert%281%29) "
+        "[case](JavaScript:void%280%29) [data](data:text/html;base64,PHNjcmlwdD4=) [quote](x\"onmouseover=alert%281%29)"
+    )
+    assert '<a href="https://example.com/?a=1&amp;b=2">ok</a>' in out
+    assert '<a href="/blog/x.html">rel</a>' in out
+    assert "javascript:" not in out.lower() and "data:" not in out
+    assert " bad case data " in out
+    assert '<a href="x&quot;onmouseover=alert%281%29">quote</a>' in out
+
+def test_lines_starting_with_a_tag_are_not_passed_through():
+    out = render_markdown(
+        "<h1>Solar **ROI**</h1>\n\n<p>Stay <b>tuned</b></p>\n\n"
+        "<img src=x onerror=alert(1)>\n\n<p onclick=\"alert(1)\">hi</p>\n\n<script>alert(1)</script>"
+    ).splitlines()
+    assert out[0] == "<h1>Solar <strong>ROI</strong></h1>"
+    assert out[1] == "<p>Stay &lt;b&gt;tuned&lt;/b&gt;</p>"
+    assert out[2] == "<p>&lt;img src=x onerror=alert(1)&gt;</p>"
+    assert out[3] == "<p>&lt;p onclick=&quot;alert(1)&quot;&gt;hi&lt;/p&gt;</p>"
+    assert out[4] == "<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>"
+
+def test_large_builds_reuse_one_pool(tmp_path):
+    builder = SiteBuilder(str(tmp_path), workers=2, batch_size=2, inline_below=0)
+    try:
+        for i in range(4):
+            (tmp_path / "content" / "blogs" / f"post-{i}.md").write_text(f"# Post {i}\n\nBody {i}")
+        assert builder.build()["rendered"] == 4
+        pool = builder._pool
+        (tmp_path / "content" / "blogs" / "post-0.md").write_text("# Post 0\n\nEdited")
+        assert builder.build()["rendered"] == 1
+        assert builder._pool is pool
+        assert "Edited" in (tmp_path / "public" / "blog" / "post-0.html").read_text()
+    finally:
+        builder.close()
+    assert builder._pool is None
@@ -0,0 +1,33 @@
+import asyncio
+from agents.social_distribution_swarm import SocialDistributionSwarm
+from core.config_loader import ConfigLoader
+from core.memory import GlobalMemory
+from core.storage import SQLiteBackend
+
+def lead(score):
+    return {"timestamp": "2026-01-01T00:00:00", "score": score, "capex": 1.0, "industry": "textile",
+            "co2_offset": 10.0, "routing": "Sales Dashboard"}
+
+def lead_drafts(memory, tmp_path, monkeypatch):
+    monkeypatch.setenv("SOCIAL_DRAFTS_DIR", str(tmp_path / "social"))
+    node = SocialDistributionSwarm()
+    node.set_memory(memory)
+    node.set_config(ConfigLoader(str(tmp_path / ".env")))
+    drafts = asyncio.run(node.run({})).data["drafts"]
+    return [d for d in drafts if d["campaign"] == "Industrial Growth"]
+
+def test_each_tier_a_lead_is_drafted_once(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "state.db")
+    memory = GlobalMemory(backend=SQLiteBackend(db_path))
+    memory.extend_list("lead_quality", [lead("A"), lead("B"), lead("A")])
+    assert len(lead_drafts(memory, tmp_path, monkeypatch)) == 2
+    assert lead_drafts(memory, tmp_path, monkeypatch) == []
+    memory.append_to_list("lead_quality", lead("A"))
+    assert len(lead_drafts(memory, tmp_path, monkeypatch)) == 1
+    memory.flush()
+    memory.backend.close()
+
+    # The cursor survives a restart against the same database
+    restored = GlobalMemory(backend=SQLiteBackend(db_path))
+    assert lead_drafts(restored, tmp_path, monkeypatch) == []
+    restored.backend.close()